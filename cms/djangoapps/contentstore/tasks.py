@@ -9,7 +9,7 @@ import os
 import shutil
 import tarfile
 from datetime import datetime
-from tempfile import NamedTemporaryFile, mkdtemp
+from tempfile import NamedTemporaryFile
 
 from celery.task import task
 from celery.utils.log import get_task_logger
@@ -45,7 +45,7 @@ from xmodule.exceptions import SerializationError
 from xmodule.modulestore import COURSE_ROOT, LIBRARY_ROOT
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import DuplicateCourseError, ItemNotFoundError
-from xmodule.modulestore.xml_exporter import export_course_to_xml, export_library_to_xml
+from xmodule.modulestore.xml_exporter import export_course_to_tarball, export_library_to_tarball
 from xmodule.modulestore.xml_importer import import_course_from_xml, import_library_from_xml
 
 LOGGER = get_task_logger(__name__)
@@ -272,20 +272,31 @@ def create_export_tarball(course_module, course_key, context, status=None):
     """
     name = course_module.url_name
     export_file = NamedTemporaryFile(prefix=name + '.', suffix=".tar.gz")
-    root_dir = path(mkdtemp())
-
-    try:
-        if isinstance(course_key, LibraryLocator):
-            export_library_to_xml(modulestore(), contentstore(), course_key, root_dir, name)
-        else:
-            export_course_to_xml(modulestore(), contentstore(), course_module.id, root_dir, name)
 
+    def start_compressing():
+        """
+        Report that the export has moved on to writing the tarball.
+        """
         if status:
             status.set_state(u'Compressing')
             status.increment_completed_steps()
         LOGGER.debug(u'tar file being generated at %s', export_file.name)
-        with tarfile.open(name=export_file.name, mode='w:gz') as tar_file:
-            tar_file.add(root_dir / name, arcname=name)
+
+    try:
+        # The OLX and assets are streamed straight into the tarball rather than staged in a temporary directory.
+        if isinstance(course_key, LibraryLocator):
+            report = export_library_to_tarball(
+                modulestore(), contentstore(), course_key, name, export_file, compress_callback=start_compressing
+            )
+        else:
+            report = export_course_to_tarball(
+                modulestore(), contentstore(), course_module.id, name, export_file, compress_callback=start_compressing
+            )
+        export_file.seek(0)
+        LOGGER.info(
+            u'Exported %s: %d files, %d bytes in %.2f seconds (%.0f bytes/second)',
+            course_key, report.file_count, report.byte_count, report.seconds, report.bytes_per_second
+        )
 
     except SerializationError as exc:
         LOGGER.exception(u'There was an error exporting %s', course_key, exc_info=True)
@@ -318,9 +329,6 @@ def create_export_tarball(course_module, course_key, context, status=None):
         if status:
             status.fail(json.dumps({'raw_error_msg': context['raw_err_msg']}))
         raise
-    finally:
-        if os.path.exists(root_dir / name):
-            shutil.rmtree(root_dir / name)
 
     return export_file
 
@@ -499,6 +507,14 @@ def import_olx(self, user_id, course_key_string, archive_path, archive_name, lan
         self.status.set_state(u'Updating')
         self.status.increment_completed_steps()
 
+        def log_static_content_progress(num_imported, num_files):
+            """
+            Reports the progress of the import of the static files.
+            """
+            LOGGER.info(
+                u'Course import %s: Imported %d of %d static files', courselike_key, num_imported, num_files
+            )
+
         with dog_stats_api.timer(
             u'courselike_import.time',
             tags=[u"courselike:{}".format(courselike_key)]
@@ -508,7 +524,8 @@ def import_olx(self, user_id, course_key_string, archive_path, archive_name, lan
                 settings.GITHUB_REPO_ROOT, [dirpath],
                 load_error_modules=False,
                 static_content_store=contentstore(),
-                target_id=courselike_key
+                target_id=courselike_key,
+                static_content_progress_callback=log_static_content_progress,
             )
 
         new_location = courselike_items[0].location
@@ -91,6 +91,7 @@ from lms.envs.common import (
     ENABLE_COMPREHENSIVE_THEMING,
     COMPREHENSIVE_THEME_LOCALE_PATHS,
     COMPREHENSIVE_THEME_DIRS,
+    COMPREHENSIVE_THEME_TEMPLATES_AUTO_REFRESH,
 
     # constants for redirects app
     REDIRECT_CACHE_TIMEOUT,
@@ -491,6 +492,7 @@ MIDDLEWARE_CLASSES = [
     'django.middleware.locale.LocaleMiddleware',
 
     'codejail.django_integration.ConfigureCodeJailMiddleware',
+    'util.sandboxing.ConfigureSafeExecWorkerPoolMiddleware',
 
     # catches any uncaught RateLimitExceptions and returns a 403 instead of a 500
     'ratelimitbackend.middleware.RateLimitMiddleware',
@@ -572,6 +574,11 @@ MODULESTORE = {
     }
 }
 
+# Maximum size, in bytes of pickled data, of the per-process LRU cache of
+# deserialized split modulestore course structures, which sits in front of
+# the 'course_structure_cache' cache. 0 disables it.
+COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
 # Modulestore-level field override providers. These field override providers don't
 # require student context.
 MODULESTORE_FIELD_OVERRIDE_PROVIDERS = ()
@@ -589,6 +596,10 @@ CODE_JAIL = {
         # How many CPU seconds can jailed code use?
         'CPU': 1,
     },
+
+    # Number of warm sandboxed workers each process keeps for running
+    # capa problem code.  0 starts a new sandbox for each execution.
+    'worker_pool_size': 0,
 }
 
 ############################ DJANGO_BUILTINS ################################
@@ -15,6 +15,8 @@ DEBUG = True
 USE_I18N = True
 DEFAULT_TEMPLATE_ENGINE['OPTIONS']['debug'] = DEBUG
 HTTPS = 'off'
+# Pick up templates added to or removed from the themes without a restart
+COMPREHENSIVE_THEME_TEMPLATES_AUTO_REFRESH = True
 
 ################################ LOGGERS ######################################
 
@@ -170,6 +170,9 @@ CACHES = {
     },
 }
 
+# Don't cache course structures in process either, so tests see every mongo call
+COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES = 0
+
 ################################# CELERY ######################################
 
 CELERY_ALWAYS_EAGER = True
@@ -11,6 +11,7 @@ from django.utils.translation import ugettext_noop
 from opaque_keys.edx.django.models import CourseKeyField
 from six import text_type
 
+from openedx.core.djangoapps.request_cache import clear_cache, get_cache
 from openedx.core.djangoapps.xmodule_django.models import NoneToEmptyManager
 from student.models import CourseEnrollment
 from xmodule.modulestore.django import modulestore
@@ -158,11 +159,27 @@ def all_permissions_for_user_in_course(user, course_id):  # pylint: disable=inva
 class ForumsConfig(ConfigurationModel):
     """Config for the connection to the cs_comments_service forums backend."""
 
+    REQUEST_CACHE_NAME = u'django_comment_common.forums_config'
+
     connection_timeout = models.FloatField(
         default=5.0,
         help_text="Seconds to wait when trying to connect to the comment service.",
     )
 
+    @classmethod
+    def current_for_request(cls):
+        """
+        Returns the current config, reading it only once per request.
+        """
+        request_cache = get_cache(cls.REQUEST_CACHE_NAME)
+        if 'current' not in request_cache:
+            request_cache['current'] = cls.current()
+        return request_cache['current']
+
+    def save(self, *args, **kwargs):
+        super(ForumsConfig, self).save(*args, **kwargs)
+        clear_cache(self.REQUEST_CACHE_NAME)
+
     @property
     def api_key(self):
         """The API key used to authenticate to the comments service."""
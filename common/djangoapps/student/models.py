@@ -29,7 +29,7 @@ from django.contrib.auth.models import User
 from django.contrib.auth.signals import user_logged_in, user_logged_out
 from django.core.cache import cache
 from django.core.exceptions import MultipleObjectsReturned, ObjectDoesNotExist
-from django.db import IntegrityError, models
+from django.db import IntegrityError, models, transaction
 from django.db.models import Count, Q
 from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
@@ -131,6 +131,40 @@ class AnonymousUserId(models.Model):
     course_id = CourseKeyField(db_index=True, max_length=255, blank=True)
 
 
+# Request cache of the AnonymousUserId rows known to exist, as a dict of {anonymous_user_id: user id}.
+# Only ids are kept, since grade reports save the anonymous ids of every learner of a course.
+ANONYMOUS_USER_IDS_CACHE_NAME = u'student.anonymous_user_ids'
+
+# Request cache of the users looked up by anonymous id, as a dict of {anonymous_user_id: user}.
+USERS_BY_ANONYMOUS_ID_CACHE_NAME = u'student.users_by_anonymous_id'
+
+# Maximum number of anonymous ids looked up or inserted in a single query.
+ANONYMOUS_USER_IDS_BATCH_SIZE = 1000
+
+
+def _compute_anonymous_id(user_id, course_id):
+    """
+    Returns the anonymous id of the given user id in the given course,
+    or the course-independent anonymous id if course_id is falsy.
+    """
+    # include the secret key as a salt, and to make the ids unique across different LMS installs.
+    hasher = hashlib.md5()
+    hasher.update(settings.SECRET_KEY)
+    hasher.update(unicode(user_id))
+    if course_id:
+        hasher.update(unicode(course_id).encode('utf-8'))
+    return hasher.hexdigest()
+
+
+def _remember_anonymous_id(user, course_id, digest):
+    """
+    Caches the given anonymous id on the given user object.
+    """
+    if not hasattr(user, '_anonymous_id'):
+        user._anonymous_id = {}  # pylint: disable=protected-access
+    user._anonymous_id[course_id] = digest  # pylint: disable=protected-access
+
+
 def anonymous_id_for_user(user, course_id, save=True):
     """
     Return a unique id for a (user, course) pair, suitable for inserting
@@ -151,22 +185,16 @@ def anonymous_id_for_user(user, course_id, save=True):
     if cached_id is not None:
         return cached_id
 
-    # include the secret key as a salt, and to make the ids unique across different LMS installs.
-    hasher = hashlib.md5()
-    hasher.update(settings.SECRET_KEY)
-    hasher.update(unicode(user.id))
-    if course_id:
-        hasher.update(unicode(course_id).encode('utf-8'))
-    digest = hasher.hexdigest()
-
-    if not hasattr(user, '_anonymous_id'):
-        user._anonymous_id = {}  # pylint: disable=protected-access
-
-    user._anonymous_id[course_id] = digest  # pylint: disable=protected-access
+    digest = _compute_anonymous_id(user.id, course_id)
+    _remember_anonymous_id(user, course_id, digest)
 
     if save is False:
         return digest
 
+    saved_ids = get_cache(ANONYMOUS_USER_IDS_CACHE_NAME)
+    if digest in saved_ids:
+        return digest
+
     try:
         AnonymousUserId.objects.get_or_create(
             user=user,
@@ -178,9 +206,84 @@ def anonymous_id_for_user(user, course_id, save=True):
         # continue
         pass
 
+    saved_ids[digest] = user.id
     return digest
 
 
+def anonymous_ids_for_users(users, course_id, save=True):
+    """
+    Bulk version of anonymous_id_for_user for many users in the same
+    course, returning a dict of {user id: anonymous id}.
+
+    The AnonymousUserId objects missing for the given users are
+    created together, so that at most one query per batch of users
+    looks up the existing objects and one more inserts the others.
+    Anonymous users are skipped.
+
+    Keyword arguments:
+    save -- Whether the ids should be saved in AnonymousUserId objects.
+    """
+    anonymous_ids = {}
+    users_by_id = {}
+    for user in users:
+        if user.is_anonymous():
+            continue
+        digest = getattr(user, '_anonymous_id', {}).get(course_id)
+        if digest is None:
+            digest = _compute_anonymous_id(user.id, course_id)
+            _remember_anonymous_id(user, course_id, digest)
+        anonymous_ids[user.id] = digest
+        users_by_id[user.id] = user
+
+    if save is False:
+        return anonymous_ids
+
+    saved_ids = get_cache(ANONYMOUS_USER_IDS_CACHE_NAME)
+    unsaved_ids = {
+        digest: users_by_id[user_id]
+        for user_id, digest in anonymous_ids.iteritems()
+        if digest not in saved_ids
+    }
+    unsaved_list = list(unsaved_ids)
+    for start in range(0, len(unsaved_list), ANONYMOUS_USER_IDS_BATCH_SIZE):
+        batch = unsaved_list[start:start + ANONYMOUS_USER_IDS_BATCH_SIZE]
+        existing_ids = set(
+            AnonymousUserId.objects.filter(anonymous_user_id__in=batch).values_list('anonymous_user_id', flat=True)
+        )
+        missing_ids = [digest for digest in batch if digest not in existing_ids]
+        if missing_ids:
+            _bulk_create_anonymous_ids(
+                [
+                    AnonymousUserId(user=unsaved_ids[digest], course_id=course_id, anonymous_user_id=digest)
+                    for digest in missing_ids
+                ]
+            )
+        for digest in batch:
+            saved_ids[digest] = unsaved_ids[digest].id
+
+    return anonymous_ids
+
+
+def _bulk_create_anonymous_ids(anonymous_user_ids):
+    """
+    Inserts the given AnonymousUserId objects, falling back to creating
+    them one at a time if another thread has already created some.
+    """
+    try:
+        with transaction.atomic():
+            AnonymousUserId.objects.bulk_create(anonymous_user_ids)
+    except IntegrityError:
+        for anonymous_user_id in anonymous_user_ids:
+            try:
+                AnonymousUserId.objects.get_or_create(
+                    user=anonymous_user_id.user,
+                    course_id=anonymous_user_id.course_id,
+                    anonymous_user_id=anonymous_user_id.anonymous_user_id,
+                )
+            except IntegrityError:
+                pass
+
+
 def user_by_anonymous_id(uid):
     """
     Return user by anonymous_user_id using AnonymousUserId lookup table.
@@ -193,11 +296,39 @@ def user_by_anonymous_id(uid):
     if uid is None:
         return None
 
+    users = get_cache(USERS_BY_ANONYMOUS_ID_CACHE_NAME)
+    if uid in users:
+        return users[uid]
+
     try:
-        return User.objects.get(anonymoususerid__anonymous_user_id=uid)
+        user = User.objects.get(anonymoususerid__anonymous_user_id=uid)
     except ObjectDoesNotExist:
         return None
 
+    users[uid] = user
+    get_cache(ANONYMOUS_USER_IDS_CACHE_NAME)[uid] = user.id
+    return user
+
+
+def users_by_anonymous_ids(uids):
+    """
+    Bulk version of user_by_anonymous_id, returning a dict of
+    {anonymous id: user} for the given anonymous ids that have a user.
+    """
+    saved_ids = get_cache(ANONYMOUS_USER_IDS_CACHE_NAME)
+    cached_users = get_cache(USERS_BY_ANONYMOUS_ID_CACHE_NAME)
+    users = {uid: cached_users[uid] for uid in uids if uid in cached_users}
+    unknown_ids = list(set(uid for uid in uids if uid is not None and uid not in users))
+    for start in range(0, len(unknown_ids), ANONYMOUS_USER_IDS_BATCH_SIZE):
+        anonymous_user_ids = AnonymousUserId.objects.filter(
+            anonymous_user_id__in=unknown_ids[start:start + ANONYMOUS_USER_IDS_BATCH_SIZE],
+        ).select_related('user')
+        for anonymous_user_id in anonymous_user_ids:
+            users[anonymous_user_id.anonymous_user_id] = anonymous_user_id.user
+            cached_users[anonymous_user_id.anonymous_user_id] = anonymous_user_id.user
+            saved_ids[anonymous_user_id.anonymous_user_id] = anonymous_user_id.user_id
+    return users
+
 
 class UserStanding(models.Model):
     """
@@ -32,17 +32,22 @@ from course_modes.tests.factories import CourseModeFactory
 from lms.djangoapps.verify_student.models import SoftwareSecurePhotoVerification
 from openedx.core.djangoapps.catalog.tests.factories import CourseFactory as CatalogCourseFactory
 from openedx.core.djangoapps.catalog.tests.factories import CourseRunFactory, ProgramFactory, generate_course_run_key
+from openedx.core.djangoapps.request_cache import clear_cache, get_cache
 from openedx.core.djangoapps.programs.tests.mixins import ProgramsApiConfigMixin
 from openedx.core.djangoapps.site_configuration.tests.mixins import SiteMixin
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase, skip_unless_lms
 from student.helpers import _cert_info, process_survey_link
 from student.models import (
+    ANONYMOUS_USER_IDS_CACHE_NAME,
+    AnonymousUserId,
     CourseEnrollment,
     LinkedInAddToProfileConfiguration,
     UserAttribute,
     anonymous_id_for_user,
+    anonymous_ids_for_users,
     unique_id_for_user,
-    user_by_anonymous_id
+    user_by_anonymous_id,
+    users_by_anonymous_ids
 )
 from student.tests.factories import CourseEnrollmentFactory, UserFactory
 from student.views import complete_course_mode_info
@@ -1062,6 +1067,36 @@ class AnonymousLookupTable(ModuleStoreTestCase):
             self.assertEqual(self.user, user_by_anonymous_id(anonymous_id))
             self.assertEqual(self.user, user_by_anonymous_id(new_anonymous_id))
 
+    def test_bulk_roundtrip(self):
+        users = [self.user, UserFactory.create(), UserFactory.create()]
+        existing_id = anonymous_id_for_user(users[0], self.course.id)
+        clear_cache(ANONYMOUS_USER_IDS_CACHE_NAME)
+
+        # Recreate the user objects to clear their cached anonymous ids.
+        users = [User.objects.get(pk=user.id) for user in users]
+        with self.assertNumQueries(4):
+            anonymous_ids = anonymous_ids_for_users(users, self.course.id)
+        self.assertEqual(existing_id, anonymous_ids[users[0].id])
+        for user in users:
+            self.assertEqual(anonymous_ids[user.id], anonymous_id_for_user(user, self.course.id, save=False))
+        self.assertEqual(AnonymousUserId.objects.filter(course_id=self.course.id).count(), len(users))
+
+        # The ids are now known to be saved, without keeping the users.
+        with self.assertNumQueries(0):
+            anonymous_ids_for_users(users, self.course.id)
+        self.assertEqual(
+            get_cache(ANONYMOUS_USER_IDS_CACHE_NAME),
+            {anonymous_ids[user.id]: user.id for user in users},
+        )
+
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                {anonymous_ids[user.id]: user for user in users},
+                users_by_anonymous_ids(anonymous_ids.values() + ['unknown']),
+            )
+        with self.assertNumQueries(0):
+            self.assertEqual(users[0], user_by_anonymous_id(anonymous_ids[users[0].id]))
+
 
 @attr(shard=3)
 @skip_unless_lms
@@ -1,6 +1,8 @@
 import re
 
+from capa.safe_exec import worker_pool
 from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
 from lms.djangoapps.dashboard.git_import import DEFAULT_PYTHON_LIB_FILENAME
 
 
@@ -38,3 +40,13 @@ def get_python_lib_zip(contentstore, course_id):
         return zip_lib.data
     else:
         return None
+
+
+class ConfigureSafeExecWorkerPoolMiddleware(object):
+    """
+    Configures capa's safe_exec worker pool from settings.CODE_JAIL, the
+    same way codejail's ConfigureCodeJailMiddleware configures codejail.
+    """
+    def __init__(self):
+        worker_pool.configure(getattr(settings, 'CODE_JAIL', {}).get('worker_pool_size', 0))
+        raise MiddlewareNotUsed
@@ -7,6 +7,8 @@ Uses pyparsing to parse. Main function as of now is evaluator().
 import math
 import numbers
 import operator
+import threading
+from collections import OrderedDict
 
 import numpy
 import scipy.constants
@@ -93,6 +95,10 @@ SUFFIXES = {
 }
 
 
+# Maximum number of parsed expressions kept by `compile_expression`.
+COMPILED_EXPRESSIONS_CACHE_SIZE = 1024
+
+
 class UndefinedVariable(Exception):
     """
     Indicate when a student inputs a variable which was not expected.
@@ -227,6 +233,92 @@ def eval_product(parse_result):
     return prod
 
 
+# The following functions are the array versions of the evaluation actions
+# above, for evaluating a tree over many samples of the variables at once.
+# Rather than testing for numbers, they skip the operator strings.
+
+def _operands(parse_result):
+    """
+    Return the values in the list, without the operator strings.
+    """
+    return [k for k in parse_result if not isinstance(k, basestring)]
+
+
+def eval_atom_array(parse_result):
+    """
+    Return the value wrapped by the atom, like `eval_atom`.
+    """
+    return _operands(parse_result)[0]
+
+
+def eval_power_array(parse_result):
+    """
+    Exponentiate the values right to left, like `eval_power`.
+    """
+    return reduce(lambda a, b: b ** a, reversed(_operands(parse_result)))
+
+
+def eval_parallel_array(parse_result):
+    """
+    Compute the parallel resistors operator, like `eval_parallel`.
+    """
+    operands = _operands(parse_result)
+    if len(operands) == 1:
+        return operands[0]
+    has_zero = reduce(numpy.logical_or, [numpy.equal(e, 0) for e in operands])
+    result = 1. / sum(1. / numpy.asarray(e) for e in operands)
+    return numpy.where(has_zero, float('nan'), result)
+
+
+def eval_sum_array(parse_result):
+    """
+    Add the values, keeping in mind their sign, like `eval_sum`.
+    """
+    total = 0.0
+    current_op = operator.add
+    for token in parse_result:
+        if not isinstance(token, basestring):
+            total = current_op(total, token)
+        elif token == '-':
+            current_op = operator.sub
+        else:
+            current_op = operator.add
+    return total
+
+
+def eval_product_array(parse_result):
+    """
+    Multiply the values, like `eval_product`.
+    """
+    prod = 1.0
+    current_op = operator.mul
+    for token in parse_result:
+        if not isinstance(token, basestring):
+            prod = current_op(prod, token)
+        elif token == '/':
+            current_op = operator.truediv
+        else:
+            current_op = operator.mul
+    return prod
+
+
+EVALUATE_ACTIONS = {
+    'atom': eval_atom,
+    'power': eval_power,
+    'parallel': eval_parallel,
+    'product': eval_product,
+    'sum': eval_sum
+}
+
+EVALUATE_ARRAY_ACTIONS = {
+    'atom': eval_atom_array,
+    'power': eval_power_array,
+    'parallel': eval_parallel_array,
+    'product': eval_product_array,
+    'sum': eval_sum_array
+}
+
+
 def add_defaults(variables, functions, case_sensitive):
     """
     Create dictionaries with both the default and user-defined variables.
@@ -250,40 +342,38 @@ def evaluator(variables, functions, math_expr, case_sensitive=False):
     -Variables are passed as a dictionary from string to value. They must be
      python numbers.
     -Unary functions are passed as a dictionary from string to function.
+
+    The expression is only parsed the first time it's evaluated; see
+    `compile_expression`.
     """
-    # No need to go further.
-    if math_expr.strip() == "":
-        return float('nan')
+    return compile_expression(math_expr, case_sensitive).evaluate(variables, functions)
 
-    # Parse the tree.
-    check_parens(math_expr)
-    math_interpreter = ParseAugmenter(math_expr, case_sensitive)
-    math_interpreter.parse_algebra()
 
-    # Get our variables together.
-    all_variables, all_functions = add_defaults(variables, functions, case_sensitive)
+_compiled_expressions = OrderedDict()
+_compiled_expressions_lock = threading.Lock()
 
-    # ...and check them
-    math_interpreter.check_variables(all_variables, all_functions)
 
-    # Create a recursion to evaluate the tree.
-    if case_sensitive:
-        casify = lambda x: x
-    else:
-        casify = lambda x: x.lower()  # Lowercase for case insens.
-
-    evaluate_actions = {
-        'number': eval_number,
-        'variable': lambda x: all_variables[casify(x[0])],
-        'function': lambda x: all_functions[casify(x[0])](x[1]),
-        'atom': eval_atom,
-        'power': eval_power,
-        'parallel': eval_parallel,
-        'product': eval_product,
-        'sum': eval_sum
-    }
+def compile_expression(math_expr, case_sensitive=False):
+    """
+    Return the `CompiledExpression` of a math expression string.
 
-    return math_interpreter.reduce_tree(evaluate_actions)
+    The most recently used `COMPILED_EXPRESSIONS_CACHE_SIZE` compiled
+    expressions are kept, by expression and case sensitivity, so that
+    grading the same formulas again doesn't parse them again.
+    """
+    key = (math_expr, case_sensitive)
+    with _compiled_expressions_lock:
+        compiled = _compiled_expressions.pop(key, None)
+        if compiled is not None:
+            _compiled_expressions[key] = compiled
+            return compiled
+
+    compiled = CompiledExpression(math_expr, case_sensitive)
+    with _compiled_expressions_lock:
+        _compiled_expressions[key] = compiled
+        while len(_compiled_expressions) > COMPILED_EXPRESSIONS_CACHE_SIZE:
+            _compiled_expressions.popitem(last=False)
+    return compiled
 
 
 def check_parens(formula):
@@ -477,3 +567,139 @@ class ParseAugmenter(object):
 
         if bad_vars:
             raise UndefinedVariable(' '.join(sorted(bad_vars)))
+
+
+class CompiledExpression(object):
+    """
+    A math expression parsed once into a tree of functions, which can
+    then be evaluated for any variables and functions.
+
+    Raise the parsing errors of `evaluator` on creation.
+    """
+    def __init__(self, math_expr, case_sensitive=False):
+        self.math_expr = math_expr
+        self.case_sensitive = case_sensitive
+        if case_sensitive:
+            self.casify = lambda x: x
+        else:
+            self.casify = lambda x: x.lower()  # Lowercase for case insens.
+
+        # No need to go further.
+        if math_expr.strip() == "":
+            self.parser = None
+            self.evaluate_tree = None
+            return
+
+        # Parse the tree.
+        check_parens(math_expr)
+        self.parser = ParseAugmenter(math_expr, case_sensitive)
+        self.parser.parse_algebra()
+        self.evaluate_tree = self.compile_node(self.parser.tree)
+
+    def compile_node(self, node):
+        """
+        Return a function of (variables, functions, actions) giving the
+        value of the node.
+
+        Numbers are converted once here. The other nodes are given to the
+        `actions` of the same name, which are either `EVALUATE_ACTIONS` or
+        `EVALUATE_ARRAY_ACTIONS`, after evaluating their child nodes.
+        """
+        if not isinstance(node, ParseResults):
+            # Then it's an operator or a parenthesis.
+            return lambda variables, functions, actions: node
+
+        node_name = node.getName()
+        if node_name == 'number':
+            value = eval_number(list(node))
+            return lambda variables, functions, actions: value
+        if node_name == 'variable':
+            variable_name = self.casify(node[0])
+            return lambda variables, functions, actions: variables[variable_name]
+        if node_name == 'function':
+            function_name = self.casify(node[0])
+            evaluate_argument = self.compile_node(node[1])
+            return lambda variables, functions, actions: functions[function_name](
+                evaluate_argument(variables, functions, actions)
+            )
+        if node_name not in EVALUATE_ACTIONS:  # pragma: no cover
+            raise Exception(u"Unknown branch name '{}'".format(node_name))
+
+        evaluate_kids = [self.compile_node(k) for k in node]
+
+        def evaluate_node(variables, functions, actions):
+            """
+            Call the node's action on the values of its child nodes.
+            """
+            return actions[node_name]([evaluate_kid(variables, functions, actions) for evaluate_kid in evaluate_kids])
+        return evaluate_node
+
+    def get_defaults(self, variables, functions):
+        """
+        Return the default and given variables and functions, after checking
+        that they define all the ones used by the expression.
+        """
+        all_variables, all_functions = add_defaults(variables, functions, self.case_sensitive)
+        self.parser.check_variables(all_variables, all_functions)
+        return all_variables, all_functions
+
+    def evaluate(self, variables, functions):
+        """
+        Evaluate the expression, like `evaluator`.
+        """
+        if self.parser is None:
+            return float('nan')
+        all_variables, all_functions = self.get_defaults(variables, functions)
+        return self.evaluate_tree(all_variables, all_functions, EVALUATE_ACTIONS)
+
+    def evaluate_samples(self, samples, functions):
+        """
+        Evaluate the expression for each dictionary of variables in the
+        `samples` list, and return the list of values.
+
+        All the samples are evaluated at once with numpy arrays of their
+        variables. The samples whose value isn't finite, and all of them if
+        the functions don't support arrays, are evaluated one by one as
+        `evaluate` would, to get the same values or errors. The other values
+        may differ from `evaluate`'s by rounding errors.
+        """
+        if not samples or self.parser is None:
+            return [self.evaluate(variables, functions) for variables in samples]
+
+        values = None
+        if all(set(variables) == set(samples[0]) for variables in samples):
+            values = self._evaluate_arrays(samples, functions)
+        if values is None:
+            return [self.evaluate(variables, functions) for variables in samples]
+
+        return [
+            value if numpy.isfinite(value) else self.evaluate(variables, functions)
+            for variables, value in zip(samples, values)
+        ]
+
+    def _evaluate_arrays(self, samples, functions):
+        """
+        Return the list of values of the samples evaluated at once, or None
+        if they can't be.
+        """
+        arrays = {}
+        for name in samples[0]:
+            array = numpy.array([variables[name] for variables in samples])
+            if array.dtype.kind in 'biu':
+                # Integer arrays would overflow where Python numbers don't.
+                array = array.astype(float)
+            elif array.dtype.kind not in 'fc':
+                return None
+            arrays[name] = array
+        all_variables, all_functions = self.get_defaults(arrays, functions)
+
+        try:
+            with numpy.errstate(all='ignore'):
+                values = numpy.asarray(self.evaluate_tree(all_variables, all_functions, EVALUATE_ARRAY_ACTIONS))
+        except Exception:  # pylint: disable=broad-except
+            return None
+        if values.ndim == 0:
+            return [values.item()] * len(samples)
+        if values.shape != (len(samples),) or values.dtype.kind not in 'fc':
+            return None
+        return values.tolist()
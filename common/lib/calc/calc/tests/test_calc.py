@@ -2,9 +2,12 @@
 Unit tests for calc.py
 """
 
+import random
+import time
 import unittest
 import numpy
 import calc
+from mock import patch
 from pyparsing import ParseException
 
 # numpy's default behavior when it evaluates a function outside its domain
@@ -565,3 +568,121 @@ class EvaluatorTest(unittest.TestCase):
             calc.evaluator({}, {}, "(1+2")
         with self.assertRaisesRegexp(calc.UnmatchedParenthesis, 'no matching opening parenthesis'):
             calc.evaluator({}, {}, "(1+2))")
+
+
+class CompiledExpressionTest(unittest.TestCase):
+    """
+    Run tests for calc.compile_expression and CompiledExpression
+    """
+    def setUp(self):
+        super(CompiledExpressionTest, self).setUp()
+        self.samples = [{'x': x, 'y': y} for x, y in [(1.0, 2.0), (-3.5, 0.25), (0.0, 7.0), (2.0, -1.5)]]
+
+    def assert_same_as_evaluator(self, math_expr, functions=None, case_sensitive=False):
+        """
+        Check that evaluating the samples at once gives the evaluator's values
+        """
+        functions = functions or {}
+        values = calc.compile_expression(math_expr, case_sensitive).evaluate_samples(self.samples, functions)
+        self.assertEqual(len(values), len(self.samples))
+        for variables, value in zip(self.samples, values):
+            expected = calc.evaluator(variables, functions, math_expr, case_sensitive)
+            if numpy.isnan(expected):
+                self.assertTrue(numpy.isnan(value))
+            else:
+                self.assertAlmostEqual(value, expected, delta=1e-12 * max(1, abs(expected)))
+
+    def test_compiled_once(self):
+        compiled = calc.compile_expression("x^2 + 3*y", True)
+        self.assertIs(calc.compile_expression("x^2 + 3*y", True), compiled)
+        self.assertIsNot(calc.compile_expression("x^2 + 3*y", False), compiled)
+        self.assertEqual(compiled.evaluate({'x': 2.0, 'y': 1.0}, {}), 7.0)
+
+    @patch('calc.calc.COMPILED_EXPRESSIONS_CACHE_SIZE', 2)
+    def test_least_recently_used_evicted(self):
+        first = calc.compile_expression("x + 1")
+        second = calc.compile_expression("x + 2")
+        self.assertIs(calc.compile_expression("x + 1"), first)
+        calc.compile_expression("x + 3")
+        self.assertIs(calc.compile_expression("x + 1"), first)
+        self.assertIsNot(calc.compile_expression("x + 2"), second)
+
+    def test_parse_errors_raised(self):
+        with self.assertRaises(calc.UnmatchedParenthesis):
+            calc.compile_expression("(x+1")
+        with self.assertRaises(ParseException):
+            calc.compile_expression("x+")
+
+    def test_evaluate_samples(self):
+        for math_expr in [
+                "x^2 + 3*y - 1/4", "-x*y/2^y", "x || y", "2^3^x", "sin(x)*cos(y) + sqrt(y)", "5k*x + 2%",
+                "e^(i*pi*x)", "(x+y)*(x-y)", "arctan(x/7)", "12.5",
+        ]:
+            self.assert_same_as_evaluator(math_expr)
+
+    def test_evaluate_samples_with_errors(self):
+        # The samples dividing by zero, which aren't finite, are evaluated one by one.
+        with self.assertRaises(ZeroDivisionError):
+            calc.compile_expression("y/x").evaluate_samples(self.samples, {})
+        with self.assertRaisesRegexp(calc.UndefinedVariable, 'z'):
+            calc.compile_expression("x*z").evaluate_samples(self.samples, {})
+
+    def test_evaluate_samples_with_scalar_functions(self):
+        functions = {'f': lambda value: value if value > 0 else -value}
+        self.assert_same_as_evaluator("f(x) + y", functions)
+        self.assert_same_as_evaluator("fact(3) + arccot(x)")
+
+    def test_empty_expression(self):
+        values = calc.compile_expression(" ").evaluate_samples(self.samples, {})
+        self.assertTrue(all(numpy.isnan(value) for value in values))
+
+
+@unittest.skip("Benchmark, run manually")
+class CompiledExpressionPerfTest(unittest.TestCase):
+    """
+    Benchmark evaluating formula-problem inputs the previous way, parsing
+    them for each sample, against compiled expressions evaluated over all
+    the samples at once.
+
+    Run manually by removing the skip decorator and running with -s to
+    see the output.
+    """
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    NUM_ITERATIONS = 20
+    NUM_SAMPLES = 20
+    EXPRESSIONS = [
+        "m*g*h + 1/2*m*v^2",
+        "sqrt(2*g*h)",
+        "R1 || R2 + R3",
+        "A*sin(omega*t + phi)*e^(-t/tau)",
+        "(q*V)/(k*T)",
+    ]
+    RANGES = {
+        'm': (1, 10), 'g': (9, 10), 'h': (0, 5), 'v': (0, 20), 'R1': (1, 100), 'R2': (1, 100), 'R3': (1, 100),
+        'A': (1, 2), 'omega': (1, 10), 't': (0, 3), 'phi': (0, 3), 'tau': (1, 2), 'V': (1, 5),
+    }
+
+    def test_evaluate_samples(self):
+        samples = [
+            {name: random.uniform(*value_range) for name, value_range in self.RANGES.iteritems()}
+            for __ in range(self.NUM_SAMPLES)
+        ]
+
+        start_time = time.time()
+        for __ in range(self.NUM_ITERATIONS):
+            for math_expr in self.EXPRESSIONS:
+                for variables in samples:
+                    calc.CompiledExpression(math_expr).evaluate(variables, {})
+        parse_each_time = time.time() - start_time
+
+        start_time = time.time()
+        for __ in range(self.NUM_ITERATIONS):
+            for math_expr in self.EXPRESSIONS:
+                calc.compile_expression(math_expr).evaluate_samples(samples, {})
+        compiled = time.time() - start_time
+
+        print "parsed for each sample: {:.1f} ms, compiled and evaluated at once: {:.1f} ms".format(
+            parse_each_time * 1000, compiled * 1000,
+        )
@@ -3,7 +3,7 @@
 from codejail.safe_exec import safe_exec as codejail_safe_exec
 from codejail.safe_exec import not_safe_exec as codejail_not_safe_exec
 from codejail.safe_exec import json_safe, SafeExecException
-from . import lazymod
+from . import lazymod, worker_pool
 from dogapi import dog_stats_api
 from six import text_type
 
@@ -50,6 +50,11 @@ for name, modname in ASSUMED_IMPORTS:
 
 LAZY_IMPORTS = "".join(LAZY_IMPORTS)
 
+# md5 hashers already updated with the code of recent executions, by the
+# code's type and value, so the same code isn't hashed again for each key.
+MAX_CODE_HASHERS = 500
+_code_hashers = {}
+
 
 def update_hash(hasher, obj):
     """
@@ -74,6 +79,21 @@ def update_hash(hasher, obj):
         hasher.update(repr(obj))
 
 
+def _code_hasher(code):
+    """
+    Returns a `hashlib` md5 hasher updated with the repr of `code`.
+    """
+    cache_key = (type(code), code)
+    hasher = _code_hashers.get(cache_key)
+    if hasher is None:
+        if len(_code_hashers) >= MAX_CODE_HASHERS:
+            _code_hashers.clear()
+        hasher = hashlib.md5()
+        hasher.update(repr(code))
+        _code_hashers[cache_key] = hasher
+    return hasher.copy()
+
+
 @dog_stats_api.timed('capa.safe_exec.time')
 def safe_exec(
     code,
@@ -114,8 +134,7 @@ def safe_exec(
     # Check the cache for a previous result.
     if cache:
         safe_globals = json_safe(globals_dict)
-        md5er = hashlib.md5()
-        md5er.update(repr(code))
+        md5er = _code_hasher(code)
         update_hash(md5er, safe_globals)
         key = "safe_exec.%r.%s" % (random_seed, md5er.hexdigest())
         cached = cache.get(key)
@@ -134,6 +153,8 @@ def safe_exec(
     # Decide which code executor to use.
     if unsafely:
         exec_fn = codejail_not_safe_exec
+    elif worker_pool.is_enabled():
+        exec_fn = worker_pool.safe_exec
     else:
         exec_fn = codejail_safe_exec
 
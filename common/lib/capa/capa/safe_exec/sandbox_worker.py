@@ -0,0 +1,213 @@
+"""
+A forking server, run inside the sandbox by the safe_exec worker pool.
+
+The server imports the packages most problems use once, then reads one
+JSON request per line from stdin.  For each request it forks a child,
+which runs the code under the sandbox resource limits in a fresh working
+directory, the same way codejail's safe_exec would run it in a fresh
+sandboxed process, and kills the child if it runs past the real time
+limit.  The server then writes one JSON response per line to
+stdout: {"status": <exit status>, "stderr": <traceback>, "globals": <dict>}.
+
+This file is copied into the sandbox and run there, so it must only use
+the standard library.
+"""
+import base64
+import json
+import os
+import resource
+import select
+import shutil
+import signal
+import sys
+import tempfile
+import time
+import traceback
+
+# The packages imported before forking, so that children share them.
+PRELOADED_MODULES = [
+    "math",
+    "numpy",
+    "scipy",
+    "calc",
+    "eia",
+    "chem.chemcalc",
+    "chem.chemtools",
+    "chem.miller",
+    "verifiers.draganddrop",
+]
+
+OK_TYPES = (type(None), int, long, float, str, unicode, list, tuple, dict)
+BAD_KEYS = ("__builtins__",)
+
+
+def preload_modules():
+    """
+    Imports the preloaded modules that are available in the sandbox.
+    """
+    for name in PRELOADED_MODULES:
+        try:
+            __import__(name)
+        except Exception:  # pylint: disable=broad-except
+            pass
+
+
+def reseed_random():
+    """
+    Reseeds the random generators inherited from the server, so that
+    children don't share their state.
+    """
+    import random
+    random.seed()
+    if "numpy" in sys.modules:
+        sys.modules["numpy"].random.seed()
+
+
+def disable_tracing():
+    """
+    Makes this process and its children non-dumpable, so that other
+    processes of the sandbox user can't attach to them.
+    """
+    try:
+        import ctypes
+        pr_set_dumpable = 4
+        ctypes.CDLL(None).prctl(pr_set_dumpable, 0, 0, 0, 0)
+    except Exception:  # pylint: disable=broad-except
+        pass
+
+
+def set_limits(limits):
+    """
+    Applies the codejail resource limits to the current process.
+    """
+    if limits.get("CPU"):
+        resource.setrlimit(resource.RLIMIT_CPU, (limits["CPU"], limits["CPU"] + 1))
+    if limits.get("VMEM"):
+        resource.setrlimit(resource.RLIMIT_AS, (limits["VMEM"], limits["VMEM"]))
+    resource.setrlimit(resource.RLIMIT_FSIZE, (limits.get("FSIZE", 0), limits.get("FSIZE", 0)))
+    resource.setrlimit(resource.RLIMIT_NPROC, (0, 0))
+    if limits.get("REALTIME"):
+        signal.alarm(limits["REALTIME"])
+
+
+def jsonable(value):
+    """
+    Returns whether the given global can be sent back to the caller.
+    """
+    if not isinstance(value, OK_TYPES):
+        return False
+    try:
+        json.dumps(value)
+    except Exception:  # pylint: disable=broad-except
+        return False
+    return True
+
+
+def run_child(request, workdir, result_fd):
+    """
+    Runs the requested code in the forked child and writes its result to
+    the given file descriptor.
+    """
+    os.chdir(workdir)
+    for name, contents in request["extra_files"]:
+        with open(name, "wb") as extra_file:
+            extra_file.write(base64.b64decode(contents))
+    for name in request["python_path"]:
+        sys.path.append(name)
+
+    # Keep the code's output away from the responses on stdout.
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    os.dup2(devnull, 2)
+
+    reseed_random()
+    set_limits(request["limits"])
+    g_dict = request["globals"]
+    try:
+        exec request["code"] in g_dict  # pylint: disable=exec-used
+    except BaseException:  # pylint: disable=broad-except
+        result = {"status": 1, "stderr": traceback.format_exc()}
+    else:
+        result = {
+            "status": 0,
+            "globals": {k: v for k, v in g_dict.iteritems() if jsonable(v) and k not in BAD_KEYS},
+        }
+    with os.fdopen(result_fd, "w") as result_file:
+        json.dump(result, result_file)
+
+
+def wait_for_child(pid, read_fd, timeout):
+    """
+    Reads the child's result until it exits, and returns the result and
+    the child's exit status.
+
+    The child's own alarm can be ignored by the code it runs, so the real
+    time limit is enforced here too, by killing the child once it's over.
+    """
+    deadline = time.time() + timeout if timeout else None
+    chunks = []
+    while True:
+        if deadline is not None:
+            remaining = deadline - time.time()
+            if remaining <= 0 or not select.select([read_fd], [], [], remaining)[0]:
+                os.kill(pid, signal.SIGKILL)
+                break
+        chunk = os.read(read_fd, 65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    os.close(read_fd)
+    __, status = os.waitpid(pid, 0)
+    return "".join(chunks), status
+
+
+def handle(request, tmpdir):
+    """
+    Forks a child to run the given request and returns its response.
+    """
+    workdir = tempfile.mkdtemp(dir=tmpdir)
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        try:
+            run_child(request, workdir, write_fd)
+        finally:
+            os._exit(0)  # pylint: disable=protected-access
+
+    os.close(write_fd)
+    output, status = wait_for_child(pid, read_fd, request["limits"].get("REALTIME"))
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    if os.WIFSIGNALED(status):
+        return {"status": -os.WTERMSIG(status), "stderr": ""}
+    try:
+        return json.loads(output)
+    except ValueError:
+        return {"status": os.WEXITSTATUS(status) or 1, "stderr": ""}
+
+
+def main():
+    """
+    Serves requests until stdin is closed.
+    """
+    tmpdir = os.path.abspath(sys.argv[1])
+    # Forking after numpy has started OpenBLAS threads could deadlock the children.  See TNL-6456.
+    os.environ["OPENBLAS_NUM_THREADS"] = "1"
+    disable_tracing()
+    preload_modules()
+    # The pool needs the server's pid to kill its children if it stops responding.
+    sys.stdout.write("ready {}\n".format(os.getpid()))
+    sys.stdout.flush()
+    while True:
+        line = sys.stdin.readline()
+        if not line:
+            break
+        response = handle(json.loads(line), tmpdir)
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
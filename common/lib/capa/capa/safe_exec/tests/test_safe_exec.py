@@ -1,16 +1,22 @@
 """Test safe_exec.py"""
 
 import hashlib
+import io
 import os
 import os.path
 import random
+import sys
 import textwrap
+import time
 import unittest
+import zipfile
 
+from mock import patch
 from nose.plugins.skip import SkipTest
 from six import text_type
 
-from capa.safe_exec import safe_exec, update_hash
+from capa.safe_exec import safe_exec, update_hash, worker_pool
+from codejail import jail_code
 from codejail.safe_exec import SafeExecException
 from codejail.jail_code import is_configured
 
@@ -91,6 +97,132 @@ class TestSafeOrNot(unittest.TestCase):
         self.assertEqual(g['files'], os.listdir('/'))
 
 
+# Runs workers with the current Python, without sandboxing them.
+UNSANDBOXED_PYTHON = {"python": {"cmdline_start": [sys.executable, "-E", "-B"], "user": None}}
+
+
+@patch.dict(jail_code.COMMANDS, UNSANDBOXED_PYTHON)
+class TestWorkerPool(unittest.TestCase):
+    """Test running code in the safe_exec worker pool."""
+
+    def setUp(self):
+        super(TestWorkerPool, self).setUp()
+        worker_pool.configure(1)
+        self.addCleanup(worker_pool.configure, 0)
+
+    def test_set_values(self):
+        g = {'b': 2}
+        safe_exec("a = 1/2 + b", g)
+        self.assertEqual(g['a'], 2.5)
+
+    def test_raising_exceptions(self):
+        with self.assertRaises(SafeExecException) as cm:
+            safe_exec("1/0", {})
+        self.assertIn("ZeroDivisionError", text_type(cm.exception))
+
+    def test_worker_reused_without_sharing_state(self):
+        code = "import os, sys\nworker = os.getppid()\nleaked = 'leak' in sys.modules\nsys.modules['leak'] = sys"
+        g1, g2 = {}, {}
+        safe_exec(code, g1)
+        safe_exec(code, g2)
+        self.assertEqual(g1['worker'], g2['worker'])
+        self.assertFalse(g1['leaked'])
+        self.assertFalse(g2['leaked'])
+
+    def test_random_seeding(self):
+        g = {}
+        r = random.Random(17)
+        rnums = [r.randint(0, 999) for _ in xrange(100)]
+        safe_exec("rnums = [random.randint(0, 999) for _ in xrange(100)]", g, random_seed=17)
+        self.assertEqual(g['rnums'], rnums)
+
+    def test_python_lib_in_extra_files(self):
+        python_lib = io.BytesIO()
+        with zipfile.ZipFile(python_lib, "w") as python_lib_zip:
+            python_lib_zip.writestr("constant.py", "THE_CONST = 23\n")
+        g = {}
+        safe_exec(
+            "import constant; a = constant.THE_CONST",
+            g, python_path=["python_lib.zip"], extra_files=[("python_lib.zip", python_lib.getvalue())],
+        )
+        self.assertEqual(g['a'], 23)
+
+    def test_python_lib_outside_sandbox_uses_codejail(self):
+        pylib = os.path.dirname(__file__) + "/test_files/pylib"
+        with patch.object(worker_pool, 'codejail_safe_exec') as mock_codejail_safe_exec:
+            safe_exec("import constant; a = constant.THE_CONST", {}, python_path=[pylib])
+        self.assertTrue(mock_codejail_safe_exec.called)
+
+    @patch.dict(jail_code.LIMITS, {"REALTIME": 1})
+    def test_realtime_limit_when_alarm_is_ignored(self):
+        code = "import signal, time\nsignal.signal(signal.SIGALRM, signal.SIG_IGN)\ntime.sleep(30)"
+        start = time.time()
+        with self.assertRaises(SafeExecException) as cm:
+            safe_exec(code, {})
+        self.assertLess(time.time() - start, 1 + worker_pool.WORKER_RESPONSE_MARGIN)
+        self.assertIn("status code: -9", text_type(cm.exception))
+
+        # The worker killed the code itself, so it's still usable.
+        g = {}
+        safe_exec("a = 17", g)
+        self.assertEqual(g['a'], 17)
+
+    def test_killed_worker_leaves_no_processes(self):
+        worker = worker_pool.SandboxWorker()
+        worker.process.stdin.write('{"code": "import time; time.sleep(30)", "globals": {}, '
+                                   '"python_path": [], "extra_files": [], "limits": {}}\n')
+        worker.process.stdin.flush()
+        time.sleep(0.5)
+        worker.kill()
+        worker.close()
+        with self.assertRaises(OSError):
+            os.kill(worker.server_pid, 0)
+
+    def test_cache(self):
+        cache = {}
+        safe_exec("a = int(math.pi)", {}, cache=DictCache(cache))
+        self.assertEqual(cache.values(), [(None, {'a': 3})])
+
+        cache[cache.keys()[0]] = (None, {'a': 17})
+        g = {}
+        safe_exec("a = int(math.pi)", g, cache=DictCache(cache))
+        self.assertEqual(g['a'], 17)
+
+
+@unittest.skip("Benchmark, run manually")
+@patch.dict(jail_code.COMMANDS, UNSANDBOXED_PYTHON)
+class WorkerPoolPerfTest(unittest.TestCase):
+    """
+    Benchmark comparing the throughput of cold codejail executions with
+    executions in the worker pool.
+
+    Run manually by removing the skip decorator and running with -s to
+    see the output.  Configure codejail to compare sandboxed executions.
+    """
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    NUM_EXECUTIONS = 20
+    CODE = "a = numpy.linalg.solve(numpy.array([[3, 1], [1, 2]]), numpy.array([9, 8])).tolist()"
+
+    def _executions_per_second(self):
+        """
+        Returns the number of executions of CODE per second.
+        """
+        start_time = time.time()
+        for __ in xrange(self.NUM_EXECUTIONS):
+            safe_exec(self.CODE, {})
+        return self.NUM_EXECUTIONS / (time.time() - start_time)
+
+    def test_cold_vs_warm(self):
+        cold = self._executions_per_second()
+        worker_pool.configure(1)
+        self.addCleanup(worker_pool.configure, 0)
+        safe_exec(self.CODE, {})  # Start the worker.
+        warm = self._executions_per_second()
+        print "cold: {:.1f}/s, warm: {:.1f}/s".format(cold, warm)
+
+
 class DictCache(object):
     """A cache implementation over a simple dict, for testing."""
 
@@ -0,0 +1,294 @@
+"""
+A pool of warm sandboxed Python workers for capa's safe_exec.
+
+Running code with codejail starts a new sandboxed interpreter each time,
+which then imports numpy, scipy and the other sandbox packages again.
+Each worker of this pool is a forking server (see sandbox_worker.py)
+started once in the sandbox, with those packages already imported, that
+forks a fresh child to run each piece of code under the same resource
+limits.  Children don't share any state with each other.
+
+The pool is disabled unless a size is configured, and is only used when
+codejail is configured for Python.  When all the workers are busy, or a
+worker fails, the code is run by codejail as before.
+"""
+import base64
+import json
+import logging
+import os
+import select
+import shutil
+import subprocess
+import tempfile
+import threading
+from Queue import Empty, Queue
+
+from codejail import jail_code
+from codejail.safe_exec import SafeExecException, json_safe
+from codejail.safe_exec import safe_exec as codejail_safe_exec
+from dogapi import dog_stats_api
+
+from . import sandbox_worker
+
+log = logging.getLogger(__name__)
+
+# Seconds to wait for a worker to import the preloaded packages.
+WORKER_STARTUP_TIMEOUT = 60
+
+# Seconds to wait for a response beyond the sandbox's real time limit.
+WORKER_RESPONSE_MARGIN = 5
+
+# We'll need the code from sandbox_worker.py to run it in the sandbox, so read it now.
+sandbox_worker_py_file = sandbox_worker.__file__
+if sandbox_worker_py_file.endswith("c"):
+    sandbox_worker_py_file = sandbox_worker_py_file[:-1]
+
+sandbox_worker_py = open(sandbox_worker_py_file).read()
+
+_POOL_SIZE = 0
+
+# The pool of the current process, as a (pid, pool) pair, so that
+# processes forked after it was started don't share its workers.
+_POOL = (None, None)
+_POOL_LOCK = threading.Lock()
+
+
+class WorkerError(Exception):
+    """
+    Raised when a worker dies or stops responding.
+    """
+    pass
+
+
+def configure(size):
+    """
+    Sets the number of workers each process starts, 0 disabling the pool.
+    """
+    global _POOL_SIZE, _POOL  # pylint: disable=global-statement
+    with _POOL_LOCK:
+        pid, pool = _POOL
+        if pid == os.getpid():
+            pool.close()
+        _POOL_SIZE = size
+        _POOL = (None, None)
+
+
+def is_enabled():
+    """
+    Returns whether code should be run by the worker pool.
+    """
+    return _POOL_SIZE > 0 and jail_code.is_configured("python")
+
+
+def get_pool():
+    """
+    Returns the worker pool of the current process, creating it if needed.
+    """
+    global _POOL  # pylint: disable=global-statement
+    with _POOL_LOCK:
+        pid, pool = _POOL
+        if pid != os.getpid():
+            pool = SandboxWorkerPool(_POOL_SIZE)
+            _POOL = (os.getpid(), pool)
+        return pool
+
+
+def safe_exec(code, globals_dict, python_path=None, extra_files=None, slug=None):
+    """
+    Drop-in replacement for codejail's safe_exec that runs the code in a
+    warm worker, falling back to codejail when no worker can run it.
+    """
+    extra_files = extra_files or []
+    extra_file_names = set(name for name, __ in extra_files)
+    python_path = python_path or []
+    python_path_names = [os.path.basename(pydir) for pydir in python_path]
+
+    # Files copied from outside the sandbox are only supported by codejail.
+    if all(name in extra_file_names for name in python_path_names):
+        try:
+            result = get_pool().execute(code, json_safe(globals_dict), python_path_names, extra_files)
+        except WorkerError:
+            log.warning("safe_exec worker failed running %s, falling back to codejail", slug, exc_info=True)
+            result = None
+    else:
+        result = None
+
+    if result is None:
+        dog_stats_api.increment('capa.safe_exec.worker_pool.fallback')
+        codejail_safe_exec(code, globals_dict, python_path=python_path, extra_files=extra_files, slug=slug)
+        return
+
+    if result["status"] != 0:
+        raise SafeExecException((
+            "Couldn't execute jailed code: stdout: {stdout!r}, "
+            "stderr: {stderr!r} with status code: {status}"
+        ).format(stdout="", stderr=result["stderr"].encode("utf-8"), status=result["status"]))
+    globals_dict.update(result["globals"])
+
+
+class SandboxWorker(object):
+    """
+    A forking server running in the sandbox, in its own home directory.
+    """
+    def __init__(self):
+        command = jail_code.COMMANDS["python"]
+        self.homedir = tempfile.mkdtemp(prefix="codejail-")
+        # Make the directory readable by the sandbox user, and give it a
+        # world-writable temp directory, as codejail does.
+        os.chmod(self.homedir, 0775)
+        tmpdir = os.path.join(self.homedir, "tmp")
+        os.mkdir(tmpdir)
+        os.chmod(tmpdir, 0777)
+        with open(os.path.join(self.homedir, "sandbox_worker.py"), "w") as worker_file:
+            worker_file.write(sandbox_worker_py)
+
+        cmd = []
+        if command["user"]:
+            cmd.extend(["sudo", "-u", command["user"]])
+        cmd.extend(command["cmdline_start"])
+        cmd.extend(["sandbox_worker.py", "tmp"])
+        with open(os.devnull, "w") as devnull:
+            self.process = subprocess.Popen(
+                cmd, cwd=self.homedir, env={}, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=devnull,
+            )
+        self.user = command["user"]
+        self.server_pid = None
+        try:
+            ready = self._read_line(WORKER_STARTUP_TIMEOUT).split()
+            if len(ready) != 2 or ready[0] != "ready":
+                raise WorkerError("Worker didn't start")
+            self.server_pid = int(ready[1])
+        except WorkerError:
+            self.kill()
+            self.close()
+            raise
+
+    def _read_line(self, timeout):
+        """
+        Returns the next line written by the worker, waiting at most the
+        given number of seconds for it, or forever if timeout is None.
+        """
+        ready, __, __ = select.select([self.process.stdout], [], [], timeout)
+        if not ready:
+            raise WorkerError("Worker timed out")
+        line = self.process.stdout.readline()
+        if not line:
+            raise WorkerError("Worker exited with status {}".format(self.process.poll()))
+        return line
+
+    def execute(self, code, globals_dict, python_path, extra_files):
+        """
+        Runs the given code in a fresh child of the worker and returns
+        the worker's response.
+        """
+        limits = dict(jail_code.LIMITS)
+        request = {
+            "code": code,
+            "globals": globals_dict,
+            "python_path": python_path,
+            "extra_files": [(name, base64.b64encode(contents)) for name, contents in extra_files],
+            "limits": limits,
+        }
+        timeout = limits["REALTIME"] + WORKER_RESPONSE_MARGIN if limits.get("REALTIME") else None
+        try:
+            self.process.stdin.write(json.dumps(request) + "\n")
+            self.process.stdin.flush()
+        except IOError as exc:
+            raise WorkerError(exc)
+        return json.loads(self._read_line(timeout))
+
+    def kill(self):
+        """
+        Kills the worker's server and the children it forked, for when the
+        worker stopped responding and won't exit when its stdin is closed.
+        """
+        # Like codejail, kill processes running as the sandbox user with
+        # sudo pkill, since they can't be killed from here directly.
+        pkill = ["sudo", "pkill", "-9"] if self.user else ["pkill", "-9"]
+        with open(os.devnull, "w") as devnull:
+            if self.server_pid is not None:
+                subprocess.call(pkill + ["-P", str(self.server_pid)], stdout=devnull, stderr=devnull)
+            if self.user:
+                subprocess.call(pkill + ["-P", str(self.process.pid)], stdout=devnull, stderr=devnull)
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+
+    def close(self):
+        """
+        Stops the worker and removes its home directory.
+        """
+        # The worker exits once its stdin is closed, even if it's run by
+        # a sudo process that can't be killed.
+        self.process.stdin.close()
+        if self.process.poll() is None:
+            self.process.kill()
+        shutil.rmtree(self.homedir, ignore_errors=True)
+
+
+class SandboxWorkerPool(object):
+    """
+    A pool of up to the given number of SandboxWorkers, started when
+    first needed.
+    """
+    def __init__(self, size):
+        self.size = size
+        self._idle_workers = Queue()
+        self._num_workers = 0
+        self._lock = threading.Lock()
+
+    def execute(self, code, globals_dict, python_path, extra_files):
+        """
+        Runs the given code in an idle worker and returns the worker's
+        response, or None if all the workers are busy.
+        """
+        worker = self._checkout()
+        if worker is None:
+            return None
+        try:
+            result = worker.execute(code, globals_dict, python_path, extra_files)
+        except WorkerError:
+            worker.kill()
+            self._discard(worker)
+            raise
+        self._idle_workers.put(worker)
+        return result
+
+    def _checkout(self):
+        """
+        Returns an idle worker, starting a new one if the pool isn't full.
+        """
+        try:
+            return self._idle_workers.get(block=False)
+        except Empty:
+            pass
+        with self._lock:
+            if self._num_workers >= self.size:
+                return None
+            self._num_workers += 1
+        try:
+            return SandboxWorker()
+        except (OSError, WorkerError):
+            log.exception("Couldn't start a safe_exec worker")
+            with self._lock:
+                self._num_workers -= 1
+            return None
+
+    def _discard(self, worker):
+        """
+        Stops the given worker, making room for a new one.
+        """
+        worker.close()
+        with self._lock:
+            self._num_workers -= 1
+
+    def close(self):
+        """
+        Stops the idle workers.
+        """
+        while True:
+            try:
+                worker = self._idle_workers.get(block=False)
+            except Empty:
+                break
+            self._discard(worker)
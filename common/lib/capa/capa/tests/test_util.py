@@ -5,7 +5,13 @@ import unittest
 from lxml import etree
 
 from capa.tests.helpers import test_capa_system
-from capa.util import compare_with_tolerance, sanitize_html, get_inner_html_from_xpath, remove_markup
+from capa.util import (
+    compare_all_with_tolerance,
+    compare_with_tolerance,
+    get_inner_html_from_xpath,
+    remove_markup,
+    sanitize_html
+)
 
 
 class UtilTest(unittest.TestCase):
@@ -106,6 +112,35 @@ class UtilTest(unittest.TestCase):
         result = compare_with_tolerance(111.0, complex(100.0, 0), '10%', True)
         self.assertTrue(result)
 
+    def test_compare_all_with_tolerance(self):
+        infinity = float('inf')
+        nan = float('nan')
+        cases = [
+            ([100.01, 100.0, 5.0], [100.0, 100.0, 5.0], 0.01, False),
+            ([100.01, 100.0], [100.0, 100.0], '0.01%', False),
+            ([100.002, 100.0], [100.0, 100.0], 0.001, False),
+            ([111.0, 10.0], [100.0, 10.5], '10%', True),
+            ([1.0, 2.0000000001], [1.0, 2.0], '0.001%', False),
+            ([1.0, 2.1], [1.0, 2.0], '0.001%', False),
+            ([1.0, infinity], [1.0, infinity], '1.0', False),
+            ([1.0, infinity], [1.0, -infinity], '1.0', False),
+            ([1.0, nan], [1.0, 1.0], '1.0', False),
+            ([0.4, 100.01], [complex(0.44, 0), complex(100.0, 0)], 0.01, False),
+            ([complex(1, 1), 2.0], [complex(1, 1.0001), 2.0], '0.1', False),
+            ([1.0, 2.0], [1.0], '0.1', False),
+            ([], [], '0.1', False),
+        ]
+        for student, instructor, tolerance, relative_tolerance in cases:
+            expected = all(
+                compare_with_tolerance(student_value, instructor_value, tolerance, relative_tolerance)
+                for student_value, instructor_value in zip(student, instructor)
+            )
+            self.assertEqual(
+                compare_all_with_tolerance(student, instructor, tolerance, relative_tolerance),
+                expected,
+                msg=(student, instructor, tolerance),
+            )
+
     def test_sanitize_html(self):
         """
         Test for html sanitization with bleach.
@@ -5,6 +5,7 @@ import re
 from decimal import Decimal
 
 import bleach
+import numpy
 from lxml import etree
 
 from calc import evaluator
@@ -94,6 +95,65 @@ def compare_with_tolerance(student_complex, instructor_complex, tolerance=defaul
         return abs(student_complex - instructor_complex) <= tolerance
 
 
+def compare_all_with_tolerance(student_values, instructor_values, tolerance=default_tolerance,
+                               relative_tolerance=False):
+    """
+    Return whether `compare_with_tolerance` is true for every pair of values
+    of the `student_values` and `instructor_values` lists.
+
+    The pairs are compared at once with numpy arrays. The pairs that
+    `compare_with_tolerance` handles specially, being infinite or not a
+    number, and the pairs whose difference is so close to the tolerance that
+    its decimal comparison could decide otherwise, are then compared one by
+    one with `compare_with_tolerance`.
+    """
+    student_array = numpy.array(student_values)
+    instructor_array = numpy.array(instructor_values)
+    if (
+            student_array.shape != instructor_array.shape or student_array.ndim != 1 or
+            student_array.dtype.kind not in 'biufc' or instructor_array.dtype.kind not in 'biufc'
+    ):
+        return all(
+            compare_with_tolerance(student, instructor, tolerance, relative_tolerance)
+            for student, instructor in zip(student_values, instructor_values)
+        )
+
+    with numpy.errstate(all='ignore'):
+        student_abs = numpy.abs(student_array)
+        instructor_abs = numpy.abs(instructor_array)
+        tolerance_array = tolerance
+        relative_tolerance_array = relative_tolerance
+        if isinstance(tolerance, str):
+            if tolerance == default_tolerance:
+                relative_tolerance_array = True
+            if tolerance.endswith('%'):
+                tolerance_array = evaluator(dict(), dict(), tolerance[:-1]) * 0.01
+                if not relative_tolerance_array:
+                    tolerance_array = tolerance_array * instructor_abs
+            else:
+                tolerance_array = evaluator(dict(), dict(), tolerance)
+        if relative_tolerance_array:
+            tolerance_array = tolerance_array * numpy.maximum(student_abs, instructor_abs)
+        tolerance_array = tolerance_array + numpy.zeros(student_array.shape)
+
+        difference = numpy.abs(student_array - instructor_array)
+        # The decimal comparison rounds the values to 12 significant digits.
+        rounding = 1e-11 * (student_abs + instructor_abs + numpy.abs(tolerance_array))
+        compared_at_once = (
+            numpy.isfinite(student_array) & numpy.isfinite(instructor_array) & numpy.isfinite(tolerance_array) &
+            (numpy.abs(difference - tolerance_array) > rounding)
+        )
+
+    if not numpy.all(difference[compared_at_once] <= tolerance_array[compared_at_once]):
+        return False
+    return all(
+        compare_with_tolerance(student, instructor, tolerance, relative_tolerance)
+        for student, instructor in zip(
+            student_array[~compared_at_once].tolist(), instructor_array[~compared_at_once].tolist(),
+        )
+    )
+
+
 def contextualize_text(text, context):  # private
     """
     Takes a string with variables. E.g. $a+$b.
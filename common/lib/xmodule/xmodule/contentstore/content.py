@@ -10,7 +10,9 @@ XASSET_THUMBNAIL_TAIL_NAME = '.jpg'
 STREAM_DATA_CHUNK_SIZE = 1024
 VERSIONED_ASSETS_PREFIX = '/assets/courseware'
 VERSIONED_ASSETS_PATTERN = r'/assets/courseware/(v[\d]/)?([a-f0-9]{32})'
+DEFAULT_THUMBNAIL_DIMENSIONS = (128, 128)
 
+import hashlib
 import os
 import logging
 import StringIO
@@ -27,7 +29,7 @@ from PIL import Image
 
 class StaticContent(object):
     def __init__(self, loc, name, content_type, data, last_modified_at=None, thumbnail_location=None, import_path=None,
-                 length=None, locked=False, content_digest=None):
+                 length=None, locked=False, content_digest=None, thumbnail_source=None):
         self.location = loc
         self.name = name  # a display string which can be edited, and thus not part of the location which needs to be fixed
         self.content_type = content_type
@@ -40,6 +42,9 @@ class StaticContent(object):
         self.import_path = import_path
         self.locked = locked
         self.content_digest = content_digest
+        # for thumbnails, identifies the bytes of the original and the parameters the thumbnail
+        # was generated with, so that identical thumbnails don't get generated again
+        self.thumbnail_source = thumbnail_source
 
     @property
     def is_thumbnail(self):
@@ -336,6 +341,12 @@ class StaticContentStream(StaticContent):
             position += STREAM_DATA_CHUNK_SIZE
             yield chunk
 
+    def read(self, size=-1):
+        """
+        Read up to `size` bytes of the data, so that the stream can be used as a file object
+        """
+        return self._stream.read(size)
+
     def close(self):
         self._stream.close()
 
@@ -386,6 +397,16 @@ class ContentStore(object):
         """
         raise NotImplementedError
 
+    def find_thumbnail_by_source(self, thumbnail_source):
+        """
+        Find a saved thumbnail which was generated with the given `thumbnail_source` key (see
+        `generate_thumbnail`), in any course.
+
+        Returns a tuple of (content_type, data), or None if there's no such thumbnail, in which
+        case the thumbnail gets generated again.
+        """
+        return None
+
     def generate_thumbnail(self, content, tempfile_path=None, dimensions=None):
         """Create a thumbnail for a given image.
 
@@ -409,11 +430,27 @@ class ContentStore(object):
         thumbnail_file_location = StaticContent.compute_location(
             content.location.course_key, thumbnail_name, is_thumbnail=True
         )
+        is_image = content.content_type is not None and content.content_type.split('/')[0] == 'image'
 
         # if we're uploading an image, then let's generate a thumbnail so that we can
         # serve it up when needed without having to rescale on the fly
         try:
-            if is_svg:
+            thumbnail_source = None
+            if is_image:
+                thumbnail_source = _compute_thumbnail_source(content, tempfile_path, dimensions, is_svg)
+            existing_thumbnail = None
+            if thumbnail_source is not None:
+                existing_thumbnail = self.find_thumbnail_by_source(thumbnail_source)
+
+            if existing_thumbnail is not None:
+                # the same image was already thumbnailed the same way, e.g. by an earlier import or
+                # in the course this one was rerun from, so reuse that thumbnail's bytes
+                thumbnail_content_type, thumbnail_data = existing_thumbnail
+                thumbnail_content = StaticContent(thumbnail_file_location, thumbnail_name,
+                                                  thumbnail_content_type, thumbnail_data,
+                                                  thumbnail_source=thumbnail_source)
+                self.save(thumbnail_content)
+            elif is_svg:
                 # for svg simply store the provided svg file, since vector graphics should be good enough
                 # for downscaling client-side
                 if tempfile_path is None:
@@ -422,9 +459,10 @@ class ContentStore(object):
                     with open(tempfile_path) as f:
                         thumbnail_file = StringIO.StringIO(f.read())
                 thumbnail_content = StaticContent(thumbnail_file_location, thumbnail_name,
-                                                  'image/svg+xml', thumbnail_file)
+                                                  'image/svg+xml', thumbnail_file,
+                                                  thumbnail_source=thumbnail_source)
                 self.save(thumbnail_content)
-            elif content.content_type is not None and content.content_type.split('/')[0] == 'image':
+            elif is_image:
                 # use PIL to do the thumbnail generation (http://www.pythonware.com/products/pil/)
                 # My understanding is that PIL will maintain aspect ratios while restricting
                 # the max-height/width to be whatever you pass in as 'size'
@@ -443,7 +481,7 @@ class ContentStore(object):
                     thumbnail_image = image.convert('RGB')
 
                     if not dimensions:
-                        dimensions = (128, 128)
+                        dimensions = DEFAULT_THUMBNAIL_DIMENSIONS
 
                     thumbnail_image.thumbnail(dimensions, Image.ANTIALIAS)
                     thumbnail_image.save(thumbnail_file, 'JPEG')
@@ -451,7 +489,8 @@ class ContentStore(object):
 
                 # store this thumbnail as any other piece of content
                 thumbnail_content = StaticContent(thumbnail_file_location, thumbnail_name,
-                                                  'image/jpeg', thumbnail_file)
+                                                  'image/jpeg', thumbnail_file,
+                                                  thumbnail_source=thumbnail_source)
 
                 self.save(thumbnail_content)
 
@@ -469,3 +508,28 @@ class ContentStore(object):
         an exception if unable to.
         """
         pass
+
+
+def _compute_thumbnail_source(content, tempfile_path, dimensions, is_svg):
+    """
+    Returns the key identifying a thumbnail of `content`: the md5 of the image's bytes and the
+    parameters the thumbnail is generated with. Returns None if the image's bytes aren't at hand.
+    """
+    source_digest = getattr(content, 'content_digest', None)
+    if source_digest is None:
+        md5 = hashlib.md5()
+        if tempfile_path is not None:
+            with open(tempfile_path, 'rb') as source_file:
+                for chunk in iter(lambda: source_file.read(STREAM_DATA_CHUNK_SIZE * 64), ''):
+                    md5.update(chunk)
+        elif isinstance(content.data, str):
+            md5.update(content.data)
+        else:
+            return None
+        source_digest = md5.hexdigest()
+
+    if is_svg:
+        # svg files are stored as their own thumbnails, whatever the dimensions
+        return u'{}/svg'.format(source_digest)
+    width, height = dimensions or DEFAULT_THUMBNAIL_DIMENSIONS
+    return u'{}/{}x{}.jpg'.format(source_digest, width, height)
@@ -1,6 +1,7 @@
 """
 MongoDB/GridFS-level code for the contentstore.
 """
+import hashlib
 import os
 import json
 import pymongo
@@ -82,18 +83,35 @@ class MongoContentStore(ContentStore):
     def save(self, content):
         content_id, content_son = self.asset_db_key(content.location)
 
+        thumbnail_location = content.thumbnail_location.to_deprecated_list_repr() if content.thumbnail_location else None
+        attrs = dict(
+            content_type=content.content_type,
+            displayname=content.name,
+            thumbnail_location=thumbnail_location,
+            import_path=content.import_path,
+            # getattr b/c caching may mean some pickled instances don't have attr
+            locked=getattr(content, 'locked', False),
+        )
+        thumbnail_source = getattr(content, 'thumbnail_source', None)
+        if thumbnail_source is not None:
+            # only set when present so that the sparse index on it leaves out everything else
+            attrs['thumbnail_source'] = thumbnail_source
+
+        # Re-imports and re-uploads often save the very same bytes again; don't rewrite
+        # them to gridFS then, just update the metadata.
+        content_digest = _in_memory_md5(content.data)
+        if content_digest is not None:
+            result = self.fs_files.update({'_id': content_id, 'md5': content_digest}, {'$set': attrs})
+            if result.get('updatedExisting'):
+                return content
+
         # The way to version files in gridFS is to not use the file id as the _id but just as the filename.
         # Then you can upload as many versions as you like and access by date or version. Because we use
         # the location as the _id, we must delete before adding (there's no replace method in gridFS)
         self.delete(content_id)  # delete is a noop if the entry doesn't exist; so, don't waste time checking
 
-        thumbnail_location = content.thumbnail_location.to_deprecated_list_repr() if content.thumbnail_location else None
-        with self.fs.new_file(_id=content_id, filename=unicode(content.location), content_type=content.content_type,
-                              displayname=content.name, content_son=content_son,
-                              thumbnail_location=thumbnail_location,
-                              import_path=content.import_path,
-                              # getattr b/c caching may mean some pickled instances don't have attr
-                              locked=getattr(content, 'locked', False)) as fp:
+        with self.fs.new_file(_id=content_id, filename=unicode(content.location), content_son=content_son,
+                              **attrs) as fp:
             if hasattr(content.data, '__iter__'):
                 for chunk in content.data:
                     fp.write(chunk)
@@ -152,6 +170,21 @@ class MongoContentStore(ContentStore):
             else:
                 return None
 
+    @autoretry_read()
+    def find_thumbnail_by_source(self, thumbnail_source):
+        """
+        See :meth:`.ContentStore.find_thumbnail_by_source`
+        """
+        thumbnail = self.fs_files.find_one({'thumbnail_source': thumbnail_source}, {'_id': 1})
+        if thumbnail is None:
+            return None
+        try:
+            with self.fs.get(thumbnail['_id']) as fp:
+                return fp.content_type, fp.read()
+        except NoFile:
+            # deleted since we looked it up
+            return None
+
     def export(self, location, output_directory):
         content = self.find(location)
 
@@ -181,7 +214,6 @@ class MongoContentStore(ContentStore):
             assets_policy_file: the filename for the policy file which should be in the same
                 directory as the other policy files.
         """
-        policy = {}
         assets, __ = self.get_all_content_for_course(course_key)
 
         for asset in assets:
@@ -194,12 +226,37 @@ class MongoContentStore(ContentStore):
             # When debugging course exports, this might be a good place
             # to look. -- pmitros
             self.export(asset['asset_key'], output_directory)
-            for attr, value in asset.iteritems():
-                if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
-                    policy.setdefault(asset['asset_key'].block_id, {})[attr] = value
 
         with open(assets_policy_file, 'w') as f:
-            json.dump(policy, f, sort_keys=True, indent=4)
+            json.dump(_get_assets_policy(assets), f, sort_keys=True, indent=4)
+
+    def export_all_for_course_as_stream(self, course_key, assets_policy_file):
+        """
+        Like `export_all_for_course`, but rather than writing the assets to a directory, returns a
+        generator of (path, content) pairs, one per asset, so that the caller can stream them
+        elsewhere (e.g. into a tarball) without staging them on disk. `path` is relative to the
+        static directory and `content` is a :class:`StaticContentStream` reading the asset from
+        gridFS, which the caller closes.
+
+        Args:
+            course_key (CourseKey): the :class:`CourseKey` identifying the course
+            assets_policy_file: a file object to write the assets' policy to
+        """
+        assets, __ = self.get_all_content_for_course(course_key)
+        json.dump(_get_assets_policy(assets), assets_policy_file, sort_keys=True, indent=4)
+        return self._stream_assets_for_export(assets)
+
+    def _stream_assets_for_export(self, assets):
+        """
+        Yields the export path and a StaticContentStream for each of the given assets.
+        """
+        for asset in assets:
+            content = self.find(asset['asset_key'], as_stream=True)
+            # Escape invalid char from filename, like `export` does.
+            export_path = escape_invalid_characters(name=content.name, invalid_char_list=['/', '\\'])
+            if content.import_path is not None:
+                export_path = os.path.join(os.path.dirname(content.import_path), export_path)
+            yield export_path, content
 
     def get_all_content_thumbnails_for_course(self, course_key):
         return self._get_all_content_for_course(course_key, get_thumbnails=True)[0]
@@ -379,14 +436,14 @@ class MongoContentStore(ContentStore):
         """
         See :meth:`.ContentStore.copy_all_course_assets`
 
-        This implementation fairly expensively copies all of the data
+        This implementation fairly expensively copies all of the data, except for the assets whose
+        data is already in the destination course (e.g. when copying into the same course again)
         """
         source_query = query_for_course(source_course_key)
         # it'd be great to figure out how to do all of this on the db server and not pull the bits over
         for asset in self.fs_files.find(source_query):
             asset_key = self.make_id_son(asset)
-            # don't convert from string until fs access
-            source_content = self.fs.get(asset_key)
+            source_asset_key = asset_key
             if isinstance(asset_key, basestring):
                 asset_key = AssetKey.from_string(asset_key)
                 __, asset_key = self.asset_db_key(asset_key)
@@ -402,16 +459,28 @@ class MongoContentStore(ContentStore):
                     dest_course_key.make_asset_key(asset_key['category'], asset_key['name']).for_branch(None)
                 )
 
-            self.fs.put(
-                source_content.read(),
-                _id=asset_id, filename=asset['filename'], content_type=asset['contentType'],
-                displayname=asset['displayname'], content_son=asset_key,
+            attrs = dict(
+                content_type=asset['contentType'],
+                displayname=asset['displayname'],
                 # thumbnail is not technically correct but will be functionally correct as the code
                 # only looks at the name which is not course relative.
                 thumbnail_location=asset['thumbnail_location'],
                 import_path=asset['import_path'],
                 # getattr b/c caching may mean some pickled instances don't have attr
-                locked=asset.get('locked', False)
+                locked=asset.get('locked', False),
+            )
+            if 'thumbnail_source' in asset:
+                attrs['thumbnail_source'] = asset['thumbnail_source']
+
+            result = self.fs_files.update({'_id': asset_id, 'md5': asset['md5']}, {'$set': attrs})
+            if result.get('updatedExisting'):
+                continue
+
+            # don't convert from string until fs access
+            source_content = self.fs.get(source_asset_key)
+            self.fs.put(
+                source_content.read(),
+                _id=asset_id, filename=asset['filename'], content_son=asset_key, **attrs
             )
 
     def delete_all_course_assets(self, course_key):
@@ -557,6 +626,15 @@ class MongoContentStore(ContentStore):
             sparse=True,
             background=True
         )
+        # Index needed by `find_thumbnail_by_source`, which looks for a thumbnail in any course.
+        create_collection_index(
+            self.fs_files,
+            [
+                ('thumbnail_source', pymongo.ASCENDING)
+            ],
+            sparse=True,
+            background=True
+        )
 
 
 def query_for_course(course_key, category=None):
@@ -580,3 +658,28 @@ def query_for_course(course_key, category=None):
     else:
         dbkey['{}.run'.format(prefix)] = course_key.run
     return dbkey
+
+
+def _get_assets_policy(assets):
+    """
+    Returns the policy exported for the given assets (as returned by `get_all_content_for_course`):
+    their attributes other than gridFS' own, by asset name.
+    """
+    policy = {}
+    for asset in assets:
+        for attr, value in asset.iteritems():
+            if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
+                policy.setdefault(asset['asset_key'].block_id, {})[attr] = value
+    return policy
+
+
+def _in_memory_md5(data):
+    """
+    Returns the md5 hexdigest of the given content data if it is held in memory (a byte string or a
+    StringIO), or None for data which can only be read once, such as a stream of chunks.
+    """
+    if hasattr(data, 'getvalue'):
+        data = data.getvalue()
+    if not isinstance(data, str):
+        return None
+    return hashlib.md5(data).hexdigest()
@@ -1385,6 +1385,26 @@ class ModuleStoreWriteBase(ModuleStoreReadBase, ModuleStoreWrite):
         parent.children.append(item.location)
         self.update_item(parent, user_id)
 
+    def import_xblocks(self, user_id, course_key, blocks, runtime=None, **kwargs):
+        """
+        Imports the given blocks as import_xblock does, one at a time. Stores which can import
+        many blocks at once override this.
+
+        Returns the list of the imported blocks' usage keys.
+
+        Args:
+            user_id: ID of the user importing the blocks
+            course_key: the course to import the blocks into
+            blocks: a list of (block_type, block_id, fields, asides) tuples, parents before children
+            runtime: the runtime of the imported blocks
+        """
+        return [
+            self.import_xblock(  # pylint: disable=no-member
+                user_id, course_key, block_type, block_id, fields, runtime, asides=asides, **kwargs
+            ).location
+            for block_type, block_id, fields, asides in blocks
+        ]
+
     def _flag_library_updated_event(self, library_key):
         """
         Wrapper around calls to fire the library_updated signal
@@ -781,6 +781,20 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         store = self._verify_modulestore_support(course_key, 'import_xblock')
         return store.import_xblock(user_id, course_key, block_type, block_id, fields, runtime, **kwargs)
 
+    @strip_key
+    def import_xblocks(self, user_id, course_key, blocks, runtime=None, **kwargs):
+        """
+        See :py:meth `ModuleStoreWriteBase.import_xblocks`
+
+        Defer to the course's modulestore if it supports this method
+        """
+        store = self._verify_modulestore_support(course_key, 'import_xblocks')
+        blocks = [
+            (block_type, block_id, fields, prepare_asides_to_store(asides))
+            for block_type, block_id, fields, asides in blocks
+        ]
+        return store.import_xblocks(user_id, course_key, blocks, runtime, **kwargs)
+
     @strip_key
     def copy_from_template(self, source_keys, dest_key, user_id, **kwargs):
         """
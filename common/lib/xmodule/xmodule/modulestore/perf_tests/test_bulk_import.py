@@ -0,0 +1,122 @@
+"""
+Performance test for importing a large course into the split modulestore.
+"""
+import unittest
+from shutil import rmtree
+from tempfile import mkdtemp
+
+import ddt
+from lxml import etree
+from mock import patch
+#from nose.plugins.attrib import attr
+from nose.plugins.skip import SkipTest
+from path import Path as path
+
+from xmodule.modulestore import ModuleStoreWriteBase
+from xmodule.modulestore.split_mongo.split_draft import DraftVersioningModuleStore
+from xmodule.modulestore.tests.utils import SPLIT_MODULESTORE_SETUP
+from xmodule.modulestore.xml_importer import import_course_from_xml
+
+# The dependency below needs to be installed manually from the development.txt file, which doesn't
+# get installed during unit tests!
+try:
+    from code_block_timer import CodeBlockTimer
+except ImportError:
+    CodeBlockTimer = None
+
+# Shape of the imported course: 10 chapters of 10 sequentials of 5 verticals
+# of 9 html blocks, that is 5110 blocks under the course block.
+NUM_CHAPTERS = 10
+SEQUENTIALS_PER_CHAPTER = 10
+VERTICALS_PER_SEQUENTIAL = 5
+HTMLS_PER_VERTICAL = 9
+
+COURSE_DIR_NAME = 'bulk_import_course'
+
+
+def make_course_xml(data_dir):
+    """
+    Write a course with the shape above, inlined in its course file, to the given data directory.
+    """
+    course_dir = data_dir / COURSE_DIR_NAME
+    (course_dir / 'course').makedirs_p()
+    with open(course_dir / 'course.xml', 'w') as course_pointer:
+        course_pointer.write('<course url_name="course" org="a" course="course"/>')
+
+    course = etree.Element('course', display_name='Bulk Import Course')
+    for chapter_index in range(NUM_CHAPTERS):
+        chapter = etree.SubElement(
+            course, 'chapter', url_name='chapter_{}'.format(chapter_index),
+            display_name='Chapter {}'.format(chapter_index),
+        )
+        for sequential_index in range(SEQUENTIALS_PER_CHAPTER):
+            sequential_id = '{}_{}'.format(chapter_index, sequential_index)
+            sequential = etree.SubElement(
+                chapter, 'sequential', url_name='sequential_{}'.format(sequential_id),
+                display_name='Sequential {}'.format(sequential_id),
+            )
+            for vertical_index in range(VERTICALS_PER_SEQUENTIAL):
+                vertical_id = '{}_{}'.format(sequential_id, vertical_index)
+                vertical = etree.SubElement(
+                    sequential, 'vertical', url_name='vertical_{}'.format(vertical_id),
+                    display_name='Vertical {}'.format(vertical_id),
+                )
+                for html_index in range(HTMLS_PER_VERTICAL):
+                    html_id = '{}_{}'.format(vertical_id, html_index)
+                    html = etree.SubElement(
+                        vertical, 'html', url_name='html_{}'.format(html_id),
+                        display_name='Html {}'.format(html_id),
+                    )
+                    html.text = 'Text of html {}'.format(html_id)
+
+    with open(course_dir / 'course' / 'course.xml', 'w') as course_file:
+        course_file.write(etree.tostring(course, pretty_print=True))
+
+
+@ddt.ddt
+# Eventually, exclude this attribute from regular unittests while running *only* tests
+# with this attribute during regular performance tests.
+# @attr("perf_test")
+@unittest.skip
+class BulkImportTest(unittest.TestCase):
+    """
+    This class exists to time the import of a course of about 5k blocks into
+    split, with its blocks imported all at once and one at a time.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def setUp(self):
+        super(BulkImportTest, self).setUp()
+        self.data_dir = path(mkdtemp())
+        self.addCleanup(rmtree, self.data_dir, ignore_errors=True)
+        make_course_xml(self.data_dir)
+
+    @ddt.data(True, False)
+    def test_bulk_import_timings(self, bulk):
+        """
+        Generate timings for importing the course with and without split's import_xblocks.
+        """
+        if CodeBlockTimer is None:
+            raise SkipTest("CodeBlockTimer undefined.")
+
+        import_xblocks = DraftVersioningModuleStore.import_xblocks
+        if not bulk:
+            # import the blocks one at a time with import_xblock
+            import_xblocks = ModuleStoreWriteBase.import_xblocks.im_func
+
+        with SPLIT_MODULESTORE_SETUP.build() as (content_store, store):
+            course_key = store.make_course_key('a', 'course', 'course')
+            with patch.object(DraftVersioningModuleStore, 'import_xblocks', import_xblocks):
+                with CodeBlockTimer("BulkImport:{}".format('bulk' if bulk else 'one_at_a_time')):
+                    import_course_from_xml(
+                        store,
+                        'test_user',
+                        self.data_dir,
+                        source_dirs=[COURSE_DIR_NAME],
+                        static_content_store=content_store,
+                        target_id=course_key,
+                        create_if_not_present=True,
+                        raise_on_failure=True,
+                    )
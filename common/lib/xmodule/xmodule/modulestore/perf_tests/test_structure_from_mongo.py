@@ -0,0 +1,93 @@
+"""
+Performance test for converting split modulestore structures read from mongo.
+"""
+import unittest
+
+import ddt
+#from nose.plugins.attrib import attr
+from nose.plugins.skip import SkipTest
+
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.mongo_connection import structure_from_mongo
+
+# The dependency below needs to be installed manually from the development.txt file, which doesn't
+# get installed during unit tests!
+try:
+    from code_block_timer import CodeBlockTimer
+except ImportError:
+    CodeBlockTimer = None
+
+# Number of blocks in the structures converted per test run.
+BLOCK_AMOUNT_PER_TEST = (100, 1000, 10000, 50000)
+
+# Number of blocks accessed after the conversion, as used by a typical request.
+ACCESSED_BLOCK_AMOUNT = 10
+
+
+def make_structure_doc(num_blocks):
+    """
+    Return a structure document, in mongo format, of a course with the given
+    number of blocks, each a child of the course block.
+    """
+    blocks = [
+        {
+            'block_type': 'html',
+            'block_id': 'html_{}'.format(index),
+            'definition': 'definition_{}'.format(index),
+            'fields': {'display_name': 'Html {}'.format(index)},
+            'defaults': {},
+            'edit_info': {'edited_by': 'test_user', 'update_version': 'version'},
+        }
+        for index in range(num_blocks)
+    ]
+    blocks.append({
+        'block_type': 'course',
+        'block_id': 'course',
+        'definition': 'definition_course',
+        'fields': {'children': [['html', 'html_{}'.format(index)] for index in range(num_blocks)]},
+        'defaults': {},
+        'edit_info': {'edited_by': 'test_user', 'update_version': 'version'},
+    })
+    return {'_id': 'version', 'root': ['course', 'course'], 'blocks': blocks}
+
+
+@ddt.ddt
+# Eventually, exclude this attribute from regular unittests while running *only* tests
+# with this attribute during regular performance tests.
+# @attr("perf_test")
+@unittest.skip
+class StructureFromMongoTest(unittest.TestCase):
+    """
+    This class exists to time the conversion of structures read from mongo,
+    when only a few of their blocks are accessed and when all of them are.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    @ddt.data(*BLOCK_AMOUNT_PER_TEST)
+    def test_structure_from_mongo_timings(self, num_blocks):
+        """
+        Generate timings for converting structures with different amounts of blocks.
+        """
+        if CodeBlockTimer is None:
+            raise SkipTest("CodeBlockTimer undefined.")
+
+        # structure_from_mongo converts the documents in place
+        some_structure_doc = make_structure_doc(num_blocks)
+        all_structure_doc = make_structure_doc(num_blocks)
+        accessed_block_keys = [
+            BlockKey('html', 'html_{}'.format(index)) for index in range(min(num_blocks, ACCESSED_BLOCK_AMOUNT))
+        ]
+
+        with CodeBlockTimer("StructureFromMongo:{}".format(num_blocks)):
+
+            with CodeBlockTimer("convert_and_access_some"):
+                structure = structure_from_mongo(some_structure_doc)
+                for block_key in accessed_block_keys:
+                    structure['blocks'][block_key]  # pylint: disable=pointless-statement
+
+            with CodeBlockTimer("convert_and_access_all"):
+                structure = structure_from_mongo(all_structure_doc)
+                for __ in structure['blocks'].itervalues():
+                    pass
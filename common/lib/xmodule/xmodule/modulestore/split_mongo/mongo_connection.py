@@ -8,6 +8,8 @@ import zlib
 import pymongo
 import pytz
 import re
+import threading
+from collections import MutableMapping, OrderedDict
 from contextlib import contextmanager
 from time import time
 
@@ -15,6 +17,7 @@ from time import time
 from pymongo.errors import DuplicateKeyError  # pylint: disable=unused-import
 
 try:
+    from django.conf import settings
     from django.core.cache import caches, InvalidCacheBackendError
     DJANGO_AVAILABLE = True
 except ImportError:
@@ -23,7 +26,7 @@ except ImportError:
 import dogstats_wrapper as dog_stats_api
 import logging
 
-from contracts import check, new_contract
+from contracts import all_disabled, check, new_contract
 from mongodb_proxy import autoretry_read
 from xmodule.exceptions import HeartbeatFailure
 from xmodule.modulestore import BlockData
@@ -34,6 +37,9 @@ from xmodule.mongo_utils import connect_to_mongodb, create_collection_index
 new_contract('BlockData', BlockData)
 log = logging.getLogger(__name__)
 
+# Number of definitions inserted by each call to the db in insert_definitions.
+DEFINITIONS_INSERT_BATCH_SIZE = 500
+
 
 def get_cache(alias):
     """
@@ -163,14 +169,68 @@ class QueryTimer(object):
 TIMER = QueryTimer(__name__, 0.01)
 
 
+class LazyBlockMap(MutableMapping):
+    """
+    The {BlockKey: BlockData} map of the blocks of a structure read from mongo,
+    which converts each block from its mongo format to a BlockData the first
+    time it is accessed, so that requests that only use a few blocks of a large
+    structure don't pay for converting all of them.
+
+    Like the dict it replaces, it must only be given BlockData values.
+    """
+    def __init__(self, blocks):
+        """
+        Arguments:
+            blocks: The list of the structure's blocks, in mongo format.
+        """
+        # {BlockKey: BlockData}, or the block's mongo format until it is accessed
+        self._blocks = {BlockKey(block['block_type'], block.pop('block_id')): block for block in blocks}
+
+    def __getitem__(self, block_key):
+        block = self._blocks[block_key]
+        if type(block) is dict:  # pylint: disable=unidiomatic-typecheck
+            block = self._blocks[block_key] = block_data_from_mongo(block)
+        return block
+
+    def __setitem__(self, block_key, block):
+        self._blocks[block_key] = block
+
+    def __delitem__(self, block_key):
+        del self._blocks[block_key]
+
+    def __contains__(self, block_key):
+        return block_key in self._blocks
+
+    def __iter__(self):
+        return iter(self._blocks)
+
+    def __len__(self):
+        return len(self._blocks)
+
+    def __repr__(self):
+        return repr(dict(self.iteritems()))
+
+
+def block_data_from_mongo(block):
+    """
+    Converts a block from its mongo format to a BlockData, converting
+    'fields.children' from [[block_type, block_id]] to [BlockKey].
+    """
+    if 'children' in block['fields']:
+        block['fields']['children'] = [BlockKey(*child) for child in block['fields']['children']]
+    return BlockData(**block)
+
+
 def structure_from_mongo(structure, course_context=None):
     """
     Converts the 'blocks' key from a list [block_data] to a map
-        {BlockKey: block_data}.
+        {BlockKey: block_data}, which converts each block on first access.
     Converts 'root' from [block_type, block_id] to BlockKey.
     Converts 'blocks.*.fields.children' from [[block_type, block_id]] to [BlockKey].
     N.B. Does not convert any other ReferenceFields (because we don't know which fields they are at this level).
 
+    The structure is only validated when contracts are enabled.
+
     Arguments:
         structure: The document structure to convert
         course_context (CourseKey): For metrics gathering, the CourseKey
@@ -179,19 +239,15 @@ def structure_from_mongo(structure, course_context=None):
     with TIMER.timer('structure_from_mongo', course_context) as tagger:
         tagger.measure('blocks', len(structure['blocks']))
 
-        check('seq[2]', structure['root'])
-        check('list(dict)', structure['blocks'])
-        for block in structure['blocks']:
-            if 'children' in block['fields']:
-                check('list(list[2])', block['fields']['children'])
+        if not all_disabled():
+            check('seq[2]', structure['root'])
+            check('list(dict)', structure['blocks'])
+            for block in structure['blocks']:
+                if 'children' in block['fields']:
+                    check('list(list[2])', block['fields']['children'])
 
         structure['root'] = BlockKey(*structure['root'])
-        new_blocks = {}
-        for block in structure['blocks']:
-            if 'children' in block['fields']:
-                block['fields']['children'] = [BlockKey(*child) for child in block['fields']['children']]
-            new_blocks[BlockKey(block['block_type'], block.pop('block_id'))] = BlockData(**block)
-        structure['blocks'] = new_blocks
+        structure['blocks'] = LazyBlockMap(structure['blocks'])
 
         return structure
 
@@ -207,11 +263,12 @@ def structure_to_mongo(structure, course_context=None):
     with TIMER.timer('structure_to_mongo', course_context) as tagger:
         tagger.measure('blocks', len(structure['blocks']))
 
-        check('BlockKey', structure['root'])
-        check('dict(BlockKey: BlockData)', structure['blocks'])
-        for block in structure['blocks'].itervalues():
-            if 'children' in block.fields:
-                check('list(BlockKey)', block.fields['children'])
+        if not all_disabled():
+            check('BlockKey', structure['root'])
+            check('map(BlockKey: BlockData)', structure['blocks'])
+            for block in structure['blocks'].itervalues():
+                if 'children' in block.fields:
+                    check('list(BlockKey)', block.fields['children'])
 
         new_structure = dict(structure)
         new_structure['blocks'] = []
@@ -225,11 +282,98 @@ def structure_to_mongo(structure, course_context=None):
         return new_structure
 
 
+class LocalStructureCache(object):
+    """
+    Per-process, memory-bounded LRU cache of deserialized course structures,
+    keyed by structure id.
+
+    Structures are immutable once saved, so an entry never needs to be
+    invalidated. The size of each entry is accounted for as the size of its
+    pickled data, which is an underestimate of the memory it actually uses.
+    The cached structures are shared with all callers, so they must not be
+    modified: split modulestore copies a structure before versioning it, and
+    loads definitions into copies of its blocks.
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        # OrderedDict {structure id: (structure, size)}, least recently used first
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Return the structure with the given id, or None if it isn't cached.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            self._entries[key] = entry
+            return entry[0]
+
+    def set(self, key, structure, size):
+        """
+        Cache the given structure, whose pickled data has the given size, and
+        return the number of least recently used structures evicted to make
+        room for it.
+        """
+        if size > self.max_bytes:
+            return 0
+
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.size -= entry[1]
+
+            evicted = 0
+            while self._entries and self.size + size > self.max_bytes:
+                __, (__, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+                evicted += 1
+
+            self._entries[key] = (structure, size)
+            self.size += size
+            return evicted
+
+    def clear(self):
+        """
+        Remove all structures from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_LOCAL_STRUCTURE_CACHE = None
+
+
+def get_local_structure_cache():
+    """
+    Return the process' LocalStructureCache, or None if it is disabled by the
+    COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES setting.
+    """
+    global _LOCAL_STRUCTURE_CACHE  # pylint: disable=global-statement
+
+    max_bytes = getattr(settings, 'COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES', 0) if DJANGO_AVAILABLE else 0
+    if not max_bytes:
+        return None
+    if _LOCAL_STRUCTURE_CACHE is None or _LOCAL_STRUCTURE_CACHE.max_bytes != max_bytes:
+        _LOCAL_STRUCTURE_CACHE = LocalStructureCache(max_bytes)
+    return _LOCAL_STRUCTURE_CACHE
+
+
 class CourseStructureCache(object):
     """
     Wrapper around django cache object to cache course structure objects.
     The course structures are pickled and compressed when cached.
 
+    If a local structure cache is enabled, deserialized structures are also
+    cached in process, in front of the django cache.
+
     If the 'course_structure_cache' doesn't exist, then don't do anything for
     for set and get.
     """
@@ -240,13 +384,23 @@ class CourseStructureCache(object):
                 self.cache = get_cache('course_structure_cache')
             except InvalidCacheBackendError:
                 pass
+        self.local_cache = get_local_structure_cache()
 
     def get(self, key, course_context=None):
         """Pull the compressed, pickled struct data from cache and deserialize."""
-        if self.cache is None:
+        if self.cache is None and self.local_cache is None:
             return None
 
         with TIMER.timer("CourseStructureCache.get", course_context) as tagger:
+            if self.local_cache is not None:
+                structure = self.local_cache.get(key)
+                tagger.tag(from_local_cache=str(structure is not None).lower())
+                if structure is not None:
+                    return structure
+
+            if self.cache is None:
+                return None
+
             compressed_pickled_data = self.cache.get(key)
             tagger.tag(from_cache=str(compressed_pickled_data is not None).lower())
 
@@ -260,17 +414,23 @@ class CourseStructureCache(object):
             pickled_data = zlib.decompress(compressed_pickled_data)
             tagger.measure('uncompressed_size', len(pickled_data))
 
-            return pickle.loads(pickled_data)
+            structure = pickle.loads(pickled_data)
+            self._set_local(tagger, key, structure, len(pickled_data))
+            return structure
 
     def set(self, key, structure, course_context=None):
         """Given a structure, will pickle, compress, and write to cache."""
-        if self.cache is None:
+        if self.cache is None and self.local_cache is None:
             return None
 
         with TIMER.timer("CourseStructureCache.set", course_context) as tagger:
             pickled_data = pickle.dumps(structure, pickle.HIGHEST_PROTOCOL)
             tagger.measure('uncompressed_size', len(pickled_data))
 
+            self._set_local(tagger, key, structure, len(pickled_data))
+            if self.cache is None:
+                return None
+
             # 1 = Fastest (slightly larger results)
             compressed_pickled_data = zlib.compress(pickled_data, 1)
             tagger.measure('compressed_size', len(compressed_pickled_data))
@@ -278,6 +438,19 @@ class CourseStructureCache(object):
             # Stuctures are immutable, so we set a timeout of "never"
             self.cache.set(key, compressed_pickled_data, None)
 
+    def _set_local(self, tagger, key, structure, size):
+        """
+        Add the given structure to the local cache, if it is enabled, and
+        record the resulting size of the local cache.
+        """
+        if self.local_cache is None:
+            return
+
+        evicted = self.local_cache.set(key, structure, size)
+        tagger.measure('local_cache_evictions', evicted)
+        tagger.measure('local_cache_size', self.local_cache.size)
+        tagger.measure('local_cache_entries', len(self.local_cache))
+
 
 class MongoConnection(object):
     """
@@ -578,6 +751,25 @@ class MongoConnection(object):
             tagger.tag(block_type=definition['block_type'])
             self.definitions.insert(definition)
 
+    def insert_definitions(self, definitions, course_context=None):
+        """
+        Create the given definitions in the db, in batches of DEFINITIONS_INSERT_BATCH_SIZE.
+
+        Definitions already in the db are skipped, and a DuplicateKeyError is raised once
+        all the others have been created.
+        """
+        duplicate_key_error = None
+        for start in range(0, len(definitions), DEFINITIONS_INSERT_BATCH_SIZE):
+            batch = definitions[start:start + DEFINITIONS_INSERT_BATCH_SIZE]
+            with TIMER.timer("insert_definitions", course_context) as tagger:
+                tagger.measure('definitions', len(batch))
+                try:
+                    self.definitions.insert(batch, continue_on_error=True)
+                except DuplicateKeyError as error:
+                    duplicate_key_error = error
+        if duplicate_key_error is not None:
+            raise duplicate_key_error
+
     def ensure_indexes(self):
         """
         Ensure that all appropriate indexes are created that are needed by this modulestore, or raise
@@ -258,16 +258,19 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
                 # append only, so if it's already been written, we can just keep going.
                 log.debug("Attempted to insert duplicate structure %s", _id)
 
-        for _id in bulk_write_record.definitions.viewkeys() - bulk_write_record.definitions_in_db:
+        new_definition_ids = sorted(bulk_write_record.definitions.viewkeys() - bulk_write_record.definitions_in_db)
+        if new_definition_ids:
             dirty = True
 
             try:
-                self.db_connection.insert_definition(bulk_write_record.definitions[_id], bulk_write_record.course_key)
+                self.db_connection.insert_definitions(
+                    [bulk_write_record.definitions[_id] for _id in new_definition_ids], bulk_write_record.course_key
+                )
             except DuplicateKeyError:
-                # We may not have looked up this definition inside this bulk operation, and thus
-                # didn't realize that it was already in the database. That's OK, the store is
-                # append only, so if it's already been written, we can just keep going.
-                log.debug("Attempted to insert duplicate definition %s", _id)
+                # We may not have looked up some definitions inside this bulk operation, and thus
+                # didn't realize that they were already in the database. That's OK, the store is
+                # append only, so if they've already been written, we can just keep going.
+                log.debug("Attempted to insert duplicate definitions among %s", new_definition_ids)
 
         if bulk_write_record.index is not None and bulk_write_record.index != bulk_write_record.initial_index:
             dirty = True
@@ -780,6 +783,10 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                     depth,
                     new_module_data
                 )
+            # Keep the copies of the blocks whose definitions were already loaded.
+            for block_key in new_module_data:
+                if block_key in system.module_data:
+                    new_module_data[block_key] = system.module_data[block_key]
 
             # This method supports lazy loading, where the descendent definitions aren't loaded
             # until they're actually needed.
@@ -796,12 +803,17 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                 definitions = {definition['_id']: definition
                                for definition in descendent_definitions}
 
-                for block in new_module_data.itervalues():
-                    if block.definition in definitions:
+                for block_key, block in new_module_data.items():
+                    if block.definition in definitions and not block.definition_loaded:
                         definition = definitions[block.definition]
+                        # The structure's BlockData may be shared with other requests by the
+                        # structure caches, so the definition is merged into a copy of it.
+                        block = copy.copy(block)
+                        block.fields = dict(block.fields)
                         # convert_fields gets done later in the runtime's xblock_from_json
                         block.fields.update(definition.get('fields'))
                         block.definition_loaded = True
+                        new_module_data[block_key] = block
 
             system.module_data.update(new_module_data)
             return system.module_data
@@ -2196,6 +2208,98 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             else:
                 return None
 
+    def import_xblocks(self, user_id, course_key, blocks, runtime=None, **kwargs):
+        """
+        Import the given (block_type, block_id, fields, asides) blocks into the course's branch,
+        overwriting any existing blocks of the same ids, as _update_item_from_fields does for
+        each of them, but in a single new version of the structure and without loading them.
+
+        Returns the list of the imported blocks' usage keys.
+        """
+        with self.bulk_operations(course_key):
+            index_entry = self._get_index_if_valid(course_key, force=True)
+            structure = self._lookup_course(course_key).structure
+            new_structure = None
+            search_target_fields = {}
+
+            for block_type, block_id, fields, asides in blocks:
+                block_key = BlockKey(block_type, block_id)
+                partitioned_fields = self.partition_fields_by_scope(block_type, fields)
+                original_entry = self._get_block_from_structure(new_structure or structure, block_key)
+
+                if original_entry is None:
+                    definition_locator = self.create_definition_from_data(
+                        course_key, partitioned_fields.get(Scope.content, {}), block_type, user_id
+                    )
+                    if new_structure is None:
+                        new_structure = self.version_structure(course_key, structure, user_id)
+                    block_fields = partitioned_fields.get(Scope.settings, {})
+                    if Scope.children in partitioned_fields:
+                        block_fields.update(partitioned_fields[Scope.children])
+                    self._update_block_in_structure(new_structure, block_key, self._new_block(
+                        user_id,
+                        block_type,
+                        block_fields,
+                        definition_locator.definition_id,
+                        new_structure['_id'],
+                        asides=asides
+                    ))
+                    search_target_fields.update(fields or {})
+                    continue
+
+                is_updated = False
+                definition_fields = partitioned_fields[Scope.content]
+                definition_locator = DefinitionLocator(original_entry.block_type, original_entry.definition)
+                if definition_fields:
+                    definition_locator, is_updated = self.update_definition_from_data(
+                        course_key, definition_locator, definition_fields, user_id
+                    )
+
+                # check metadata
+                settings = self._serialize_fields(block_key.type, partitioned_fields[Scope.settings])
+                if not is_updated:
+                    is_updated = self._compare_settings(settings, original_entry.fields)
+
+                # check children
+                if partitioned_fields.get(Scope.children, {}):  # purposely not 'is not None'
+                    serialized_children = [
+                        BlockKey.from_usage_key(child) for child in partitioned_fields[Scope.children]['children']
+                    ]
+                    is_updated = is_updated or original_entry.fields.get('children', []) != serialized_children
+                    if is_updated:
+                        settings['children'] = serialized_children
+
+                asides_data_to_update = None
+                if asides:
+                    asides_data_to_update, asides_updated = self._get_asides_to_update_from_structure(
+                        new_structure or structure, block_key, asides
+                    )
+                else:
+                    asides_updated = False
+
+                if is_updated or asides_updated:
+                    if new_structure is None:
+                        new_structure = self.version_structure(course_key, structure, user_id)
+                    block_data = self._get_block_from_structure(new_structure, block_key)
+                    block_data.definition = definition_locator.definition_id
+                    block_data.fields = settings
+                    if asides_updated:
+                        block_data.asides = asides_data_to_update
+                    block_data.edit_info.source_version = None
+                    self.version_block(block_data, user_id, new_structure['_id'])
+                    search_target_fields.update(definition_fields)
+                    search_target_fields.update(settings)
+
+            if new_structure is not None:
+                self.update_structure(course_key, new_structure)
+                if index_entry is not None:
+                    self._update_search_targets(index_entry, search_target_fields)
+                    self._update_head(course_key, index_entry, course_key.branch, new_structure['_id'])
+                if isinstance(course_key, LibraryLocator):
+                    self._flag_library_updated_event(course_key)
+
+            return [course_key.make_usage_key(block_type, block_id) for block_type, block_id, __, __ in blocks]
+
     def create_xblock(
             self, runtime, course_key, block_type, block_id=None, fields=None,
             definition_id=None, parent_xblock=None, **kwargs
@@ -2432,10 +2536,16 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             # iterate over subtree list filtering out blacklist.
             orphans = set()
             destination_blocks = destination_structure['blocks']
+            # index the source's parents once, rather than searching them for each of many subtrees
+            source_parents = self._get_parents_by_child(source_structure) if len(subtree_list) > 1 else None
             for subtree_root in subtree_list:
                 if BlockKey.from_usage_key(subtree_root) != source_structure['root']:
                     # find the parents and put root in the right sequence
-                    parents = self._get_parents_from_structure(BlockKey.from_usage_key(subtree_root), source_structure)
+                    subtree_root_key = BlockKey.from_usage_key(subtree_root)
+                    if source_parents is None:
+                        parents = self._get_parents_from_structure(subtree_root_key, source_structure)
+                    else:
+                        parents = source_parents.get(subtree_root_key, [])
                     parent_found = False
                     for parent in parents:
                         # If a parent isn't found in the destination_blocks, it's possible it was renamed
@@ -2702,7 +2812,7 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
 
             return result
 
-    @contract(root_block_key=BlockKey, blocks='dict(BlockKey: BlockData)')
+    @contract(root_block_key=BlockKey, blocks='map(BlockKey: BlockData)')
     def _remove_subtree(self, root_block_key, blocks):
         """
         Remove the subtree rooted at root_block_key
@@ -3214,6 +3324,18 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             if block_key in value.fields.get('children', [])
         ]
 
+    def _get_parents_by_child(self, structure):
+        """
+        Return a dict mapping each block key of the structure to the list of its parents, in the
+        order _get_parents_from_structure would return them.
+        """
+        parents_by_child = defaultdict(list)
+        for parent_block_key, value in structure['blocks'].iteritems():
+            for child in value.fields.get('children', []):
+                if parent_block_key not in parents_by_child[child]:
+                    parents_by_child[child].append(parent_block_key)
+        return parents_by_child
+
     def _sync_children(self, source_parent, destination_parent, new_child):
         """
         Reorder destination's children to the same as source's and remove any no longer in source.
@@ -3231,8 +3353,8 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
 
     @contract(
         block_key=BlockKey,
-        source_blocks="dict(BlockKey: *)",
-        destination_blocks="dict(BlockKey: *)",
+        source_blocks="map(BlockKey: *)",
+        destination_blocks="map(BlockKey: *)",
         blacklist="list(BlockKey) | str",
     )
     def _copy_subdag(self, user_id, destination_version, block_key, source_blocks, destination_blocks, blacklist):
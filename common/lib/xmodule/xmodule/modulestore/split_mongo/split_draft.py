@@ -584,6 +584,47 @@ class DraftVersioningModuleStore(SplitMongoModuleStore, ModuleStoreDraftAndPubli
                 allow_not_found=True, force=True, **kwargs
             ) or self.get_item(new_usage_key)
 
+    def import_xblocks(self, user_id, course_key, blocks, runtime=None, **kwargs):
+        """
+        Split-based modulestores need to import published blocks to both branches.
+
+        All the blocks are imported into the draft branch in a single new structure version,
+        then published in a single copy to the published branch.
+        """
+        with self.bulk_operations(course_key):
+            root_block_ids = {
+                'course': self.DEFAULT_ROOT_COURSE_BLOCK_ID,
+                'library': self.DEFAULT_ROOT_LIBRARY_BLOCK_ID,
+            }
+            blocks = [
+                (block_type, root_block_ids.get(block_type, block_id), fields, asides)
+                for block_type, block_id, fields, asides in blocks
+            ]
+
+            is_course = isinstance(course_key, CourseLocator)
+            if is_course and self.get_branch_setting() == ModuleStoreEnum.Branch.published_only:
+                # Override any existing drafts, as import_xblock does.
+                draft_course = course_key.for_branch(ModuleStoreEnum.BranchName.draft)
+                with self.branch_setting(ModuleStoreEnum.Branch.draft_preferred, draft_course):
+                    draft_usage_keys = self.import_xblocks(user_id, draft_course, blocks, runtime, **kwargs)
+                if draft_usage_keys:
+                    super(DraftVersioningModuleStore, self).copy(
+                        user_id,
+                        draft_course,
+                        course_key.replace(branch=ModuleStoreEnum.BranchName.published, version_guid=None),
+                        draft_usage_keys,
+                        blacklist=EXCLUDE_ALL
+                    )
+                    self._flag_publish_event(course_key)
+                return [
+                    usage_key.for_branch(ModuleStoreEnum.BranchName.published) for usage_key in draft_usage_keys
+                ]
+
+            course_key = self._map_revision_to_branch(course_key)  # cast to branch_setting
+            return super(DraftVersioningModuleStore, self).import_xblocks(
+                user_id, course_key, blocks, runtime, **kwargs
+            )
+
     def compute_published_info_internal(self, xblock):
         """
         Get the published branch and find when it was published if it was. Cache the results in the xblock
@@ -8,11 +8,13 @@ import mimetypes
 from tempfile import mkdtemp
 import path
 import shutil
+from mock import patch
 
 from opaque_keys.edx.locator import CourseLocator, AssetLocator
 from opaque_keys.edx.keys import AssetKey
 from xmodule.tests import DATA_DIR
 from xmodule.contentstore.mongo import MongoContentStore
+from xmodule.contentstore import content as content_module
 from xmodule.contentstore.content import StaticContent
 from xmodule.exceptions import NotFoundError
 import ddt
@@ -196,6 +198,65 @@ class TestContentstore(unittest.TestCase):
         __, count = self.contentstore.get_all_content_for_course(dest_course)
         self.assertEqual(count, len(self.course1_files))
 
+    @ddt.data(True, False)
+    def test_copy_assets_again(self, deprecated):
+        """
+        copy_all_course_assets into a course which already has the same assets only updates their metadata
+        """
+        self.set_up_assets(deprecated)
+        dest_course = CourseLocator('test', 'destination', 'copy')
+        self.contentstore.copy_all_course_assets(self.course1_key, dest_course)
+        asset_key = self.course1_key.make_asset_key('asset', self.course1_files[0])
+        self.contentstore.set_attr(asset_key, 'locked', True)
+
+        with patch.object(self.contentstore.fs, 'put') as mock_put:
+            self.contentstore.copy_all_course_assets(self.course1_key, dest_course)
+        self.assertFalse(mock_put.called)
+        dest_key = dest_course.make_asset_key('asset', self.course1_files[0])
+        self.assertTrue(self.contentstore.get_attr(dest_key, 'locked'))
+
+    @ddt.data(True, False)
+    def test_save_same_data(self, deprecated):
+        """
+        Saving an asset's data again only updates its metadata
+        """
+        self.set_up_assets(deprecated)
+        asset_key = self.course1_key.make_asset_key('asset', self.course1_files[1])
+        asset = self.contentstore.find(asset_key)
+
+        with patch.object(self.contentstore.fs, 'new_file') as mock_new_file:
+            self.contentstore.save(
+                StaticContent(asset_key, 'new name', asset.content_type, asset.data, locked=not asset.locked)
+            )
+        self.assertFalse(mock_new_file.called)
+        saved = self.contentstore.find(asset_key)
+        self.assertEqual(saved.name, 'new name')
+        self.assertEqual(saved.locked, not asset.locked)
+        self.assertEqual(saved.last_modified_at, asset.last_modified_at)
+
+        self.contentstore.save(StaticContent(asset_key, 'new name', asset.content_type, 'new data'))
+        self.assertEqual(self.contentstore.find(asset_key).data, 'new data')
+
+    @ddt.data(True, False)
+    def test_thumbnail_reused(self, deprecated):
+        """
+        An image which was already thumbnailed, in any course, doesn't get thumbnailed again
+        """
+        self.set_up_assets(deprecated)
+        asset_key = self.course1_key.make_asset_key('asset', 'picture1.jpg')
+        thumbnail_content, __ = self.contentstore.generate_thumbnail(self.contentstore.find(asset_key))
+
+        with patch.object(content_module.Image, 'open') as mock_open:
+            for course_key in [self.course1_key, self.course2_key]:
+                asset = self.contentstore.find(course_key.make_asset_key('asset', 'picture1.jpg'))
+                __, thumbnail_location = self.contentstore.generate_thumbnail(asset)
+                reused = self.contentstore.find(thumbnail_location)
+                self.assertEqual(reused.data, thumbnail_content.data.getvalue())
+                self.assertEqual(reused.content_type, 'image/jpeg')
+            # a different size is a different thumbnail
+            self.contentstore.generate_thumbnail(asset, dimensions=(20, 20))
+        self.assertEqual(mock_open.call_count, 1)
+
     @ddt.data(True, False)
     def test_delete_assets(self, deprecated):
         """
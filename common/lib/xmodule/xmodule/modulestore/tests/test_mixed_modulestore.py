@@ -459,6 +459,35 @@ class TestMixedModuleStore(CommonMixedModuleStoreSetup):
             cached_block = course.runtime.load_item(block.location)
             self.assertEqual(cached_block.course_version, block.course_version)
 
+    @ddt.data(ModuleStoreEnum.Type.split, ModuleStoreEnum.Type.mongo)
+    def test_import_xblocks(self, default_ms):
+        """
+        Test that import_xblocks imports the given blocks into both branches, as import_xblock does.
+        """
+        self.initdb(default_ms)
+        test_course = self.store.create_course('testx', 'GreekHero', 'test_run', self.user_id)
+        chapter_key = test_course.id.make_usage_key('chapter', 'imported_chapter')
+        sequential_key = test_course.id.make_usage_key('sequential', 'imported_sequential')
+
+        with self.store.branch_setting(ModuleStoreEnum.Branch.published_only, test_course.id):
+            usage_keys = self.store.import_xblocks(
+                self.user_id,
+                test_course.id,
+                [
+                    ('chapter', 'imported_chapter', {'display_name': 'Chapter', 'children': [sequential_key]}, None),
+                    ('sequential', 'imported_sequential', {'display_name': 'Sequential'}, None),
+                ],
+                test_course.runtime,
+            )
+        self.assertEqual(usage_keys, [chapter_key, sequential_key])
+
+        for branch_setting in (ModuleStoreEnum.Branch.draft_preferred, ModuleStoreEnum.Branch.published_only):
+            with self.store.branch_setting(branch_setting, test_course.id):
+                chapter = self.store.get_item(chapter_key)
+                self.assertEqual(chapter.display_name, 'Chapter')
+                self.assertEqual(chapter.children, [sequential_key])
+                self.assertEqual(self.store.get_item(sequential_key).display_name, 'Sequential')
+
     @ddt.data((ModuleStoreEnum.Type.split, 2, False), (ModuleStoreEnum.Type.mongo, 3, True))
     @ddt.unpack
     def test_get_items_include_orphans(self, default_ms, expected_items_in_tree, orphan_in_items):
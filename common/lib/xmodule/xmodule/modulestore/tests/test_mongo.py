@@ -11,7 +11,8 @@ from path import Path as path
 import pymongo
 import logging
 import shutil
-from tempfile import mkdtemp
+import tarfile
+from tempfile import mkdtemp, TemporaryFile
 from uuid import uuid4
 from datetime import datetime
 from pytz import UTC
@@ -30,7 +31,7 @@ from xmodule.modulestore.mongo import MongoKeyValueStore
 from xmodule.modulestore.draft import DraftModuleStore
 from opaque_keys.edx.locator import AssetLocator, BlockUsageLocator, CourseLocator, LibraryLocator
 from opaque_keys.edx.keys import UsageKey
-from xmodule.modulestore.xml_exporter import export_course_to_xml
+from xmodule.modulestore.xml_exporter import export_course_to_tarball, export_course_to_xml
 from xmodule.modulestore.xml_importer import import_course_from_xml, perform_xlint
 from xmodule.contentstore.mongo import MongoContentStore
 
@@ -621,6 +622,34 @@ class TestMongoModuleStore(TestMongoModuleStoreBase):
         self.assertFalse(path(root_dir / 'test_export/static/images/course_image.jpg').isfile())
         self.assertFalse(path(root_dir / 'test_export/static/images_course_image.jpg').isfile())
 
+    @patch('xmodule.video_module.video_module.edxval_api', None)
+    @patch('xmodule.tabs.CourseTab.from_json', side_effect=mock_tab_from_json)
+    def test_export_course_to_tarball(self, _from_json):
+        """
+        Test that exporting to a tarball gives the same files as exporting to a directory
+        """
+        course_key = CourseKey.from_string('edX/toy/2012_Fall')
+        root_dir = path(mkdtemp())
+        self.addCleanup(shutil.rmtree, root_dir)
+        (root_dir / 'xml').makedirs()
+        export_course_to_xml(self.draft_store, self.content_store, course_key, root_dir / 'xml', u'test_export')
+
+        with TemporaryFile() as tarball:
+            report = export_course_to_tarball(self.draft_store, self.content_store, course_key, u'test_export', tarball)
+            tarball.seek(0)
+            with tarfile.open(fileobj=tarball) as tar_file:
+                tar_file.extractall(root_dir / 'tarball')
+
+        exported_files = sorted((root_dir / 'xml').relpathto(f) for f in (root_dir / 'xml').walkfiles())
+        tarball_files = sorted((root_dir / 'tarball').relpathto(f) for f in (root_dir / 'tarball').walkfiles())
+        self.assertEqual(exported_files, tarball_files)
+        for exported_file in exported_files:
+            self.assertEqual(
+                (root_dir / 'xml' / exported_file).bytes(), (root_dir / 'tarball' / exported_file).bytes()
+            )
+        self.assertEqual(report.file_count, len(tarball_files))
+        self.assertEqual(report.byte_count, sum((root_dir / 'tarball' / f).size for f in tarball_files))
+
     def _create_test_tree(self, name, user_id=None):
         """
         Creates and returns a tree with the following structure:
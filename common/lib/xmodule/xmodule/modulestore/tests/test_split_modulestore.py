@@ -14,6 +14,7 @@ import ddt
 from contracts import contract
 from nose.plugins.attrib import attr
 from django.core.cache import caches, InvalidCacheBackendError
+from django.test.utils import override_settings
 
 from openedx.core.lib import tempdir
 from xblock.fields import Reference, ReferenceList, ReferenceValueDict
@@ -29,6 +30,7 @@ from ccx_keys.locator import CCXBlockUsageLocator
 from xmodule.modulestore.inheritance import InheritanceMixin
 from xmodule.x_module import XModuleMixin
 from xmodule.fields import Date, Timedelta
+from xmodule.modulestore.split_mongo.mongo_connection import get_local_structure_cache
 from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
 from xmodule.modulestore.tests.test_modulestore import check_has_course_method
 from xmodule.modulestore.split_mongo import BlockKey
@@ -987,6 +989,40 @@ class TestCourseStructureCache(SplitModuleTest):
         # now make sure that you get the same structure
         self.assertEqual(cached_structure, not_cached_structure)
 
+    @override_settings(COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES=1024 * 1024)
+    def test_local_structure_cache(self):
+        get_local_structure_cache().clear()
+        self.addCleanup(get_local_structure_cache().clear)
+
+        with check_mongo_calls(1):
+            not_cached_structure = self._get_structure(self.new_course)
+
+        # the dummy course_structure_cache doesn't cache anything, but the
+        # deserialized structure is cached in process
+        with check_mongo_calls(0):
+            cached_structure = self._get_structure(self.new_course)
+
+        self.assertIs(cached_structure, not_cached_structure)
+
+    @override_settings(COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES=1024 * 1024)
+    def test_local_structure_cache_not_modified_by_loading_definitions(self):
+        get_local_structure_cache().clear()
+        self.addCleanup(get_local_structure_cache().clear)
+        html = modulestore().create_child(
+            self.user, self.new_course.location, 'html', fields={'data': '<p>Some content</p>'},
+        )
+        course_key = html.location.course_key.version_agnostic()
+
+        course = modulestore().get_course(course_key, depth=None, lazy=False)
+        self.assertEqual(modulestore().get_item(html.location.version_agnostic()).data, '<p>Some content</p>')
+
+        # The definitions were loaded into copies of the cached structure's blocks.
+        with check_mongo_calls(0):
+            structure = modulestore().db_connection.get_structure(course.course_version)
+        block_data = structure['blocks'][BlockKey.from_usage_key(html.location)]
+        self.assertFalse(block_data.definition_loaded)
+        self.assertNotIn('data', block_data.fields)
+
     def test_dummy_cache(self):
         with check_mongo_calls(1):
             not_cached_structure = self._get_structure(self.new_course)
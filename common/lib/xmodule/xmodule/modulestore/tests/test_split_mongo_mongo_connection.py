@@ -1,7 +1,13 @@
 """ Test the behavior of split_mongo/MongoConnection """
+import copy
+import cPickle as pickle
 import unittest
 from mock import patch
-from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection
+from xmodule.modulestore import BlockData
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.mongo_connection import (
+    LazyBlockMap, LocalStructureCache, MongoConnection, structure_from_mongo
+)
 from xmodule.exceptions import HeartbeatFailure
 
 
@@ -17,3 +23,89 @@ class TestHeartbeatFailureException(unittest.TestCase):
 
             with self.assertRaises(HeartbeatFailure):
                 useless_conn.heartbeat()
+
+
+class TestLocalStructureCache(unittest.TestCase):
+    """ Test the LRU eviction and size accounting of LocalStructureCache """
+    def setUp(self):
+        super(TestLocalStructureCache, self).setUp()
+        self.cache = LocalStructureCache(max_bytes=10)
+
+    def test_get_and_set(self):
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.set('a', {'_id': 'a'}, 4), 0)
+        self.assertEqual(self.cache.get('a'), {'_id': 'a'})
+        self.assertEqual((len(self.cache), self.cache.size), (1, 4))
+
+    def test_evicts_least_recently_used(self):
+        self.cache.set('a', 'a', 4)
+        self.cache.set('b', 'b', 4)
+        self.cache.get('a')
+        self.assertEqual(self.cache.set('c', 'c', 4), 1)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('a'), 'a')
+        self.assertEqual(self.cache.get('c'), 'c')
+        self.assertEqual((len(self.cache), self.cache.size), (2, 8))
+
+    def test_set_again(self):
+        self.cache.set('a', 'a', 4)
+        self.cache.set('a', 'a', 6)
+        self.assertEqual((len(self.cache), self.cache.size), (1, 6))
+
+    def test_larger_than_cache(self):
+        self.assertEqual(self.cache.set('a', 'a', 11), 0)
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.size, 0)
+
+    def test_clear(self):
+        self.cache.set('a', 'a', 4)
+        self.cache.clear()
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual((len(self.cache), self.cache.size), (0, 0))
+
+
+class TestStructureFromMongo(unittest.TestCase):
+    """ Test the lazy conversion of structures read from mongo """
+    def setUp(self):
+        super(TestStructureFromMongo, self).setUp()
+        self.structure = structure_from_mongo({
+            '_id': 'version',
+            'root': ['course', 'course'],
+            'blocks': [
+                {
+                    'block_type': 'course',
+                    'block_id': 'course',
+                    'fields': {'children': [['html', 'html_1']]},
+                    'edit_info': {},
+                },
+                {'block_type': 'html', 'block_id': 'html_1', 'fields': {}, 'edit_info': {}},
+            ],
+        })
+        self.blocks = self.structure['blocks']
+        self.course_key = BlockKey('course', 'course')
+        self.html_key = BlockKey('html', 'html_1')
+
+    def test_converts_on_access(self):
+        self.assertIsInstance(self.blocks, LazyBlockMap)
+        self.assertEqual(self.structure['root'], self.course_key)
+        self.assertEqual(set(self.blocks), {self.course_key, self.html_key})
+        self.assertIn(self.html_key, self.blocks)
+        self.assertIsInstance(self.blocks._blocks[self.course_key], dict)  # pylint: disable=protected-access
+
+        course_block = self.blocks[self.course_key]
+        self.assertIsInstance(course_block, BlockData)
+        self.assertEqual(course_block.fields['children'], [self.html_key])
+        self.assertIs(self.blocks[self.course_key], course_block)
+        self.assertIsInstance(self.blocks._blocks[self.html_key], dict)  # pylint: disable=protected-access
+
+    def test_modify(self):
+        new_key = BlockKey('html', 'html_2')
+        self.blocks[new_key] = BlockData(block_type='html')
+        del self.blocks[self.html_key]
+        self.assertEqual(set(self.blocks), {self.course_key, new_key})
+        self.assertEqual(len(self.blocks), 2)
+
+    def test_copy_and_pickle(self):
+        self.blocks[self.course_key]  # pylint: disable=pointless-statement
+        self.assertEqual(copy.deepcopy(self.structure), self.structure)
+        self.assertEqual(pickle.loads(pickle.dumps(self.structure, pickle.HIGHEST_PROTOCOL)), self.structure)
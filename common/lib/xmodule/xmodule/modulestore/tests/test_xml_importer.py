@@ -17,6 +17,8 @@ from xmodule.modulestore.tests.mongo_connection import MONGO_PORT_NUM, MONGO_HOS
 from opaque_keys.edx.keys import CourseKey
 from xmodule.tests import DATA_DIR
 import os
+import shutil
+from tempfile import mkdtemp
 from uuid import uuid4
 from path import Path as path
 import unittest
@@ -385,3 +387,44 @@ class StaticContentImporterTest(unittest.TestCase):
             )
             mock_file.assert_called_with(full_file_path, 'rb')
             self.mocked_content_store.assert_called_once()
+
+    def test_import_static_content_directory_progress(self):
+        progress_callback = mock.Mock()
+        self.static_content_importer.progress_callback = progress_callback
+        mocked_os_walk_yield = [
+            ('static', None, ['file1.txt', 'file2.txt']),
+            ('static/inner', None, ['file1.txt']),
+        ]
+        with mock.patch(
+            'xmodule.modulestore.xml_importer.os.walk',
+            return_value=mocked_os_walk_yield
+        ), mock.patch.object(
+            self.static_content_importer, 'import_static_file', side_effect=lambda file_path, base_dir: (
+                file_path, 'key:' + file_path
+            )
+        ):
+            remap_dict = self.static_content_importer.import_static_content_directory('static')
+
+        self.assertEqual(remap_dict, {
+            'static/file1.txt': 'key:static/file1.txt',
+            'static/file2.txt': 'key:static/file2.txt',
+            'static/inner/file1.txt': 'key:static/inner/file1.txt',
+        })
+        progress_callback.assert_called_once_with(3, 3)
+
+    def test_import_large_static_file(self):
+        base_dir = path(mkdtemp())
+        self.addCleanup(shutil.rmtree, base_dir)
+        full_file_path = base_dir / 'large_file.pdf'
+        with open(full_file_path, 'wb') as large_file:
+            large_file.write('0123456789' * 10)
+        self.mocked_content_store.generate_thumbnail.return_value = (None, None)
+
+        with mock.patch('xmodule.modulestore.xml_importer.STATIC_CONTENT_STREAM_THRESHOLD', 25), mock.patch(
+            'xmodule.modulestore.xml_importer.STATIC_CONTENT_STREAM_CHUNK_SIZE', 10
+        ):
+            self.static_content_importer.import_static_file(full_file_path, base_dir=base_dir)
+
+        content = self.mocked_content_store.save.call_args[0][0]
+        self.assertEqual(''.join(content.data), '0123456789' * 10)
+        self.mocked_content_store.generate_thumbnail.assert_called_once_with(content, tempfile_path=full_file_path)
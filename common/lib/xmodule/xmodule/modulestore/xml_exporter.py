@@ -3,7 +3,10 @@ Methods for exporting course data to XML
 """
 
 import logging
+import tarfile
+import time
 from abc import abstractmethod
+from collections import namedtuple
 from six import text_type
 import lxml.etree
 from xblock.fields import Scope, Reference, ReferenceList, ReferenceValueDict
@@ -14,9 +17,9 @@ from xmodule.modulestore import EdxJSONEncoder, ModuleStoreEnum
 from xmodule.modulestore.inheritance import own_metadata
 from xmodule.modulestore.store_utilities import draft_node_constructor, get_draft_subtree_roots
 from xmodule.modulestore import LIBRARY_ROOT
+from fs.memoryfs import MemoryFS
 from fs.osfs import OSFS
 from json import dumps
-import os
 
 from xmodule.modulestore.draft_and_published import DIRECT_ONLY_CATEGORIES
 from opaque_keys.edx.locator import CourseLocator, LibraryLocator
@@ -105,7 +108,7 @@ class ExportManager(object):
     """
     Manages XML exporting for courselike objects.
     """
-    def __init__(self, modulestore, contentstore, courselike_key, root_dir, target_dir):
+    def __init__(self, modulestore, contentstore, courselike_key, root_dir, target_dir, root_fs=None):
         """
         Export all modules from `modulestore` and content from `contentstore` as xml to `root_dir`.
 
@@ -114,12 +117,17 @@ class ExportManager(object):
         `courselike_key`: The Locator of the Descriptor to export
         `root_dir`: The directory to write the exported xml to
         `target_dir`: The name of the directory inside `root_dir` to write the content to
+        `root_fs`: An FS to write the exported xml to instead of `root_dir`, which is then ignored. The
+            static assets aren't written to it but left in `static_content` as (path, StaticContentStream)
+            pairs, for the caller to stream them elsewhere (see `export_to_tarball`).
         """
         self.modulestore = modulestore
         self.contentstore = contentstore
         self.courselike_key = courselike_key
         self.root_dir = root_dir
         self.target_dir = text_type(target_dir)
+        self.root_fs = root_fs
+        self.static_content = []
 
     @abstractmethod
     def get_key(self):
@@ -149,13 +157,29 @@ class ExportManager(object):
         Get the target courselike object for this export.
         """
 
+    def export_static_content(self, root_courselike_dir, export_fs):
+        """
+        Export the static assets from the contentstore, and their policy to policies/assets.json.
+        """
+        if self.root_fs is None:
+            self.contentstore.export_all_for_course(
+                self.courselike_key,
+                root_courselike_dir + '/static/',
+                root_courselike_dir + '/policies/assets.json',
+            )
+        else:
+            with export_fs.open(u'policies/assets.json', 'wb') as assets_policy_file:
+                self.static_content = self.contentstore.export_all_for_course_as_stream(
+                    self.courselike_key, assets_policy_file
+                )
+
     def export(self):
         """
         Perform the export given the parameters handed to this class at init.
         """
         with self.modulestore.bulk_operations(self.courselike_key):
 
-            fsm = OSFS(self.root_dir)
+            fsm = self.root_fs if self.root_fs is not None else OSFS(self.root_dir)
             root = lxml.etree.Element('unknown')
 
             # export only the published content
@@ -172,7 +196,7 @@ class ExportManager(object):
             self.process_root(root, export_fs)
 
             # Process extra items-- drafts, assets, etc
-            root_courselike_dir = self.root_dir + '/' + self.target_dir
+            root_courselike_dir = None if self.root_fs is not None else self.root_dir + '/' + self.target_dir
             self.process_extra(root, courselike, root_courselike_dir, xml_centric_courselike_key, export_fs)
 
             # Any last pass adjustments
@@ -202,26 +226,20 @@ class CourseExportManager(ExportManager):
 
     def process_extra(self, root, courselike, root_courselike_dir, xml_centric_courselike_key, export_fs):
         # Export the modulestore's asset metadata.
-        asset_dir = root_courselike_dir + '/' + AssetMetadata.EXPORTED_ASSET_DIR + '/'
-        if not os.path.isdir(asset_dir):
-            os.makedirs(asset_dir)
+        asset_dir = export_fs.makedir(AssetMetadata.EXPORTED_ASSET_DIR, recreate=True)
         asset_root = lxml.etree.Element(AssetMetadata.ALL_ASSETS_XML_TAG)
         course_assets = self.modulestore.get_all_asset_metadata(self.courselike_key, None)
         for asset_md in course_assets:
             # All asset types are exported using the "asset" tag - but their asset type is specified in each asset key.
             asset = lxml.etree.SubElement(asset_root, AssetMetadata.ASSET_XML_TAG)
             asset_md.to_xml(asset)
-        with OSFS(asset_dir).open(AssetMetadata.EXPORTED_ASSET_FILENAME, 'wb') as asset_xml_file:
+        with asset_dir.open(AssetMetadata.EXPORTED_ASSET_FILENAME, 'wb') as asset_xml_file:
             lxml.etree.ElementTree(asset_root).write(asset_xml_file, encoding='utf-8')
 
         # export the static assets
         policies_dir = export_fs.makedir('policies', recreate=True)
         if self.contentstore:
-            self.contentstore.export_all_for_course(
-                self.courselike_key,
-                root_courselike_dir + '/static/',
-                root_courselike_dir + '/policies/assets.json',
-            )
+            self.export_static_content(root_courselike_dir, export_fs)
 
             # If we are using the default course image, export it to the
             # legacy location to support backwards compatibility.
@@ -236,10 +254,8 @@ class CourseExportManager(ExportManager):
                 except NotFoundError:
                     pass
                 else:
-                    output_dir = root_courselike_dir + '/static/images/'
-                    if not os.path.isdir(output_dir):
-                        os.makedirs(output_dir)
-                    with OSFS(output_dir).open(u'course_image.jpg', 'wb') as course_image_file:
+                    export_fs.makedirs(u'static/images', recreate=True)
+                    with export_fs.open(u'static/images/course_image.jpg', 'wb') as course_image_file:
                         course_image_file.write(course_image.data)
 
         # export the static tabs
@@ -320,11 +336,7 @@ class LibraryExportManager(ExportManager):
         export_fs.makedir('policies', recreate=True)
 
         if self.contentstore:
-            self.contentstore.export_all_for_course(
-                self.courselike_key,
-                self.root_dir + '/' + self.target_dir + '/static/',
-                self.root_dir + '/' + self.target_dir + '/policies/assets.json',
-            )
+            self.export_static_content(root_courselike_dir, export_fs)
 
     def post_process(self, root, export_fs):
         """
@@ -353,6 +365,92 @@ def export_library_to_xml(modulestore, contentstore, library_key, root_dir, libr
     LibraryExportManager(modulestore, contentstore, library_key, root_dir, library_dir).export()
 
 
+class ExportReport(namedtuple('ExportReport', ['file_count', 'byte_count', 'seconds'])):
+    """
+    The number of files and (uncompressed) bytes written by an export, and how long it took.
+    """
+    @property
+    def bytes_per_second(self):
+        """
+        The rate at which the export was written.
+        """
+        return self.byte_count / self.seconds if self.seconds else float(self.byte_count)
+
+
+def export_to_tarball(export_manager, fileobj, compress_callback=None):
+    """
+    Perform the export of `export_manager`, which must have been given a `root_fs`, and write it to
+    `fileobj` as a gzipped tarball. Nothing is staged on disk: the xml goes to the `root_fs` and the
+    static assets are streamed from the contentstore into the tarball in chunks. The tarball is written
+    in a single pass, so `fileobj` needn't be seekable and can be e.g. an upload stream.
+
+    `compress_callback` is called once the xml is exported, before the tarball is written.
+
+    Returns an `ExportReport`.
+    """
+    start = time.time()
+    export_manager.export()
+    if compress_callback is not None:
+        compress_callback()
+
+    root_fs = export_manager.root_fs
+    mtime = int(time.time())
+    file_count = byte_count = 0
+    with tarfile.open(fileobj=fileobj, mode='w|gz', encoding='utf-8') as tar_file:
+        for dir_path in root_fs.walk.dirs():
+            tar_file.addfile(_make_tarinfo(dir_path, 0, mtime, tarfile.DIRTYPE))
+
+        # Add the assets before the xml so that files written by the export itself (e.g. the legacy
+        # course image) win on extraction, like they would on disk.
+        static_dir = export_manager.target_dir + u'/static/'
+        for path, content in export_manager.static_content:
+            try:
+                tar_file.addfile(_make_tarinfo(static_dir + path, content.length, mtime), content)
+            finally:
+                content.close()
+            file_count += 1
+            byte_count += content.length
+
+        for file_path in root_fs.walk.files():
+            size = root_fs.getsize(file_path)
+            with root_fs.openbin(file_path) as xml_file:
+                tar_file.addfile(_make_tarinfo(file_path, size, mtime), xml_file)
+            file_count += 1
+            byte_count += size
+
+    return ExportReport(file_count, byte_count, time.time() - start)
+
+
+def _make_tarinfo(path, size, mtime, tar_type=tarfile.REGTYPE):
+    """
+    Returns the TarInfo for a file or directory at `path` in the export.
+    """
+    tarinfo = tarfile.TarInfo(path.lstrip('/'))
+    tarinfo.size = size
+    tarinfo.mtime = mtime
+    tarinfo.type = tar_type
+    tarinfo.mode = 0755 if tar_type == tarfile.DIRTYPE else 0644
+    return tarinfo
+
+
+def export_course_to_tarball(modulestore, contentstore, course_key, course_dir, fileobj, compress_callback=None):
+    """
+    Export the course as a gzipped tarball of `course_dir` to `fileobj`. See `export_to_tarball` for details.
+    """
+    export_manager = CourseExportManager(modulestore, contentstore, course_key, None, course_dir, root_fs=MemoryFS())
+    return export_to_tarball(export_manager, fileobj, compress_callback)
+
+
+def export_library_to_tarball(modulestore, contentstore, library_key, library_dir, fileobj, compress_callback=None):
+    """
+    Export the library as a gzipped tarball of `library_dir` to `fileobj`. See `export_to_tarball` for details.
+    """
+    export_manager = LibraryExportManager(
+        modulestore, contentstore, library_key, None, library_dir, root_fs=MemoryFS()
+    )
+    return export_to_tarball(export_manager, fileobj, compress_callback)
+
+
 def adapt_references(subtree, destination_course_key, export_fs):
     """
     Map every reference in the subtree into destination_course_key and set it back into the xblock fields
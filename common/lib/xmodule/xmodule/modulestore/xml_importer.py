@@ -22,6 +22,8 @@ Modulestore virtual   |          XML physical (draft, published)
 """
 import logging
 from abc import abstractmethod
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
 from opaque_keys.edx.locator import LibraryLocator
 import os
 import mimetypes
@@ -56,12 +58,46 @@ log = logging.getLogger(__name__)
 
 DEFAULT_STATIC_CONTENT_SUBDIR = 'static'
 
+# Number of static files read, thumbnailed and saved at the same time.
+STATIC_CONTENT_IMPORT_WORKERS = 4
+
+# Static files larger than this are saved in chunks read from disk,
+# rather than read into memory.
+STATIC_CONTENT_STREAM_THRESHOLD = 4 * 1024 * 1024
+STATIC_CONTENT_STREAM_CHUNK_SIZE = 256 * 1024
+
+# Number of imported static files between two progress reports.
+STATIC_CONTENT_PROGRESS_INTERVAL = 100
+
+
+def _read_file_chunks(file_path, offset):
+    """
+    Yields the contents of the given file from the given offset, in chunks.
+    """
+    with open(file_path, 'rb') as f:
+        f.seek(offset)
+        while True:
+            chunk = f.read(STATIC_CONTENT_STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
 
 class StaticContentImporter:
-    def __init__(self, static_content_store, course_data_path, target_id):
+    """
+    Imports the static files of a course directory into a contentstore.
+
+    The files are imported by a pool of `num_workers` threads, and
+    `progress_callback`, if given, is called with the number of imported
+    files and the total number of files as the import progresses.
+    """
+    def __init__(self, static_content_store, course_data_path, target_id,
+                 num_workers=STATIC_CONTENT_IMPORT_WORKERS, progress_callback=None):
         self.static_content_store = static_content_store
         self.target_id = target_id
         self.course_data_path = course_data_path
+        self.num_workers = num_workers
+        self.progress_callback = progress_callback
         try:
             with open(course_data_path / 'policies/assets.json') as f:
                 self.policy = json.load(f)
@@ -78,6 +114,7 @@ class StaticContentImporter:
         remap_dict = {}
 
         static_dir = self.course_data_path / content_subdir
+        file_paths = []
         for dirname, _, filenames in os.walk(static_dir):
             for filename in filenames:
 
@@ -88,23 +125,45 @@ class StaticContentImporter:
                         log.debug('skipping static content %s...', file_path)
                     continue
 
-                if verbose:
-                    log.debug('importing static content %s...', file_path)
+                file_paths.append(file_path)
 
-                imported_file_attrs = self.import_static_file(file_path, base_dir=static_dir)
+        def import_file(file_path):
+            """
+            Imports the given static file, from a worker thread.
+            """
+            if verbose:
+                log.debug('importing static content %s...', file_path)
+            return self.import_static_file(file_path, base_dir=static_dir)
 
+        if self.num_workers > 1 and len(file_paths) > 1:
+            executor = ThreadPoolExecutor(max_workers=self.num_workers)
+            imported_files = executor.map(import_file, file_paths)
+        else:
+            executor = None
+            imported_files = (import_file(file_path) for file_path in file_paths)
+
+        try:
+            for num_imported, imported_file_attrs in enumerate(imported_files, 1):
                 if imported_file_attrs:
                     # store the remapping information which will be needed
                     # to subsitute in the module data
                     remap_dict[imported_file_attrs[0]] = imported_file_attrs[1]
 
+                if self.progress_callback and (
+                        num_imported % STATIC_CONTENT_PROGRESS_INTERVAL == 0 or num_imported == len(file_paths)
+                ):
+                    self.progress_callback(num_imported, len(file_paths))
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
         return remap_dict
 
     def import_static_file(self, full_file_path, base_dir):
         filename = os.path.basename(full_file_path)
         try:
             with open(full_file_path, 'rb') as f:
-                data = f.read()
+                data = f.read(STATIC_CONTENT_STREAM_THRESHOLD + 1)
         except IOError:
             # OS X "companion files". See
             # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
@@ -132,13 +191,23 @@ class StaticContentImporter:
         # Check extracted contentType in list of all valid mimetypes
         if not mime_type or mime_type not in self.mimetypes_list:
             mime_type = mimetypes.guess_type(filename)[0]  # Assign guessed mimetype
+
+        # Save large files in chunks, rather than reading them into memory.
+        if len(data) > STATIC_CONTENT_STREAM_THRESHOLD:
+            data = chain([data], _read_file_chunks(full_file_path, len(data)))
+            tempfile_path = full_file_path
+        else:
+            tempfile_path = None
+
         content = StaticContent(
             asset_key, displayname, mime_type, data,
             import_path=file_subpath, locked=locked
         )
 
         # first let's save a thumbnail so we can get back a thumbnail location
-        thumbnail_content, thumbnail_location = self.static_content_store.generate_thumbnail(content)
+        thumbnail_content, thumbnail_location = self.static_content_store.generate_thumbnail(
+            content, tempfile_path=tempfile_path
+        )
 
         if thumbnail_content is not None:
             content.thumbnail_location = thumbnail_location
@@ -195,6 +264,9 @@ class ImportManager(object):
         python_lib_filename: The filename of the courselike's python library. Course authors can optionally
             create this file to implement custom logic in their course.
 
+        static_content_progress_callback: If specified, called with the number of static files imported so far
+            and the total number of static files of each imported directory.
+
         default_class, load_error_modules: are arguments for constructing the XMLModuleStore (see its doc)
     """
     store_class = XMLModuleStore
@@ -208,6 +280,7 @@ class ImportManager(object):
             create_if_not_present=False, raise_on_failure=False,
             static_content_subdir=DEFAULT_STATIC_CONTENT_SUBDIR,
             python_lib_filename='python_lib.zip',
+            static_content_progress_callback=None,
     ):
         self.store = store
         self.user_id = user_id
@@ -223,6 +296,7 @@ class ImportManager(object):
         self.do_import_python_lib = do_import_python_lib
         self.create_if_not_present = create_if_not_present
         self.raise_on_failure = raise_on_failure
+        self.static_content_progress_callback = static_content_progress_callback
         self.xml_module_store = self.store_class(
             data_dir,
             default_class=default_class,
@@ -254,7 +328,8 @@ class ImportManager(object):
         static_content_importer = StaticContentImporter(
             self.static_content_store,
             course_data_path=data_path,
-            target_id=dest_id
+            target_id=dest_id,
+            progress_callback=self.static_content_progress_callback,
         )
         if self.do_import_static:
             if self.verbose:
@@ -415,9 +490,35 @@ class ImportManager(object):
         """
         Recursively imports all child blocks from the temporary modulestore into the
         target modulestore.
+
+        The blocks are imported in batches with the store's import_xblocks, each batch
+        ending with a library content block, whose children are then updated from its
+        library before the next blocks are imported.
         """
         all_locs = set(self.xml_module_store.modules[courselike_key].keys())
         all_locs.remove(source_courselike.location)
+        batch = []
+
+        def import_batch():
+            """
+            Imports the blocks of the current batch.
+            """
+            usage_keys = self.store.import_xblocks(self.user_id, dest_id, batch, courselike.runtime)
+            if usage_keys and usage_keys[-1].block_type == 'library_content':
+                _update_imported_library_content(self.store.get_item(usage_keys[-1]), self.store, self.user_id)
+            del batch[:]
+
+        def add_to_batch(module):
+            """
+            Adds the given module to the current batch.
+            """
+            if self.verbose:
+                log.debug('importing module location %s', module.location)
+
+            fields, asides = _get_fields_to_import(module, courselike_key, dest_id, self.do_import_static)
+            batch.append((module.location.block_type, module.location.block_id, fields, asides))
+            if module.location.block_type == 'library_content':
+                import_batch()
 
         def depth_first(subtree):
             """
@@ -431,36 +532,18 @@ class ImportManager(object):
                         # tolerate same child occurring under 2 parents such as in
                         # ContentStoreTest.test_image_import
                         pass
-                    if self.verbose:
-                        log.debug('importing module location %s', child.location)
-
-                    _update_and_import_module(
-                        child,
-                        self.store,
-                        self.user_id,
-                        courselike_key,
-                        dest_id,
-                        do_import_static=self.do_import_static,
-                        runtime=courselike.runtime,
-                    )
+
+                    add_to_batch(child)
 
                     depth_first(child)
 
         depth_first(source_courselike)
 
         for leftover in all_locs:
-            if self.verbose:
-                log.debug('importing module location %s', leftover)
+            add_to_batch(self.xml_module_store.get_item(leftover))
 
-            _update_and_import_module(
-                self.xml_module_store.get_item(leftover),
-                self.store,
-                self.user_id,
-                courselike_key,
-                dest_id,
-                do_import_static=self.do_import_static,
-                runtime=courselike.runtime,
-            )
+        if batch:
+            import_batch()
 
     def run_imports(self):
         """
@@ -715,6 +798,23 @@ def _update_and_import_module(
     """
     logging.debug(u'processing import of module %s...', unicode(module.location))
 
+    fields, asides = _get_fields_to_import(module, source_course_id, dest_course_id, do_import_static)
+
+    block = store.import_xblock(
+        user_id, dest_course_id, module.location.block_type,
+        module.location.block_id, fields, runtime, asides=asides
+    )
+
+    _update_imported_library_content(block, store, user_id)
+
+    return block
+
+
+def _get_fields_to_import(module, source_course_id, dest_course_id, do_import_static):
+    """
+    Return the fields of the module, with its references updated to the destination
+    course id, and its asides, to import it into the destination course.
+    """
     def _update_module_references(module, source_course_id, dest_course_id):
         """
         Move the module to a new course.
@@ -778,12 +878,13 @@ def _update_and_import_module(
 
     fields = _update_module_references(module, source_course_id, dest_course_id)
     asides = module.get_asides() if isinstance(module, XModuleMixin) else None
+    return fields, asides
 
-    block = store.import_xblock(
-        user_id, dest_course_id, module.location.block_type,
-        module.location.block_id, fields, runtime, asides=asides
-    )
 
+def _update_imported_library_content(block, store, user_id):
+    """
+    Update the children of the given block, just imported, if it's a library content block.
+    """
     # TODO: Move this code once the following condition is met.
     # Get to the point where XML import is happening inside the
     # modulestore that is eventually going to store the data.
@@ -805,8 +906,6 @@ def _update_and_import_module(
             if store.get_branch_setting() == ModuleStoreEnum.Branch.published_only:
                 store.publish(block.location, user_id)
 
-    return block
-
 
 def _import_course_draft(
         xml_module_store,
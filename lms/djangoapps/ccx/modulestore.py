@@ -219,6 +219,13 @@ class CCXModulestoreWrapper(object):
                 user_id, course_key, block_type, block_id, fields=fields, runtime=runtime, **kwargs
             ))
 
+    def import_xblocks(self, user_id, course_key, blocks, runtime=None, **kwargs):
+        """See the docs for xmodule.modulestore.mixed.MixedModuleStore"""
+        with remove_ccx(course_key) as (course_key, restore):
+            return restore(self._modulestore.import_xblocks(
+                user_id, course_key, blocks, runtime=runtime, **kwargs
+            ))
+
     def copy_from_template(self, source_keys, dest_key, user_id, **kwargs):
         """See the docs for xmodule.modulestore.mixed.MixedModuleStore"""
         with remove_ccx(dest_key) as (dest_key, restore):
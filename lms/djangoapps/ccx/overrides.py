@@ -4,17 +4,41 @@ by the individual custom courses feature.
 """
 import json
 import logging
+import threading
+from uuid import uuid4
 
 from ccx_keys.locator import CCXBlockUsageLocator, CCXLocator
+from django.core.cache import cache
+from django.core.signals import request_finished
 from django.db import transaction
+from django.dispatch import receiver
 from opaque_keys.edx.keys import CourseKey, UsageKey
 
 from openedx.core.djangoapps.request_cache import get_cache
-from courseware.field_overrides import FieldOverrideProvider
+from courseware.field_overrides import FieldOverrideProvider, clear_resolved_overrides
 from lms.djangoapps.ccx.models import CcxFieldOverride, CustomCourseForEdX
 
 log = logging.getLogger(__name__)
 
+# The decoded overrides of a CCX are shared across processes in the cache,
+# under a key that includes a version which changes whenever they do.
+OVERRIDES_VERSION_CACHE_KEY = u'ccx.overrides.version.{ccx_id}'
+OVERRIDES_CACHE_KEY = u'ccx.overrides.{ccx_id}.{version}'
+OVERRIDES_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+class _PendingInvalidations(threading.local):
+    """
+    The ids of the CCXs whose overrides were changed in the current
+    transaction, so that their version is changed once it is committed.
+    """
+    def __init__(self):
+        super(_PendingInvalidations, self).__init__()
+        self.ccx_ids = set()
+
+
+_PENDING_INVALIDATIONS = _PendingInvalidations()
+
 
 class CustomCoursesForEdxOverrideProvider(FieldOverrideProvider):
     """
@@ -80,24 +104,35 @@ def get_override_for_ccx(ccx, block, name, default=None):
     specify the block and the name of the field.  If the field is not
     overridden for the given ccx, returns `default`.
     """
-    overrides = _get_overrides_for_ccx(ccx)
+    block_overlay = _get_overlay_for_block(ccx, block)
+    if name in block_overlay:
+        return block_overlay[name]
 
-    clean_ccx_key = _clean_ccx_key(block.location)
+    # The _id and _instance entries of the overrides aren't fields of the block.
+    block_overrides = _get_overrides_for_ccx(ccx).get(_clean_ccx_key(block.location), {})
+    return block_overrides.get(name, default)
 
-    block_overrides = overrides.get(clean_ccx_key, {})
 
-    # Hardcode the course_edit_method to be None instead of 'Studio', so,
-    # the LMS never tries to link back to Studio. CCX courses
-    # can't be edited in Studio.
-    block_overrides['course_edit_method'] = None
+def _get_overlay_for_block(ccx, block):
+    """
+    Returns a dictionary mapping field name to overriden value for the fields
+    of the given block overridden by the CCX, decoded once per request so that
+    reading the block's fields, while its course blocks are collected or its
+    module is rendered, doesn't decode them every time.
+    """
+    overlay = get_cache('ccx-overlay').setdefault(ccx, {})
+    if block.location not in overlay:
+        block_overrides = _get_overrides_for_ccx(ccx).get(_clean_ccx_key(block.location), {})
 
-    if name in block_overrides:
-        try:
-            return block.fields[name].from_json(block_overrides[name])
-        except KeyError:
-            return block_overrides[name]
-    else:
-        return default
+        # Hardcode the course_edit_method to be None instead of 'Studio', so,
+        # the LMS never tries to link back to Studio. CCX courses
+        # can't be edited in Studio.
+        block_overlay = {'course_edit_method': None}
+        for name, value in block_overrides.iteritems():
+            if name in block.fields:
+                block_overlay[name] = block.fields[name].from_json(value)
+        overlay[block.location] = block_overlay
+    return overlay[block.location]
 
 
 def _clean_ccx_key(block_location):
@@ -123,33 +158,101 @@ def _get_overrides_for_ccx(ccx):
     overrides_cache = get_cache('ccx-overrides')
 
     if ccx not in overrides_cache:
-        overrides = {}
-        query = CcxFieldOverride.objects.filter(
-            ccx=ccx,
-        )
-
-        for override in query:
-            block_overrides = overrides.setdefault(override.location, {})
-            block_overrides[override.field] = json.loads(override.value)
-            block_overrides[override.field + "_id"] = override.id
-            block_overrides[override.field + "_instance"] = override
+        cache_key = OVERRIDES_CACHE_KEY.format(ccx_id=ccx.id, version=_get_overrides_version(ccx))
+        overrides = cache.get(cache_key)
+        if overrides is None:
+            query = list(CcxFieldOverride.objects.filter(
+                ccx=ccx,
+            ))
+
+            overrides = {}
+            for override in query:
+                block_overrides = overrides.setdefault(override.location, {})
+                block_overrides[override.field] = json.loads(override.value)
+                block_overrides[override.field + "_id"] = override.id
+            cache.set(cache_key, overrides, OVERRIDES_CACHE_TIMEOUT)
+
+            # The instances are only kept for the request, to save changes to them.
+            for override in query:
+                overrides[override.location][override.field + "_instance"] = override
 
         overrides_cache[ccx] = overrides
 
     return overrides_cache[ccx]
 
 
-@transaction.atomic
+def _get_overrides_version(ccx):
+    """
+    Returns the current version of the overrides of the given CCX in the
+    cache.
+    """
+    version_key = OVERRIDES_VERSION_CACHE_KEY.format(ccx_id=ccx.id)
+    version = cache.get(version_key)
+    if version is None:
+        version = uuid4().hex
+        if not cache.add(version_key, version, None):
+            version = cache.get(version_key, version)
+    return version
+
+
+def _invalidate_overrides_for_ccx(ccx):
+    """
+    Changes the version of the overrides of the given CCX in the cache, after
+    they are changed in the database, so that other processes reload them.
+
+    The version is only changed once the changes are committed, since other
+    processes would otherwise cache the overrides they still read from the
+    database under the new version.  Django 1.8 has no transaction.on_commit,
+    so inside a transaction the change is postponed until the request
+    finishes, which is after ATOMIC_REQUESTS commits it, or until the
+    outermost override_field_for_ccx returns.
+    """
+    _clear_overlay_for_ccx(ccx)
+    _PENDING_INVALIDATIONS.ccx_ids.add(ccx.id)
+    if not transaction.get_connection().in_atomic_block:
+        _change_pending_overrides_versions()
+
+
+@receiver(request_finished)
+def _change_pending_overrides_versions(**kwargs):  # pylint: disable=unused-argument
+    """
+    Changes the version of the overrides of the CCXs changed since the last
+    time they were changed.
+    """
+    while _PENDING_INVALIDATIONS.ccx_ids:
+        ccx_id = _PENDING_INVALIDATIONS.ccx_ids.pop()
+        cache.set(OVERRIDES_VERSION_CACHE_KEY.format(ccx_id=ccx_id), uuid4().hex, None)
+
+
+def _clear_overlay_for_ccx(ccx):
+    """
+    Removes the decoded overrides of the given CCX from the request, after
+    they are changed.
+    """
+    get_cache('ccx-overlay').pop(ccx, None)
+    clear_resolved_overrides()
+
+
 def override_field_for_ccx(ccx, block, name, value):
     """
     Overrides a field for the `ccx`.  `block` and `name` specify the block
     and the name of the field on that block to override.  `value` is the
     value to set for the given field.
     """
+    _override_field_for_ccx(ccx, block, name, value)
+    if not transaction.get_connection().in_atomic_block:
+        _change_pending_overrides_versions()
+
+
+@transaction.atomic
+def _override_field_for_ccx(ccx, block, name, value):
+    """
+    Overrides a field for the `ccx` in a transaction.
+    """
     field = block.fields[name]
     value_json = field.to_json(value)
     serialized_value = json.dumps(value_json)
-    override_has_changes = False
+    override_has_changes = created = False
     clean_ccx_key = _clean_ccx_key(block.location)
 
     override = get_override_for_ccx(ccx, block, name + "_instance")
@@ -172,6 +275,9 @@ def override_field_for_ccx(ccx, block, name, value):
         override.value = serialized_value
         override.save()
 
+    if created or override_has_changes:
+        _invalidate_overrides_for_ccx(ccx)
+
     _get_overrides_for_ccx(ccx).setdefault(clean_ccx_key, {})[name] = value_json
     _get_overrides_for_ccx(ccx).setdefault(clean_ccx_key, {})[name + "_instance"] = override
 
@@ -190,6 +296,7 @@ def clear_override_for_ccx(ccx, block, name):
             field=name).delete()
 
         clear_ccx_field_info_from_ccx_map(ccx, block, name)
+        _invalidate_overrides_for_ccx(ccx)
 
     except CcxFieldOverride.DoesNotExist:
         pass
@@ -199,6 +306,7 @@ def clear_ccx_field_info_from_ccx_map(ccx, block, name):  # pylint: disable=inva
     """
     Remove field information from ccx overrides mapping dictionary
     """
+    _clear_overlay_for_ccx(ccx)
     try:
         clean_ccx_key = _clean_ccx_key(block.location)
         ccx_override_map = _get_overrides_for_ccx(ccx).setdefault(clean_ccx_key, {})
@@ -217,3 +325,4 @@ def bulk_delete_ccx_override_fields(ccx, ids):
     ids = list(set(ids))
     if ids:
         CcxFieldOverride.objects.filter(ccx=ccx, id__in=ids).delete()
+        _invalidate_overrides_for_ccx(ccx)
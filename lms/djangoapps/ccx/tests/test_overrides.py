@@ -7,6 +7,7 @@ import datetime
 import mock
 import pytz
 from ccx_keys.locator import CCXLocator
+from django.core.signals import request_finished
 from django.test.utils import override_settings
 from nose.plugins.attrib import attr
 
@@ -14,7 +15,7 @@ from courseware.courses import get_course_by_id
 from courseware.field_overrides import OverrideFieldData
 from courseware.testutils import FieldOverrideTestMixin
 from lms.djangoapps.ccx.models import CustomCourseForEdX
-from lms.djangoapps.ccx.overrides import override_field_for_ccx
+from lms.djangoapps.ccx.overrides import get_override_for_ccx, override_field_for_ccx
 from lms.djangoapps.ccx.tests.utils import flatten, iter_blocks
 from lms.djangoapps.courseware.tests.test_field_overrides import inject_field_overrides
 from openedx.core.djangoapps.request_cache.middleware import RequestCache
@@ -148,6 +149,52 @@ class TestFieldOverrides(FieldOverrideTestMixin, SharedModuleStoreTestCase):
         with self.assertNumQueries(6):
             override_field_for_ccx(self.ccx, chapter, 'start', ccx_start)
 
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_overrides_shared_across_requests(self):
+        """
+        Test that the overrides are read from the cache in later requests,
+        until they are changed.
+        """
+        ccx_start = datetime.datetime(2014, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        new_ccx_start = datetime.datetime(2015, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        chapter = self.ccx_course.get_children()[0]
+        override_field_for_ccx(self.ccx, chapter, 'start', ccx_start)
+        # The test's transaction is never committed, so finish the request
+        # as ATOMIC_REQUESTS would once the changes are committed.
+        request_finished.send(sender=self.__class__)
+
+        RequestCache.clear_request_cache()
+        with self.assertNumQueries(1):
+            self.assertEquals(get_override_for_ccx(self.ccx, chapter, 'start'), ccx_start)
+
+        RequestCache.clear_request_cache()
+        with self.assertNumQueries(0):
+            self.assertEquals(get_override_for_ccx(self.ccx, chapter, 'start'), ccx_start)
+
+        override_field_for_ccx(self.ccx, chapter, 'start', new_ccx_start)
+        request_finished.send(sender=self.__class__)
+        RequestCache.clear_request_cache()
+        self.assertEquals(get_override_for_ccx(self.ccx, chapter, 'start'), new_ccx_start)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_overrides_reloaded_after_commit(self):
+        """
+        Test that overrides read by other processes before a change to them
+        is committed aren't cached as the changed overrides.
+        """
+        ccx_start = datetime.datetime(2014, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        chapter = self.ccx_course.get_children()[0]
+        override_field_for_ccx(self.ccx, chapter, 'start', ccx_start)
+
+        # Another process still sees the overrides from before the change.
+        RequestCache.clear_request_cache()
+        with mock.patch('lms.djangoapps.ccx.overrides.CcxFieldOverride.objects.filter', return_value=[]):
+            self.assertIsNone(get_override_for_ccx(self.ccx, chapter, 'start'))
+
+        request_finished.send(sender=self.__class__)
+        RequestCache.clear_request_cache()
+        self.assertEquals(get_override_for_ccx(self.ccx, chapter, 'start'), ccx_start)
+
     def test_override_is_inherited(self):
         """
         Test that sequentials inherit overridden start date from chapter.
@@ -50,31 +50,16 @@ def get_blocks(
         block_types_filter (list): Optional list of block type names used to filter
             the final result of returned blocks.
     """
-    # create ordered list of transformers, adding BlocksAPITransformer at end.
-    transformers = BlockStructureTransformers()
     if requested_fields is None:
         requested_fields = []
-    include_completion = 'completion' in requested_fields
-    include_special_exams = 'special_exam_info' in requested_fields
-    include_gated_sections = 'show_gated_sections' in requested_fields
-
-    if user is not None:
-        transformers += course_blocks_api.get_course_block_access_transformers()
-        transformers += [MilestonesAndSpecialExamsTransformer(
-            include_special_exams=include_special_exams,
-            include_gated_sections=include_gated_sections)]
-        transformers += [HiddenContentTransformer()]
-    transformers += [
-        BlocksAPITransformer(
-            block_counts,
-            student_view_data,
-            depth,
-            nav_depth
-        )
-    ]
-
-    if include_completion:
-        transformers += [BlockCompletionTransformer()]
+    transformers = get_blocks_transformers(
+        user,
+        depth,
+        nav_depth,
+        requested_fields,
+        block_counts,
+        student_view_data,
+    )
 
     # transform
     blocks = course_blocks_api.get_course_blocks(user, usage_key, transformers)
@@ -103,3 +88,45 @@ def get_blocks(
 
     # return serialized data
     return serializer.data
+
+
+def get_blocks_transformers(
+        user,
+        depth=None,
+        nav_depth=None,
+        requested_fields=None,
+        block_counts=None,
+        student_view_data=None,
+):
+    """
+    Return the ordered collection of transformers that get_blocks applies
+    for the given arguments.  See get_blocks for a description of the
+    arguments.
+    """
+    # create ordered list of transformers, adding BlocksAPITransformer at end.
+    transformers = BlockStructureTransformers()
+    if requested_fields is None:
+        requested_fields = []
+    include_completion = 'completion' in requested_fields
+    include_special_exams = 'special_exam_info' in requested_fields
+    include_gated_sections = 'show_gated_sections' in requested_fields
+
+    if user is not None:
+        transformers += course_blocks_api.get_course_block_access_transformers()
+        transformers += [MilestonesAndSpecialExamsTransformer(
+            include_special_exams=include_special_exams,
+            include_gated_sections=include_gated_sections)]
+        transformers += [HiddenContentTransformer()]
+    transformers += [
+        BlocksAPITransformer(
+            block_counts,
+            student_view_data,
+            depth,
+            nav_depth
+        )
+    ]
+
+    if include_completion:
+        transformers += [BlockCompletionTransformer()]
+
+    return transformers
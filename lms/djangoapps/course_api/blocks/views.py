@@ -9,6 +9,7 @@ from rest_framework.generics import ListAPIView
 from rest_framework.response import Response
 from six import text_type
 
+from openedx.core.djangoapps.content.block_structure import transformer_metrics
 from openedx.core.lib.api.view_utils import DeveloperErrorViewMixin, view_auth_classes
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import ItemNotFoundError
@@ -201,7 +202,7 @@ class BlocksView(DeveloperErrorViewMixin, ListAPIView):
             raise ValidationError(params.errors)
 
         try:
-            return Response(
+            response = Response(
                 get_blocks(
                     request,
                     params.cleaned_data['usage_key'],
@@ -218,6 +219,9 @@ class BlocksView(DeveloperErrorViewMixin, ListAPIView):
         except ItemNotFoundError as exception:
             raise Http404("Block not found: {}".format(text_type(exception)))
 
+        transformer_metrics.set_debug_header(response)
+        return response
+
 
 @view_auth_classes()
 class BlocksInCourseView(BlocksView):
@@ -6,6 +6,7 @@ from django.conf import settings
 
 from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
 from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
+from student.roles import CourseBetaTesterRole
 
 from .transformers import library_content, start_date, user_partitions, visibility, load_override_data
 from .usage_info import CourseUsageInfo
@@ -83,3 +84,91 @@ def get_course_blocks(
         starting_block_usage_key,
         collected_block_structure,
     )
+
+
+def get_course_blocks_for_users(users, starting_block_usage_key, collected_block_structure=None):
+    """
+    A batched version of get_course_blocks, with the default course
+    block access transformers, that yields a (user, block_structure)
+    tuple for each of the given users.
+
+    See SharedCourseBlocks for which users share a block structure.
+    The yielded block structures must therefore not be modified.
+    """
+    shared_course_blocks = SharedCourseBlocks(starting_block_usage_key, collected_block_structure)
+    for user in users:
+        yield user, shared_course_blocks.get(user)
+
+
+class SharedCourseBlocks(object):
+    """
+    Transforms the block structure starting at starting_block_usage_key
+    for many users, with the default course block access transformers.
+
+    The default transformers only depend on a user's staff access, beta
+    tester status and user partition groups in the course, so users with
+    identical values for all of them share a single transformed block
+    structure, which is computed once.  Shared block structures must
+    therefore not be modified.
+
+    If individual student overrides are enabled or the course contains
+    library content, the transformers also depend on per-user state, so
+    the block structure is transformed separately for each user.
+    """
+    def __init__(self, starting_block_usage_key, collected_block_structure=None):
+        self.starting_block_usage_key = starting_block_usage_key
+        self.course_key = starting_block_usage_key.course_key
+        if collected_block_structure is None:
+            collected_block_structure = get_block_structure_manager(self.course_key).get_collected()
+        self.collected_block_structure = collected_block_structure
+
+        self._is_shareable = not has_individual_student_override_provider() and not any(
+            block_key.block_type == 'library_content' for block_key in collected_block_structure
+        )
+        self._user_partitions = collected_block_structure.get_transformer_data(
+            user_partitions.UserPartitionTransformer, 'user_partitions',
+        ) or []
+        self._beta_tester_ids = None
+
+        # dict {access key: BlockStructureBlockData}
+        self._block_structures = {}
+
+    def get(self, user):
+        """
+        Returns the transformed block structure for the given user.
+        """
+        if not self._is_shareable:
+            return self._transform(user)
+
+        access_key = self._get_access_key(user)
+        if access_key not in self._block_structures:
+            self._block_structures[access_key] = self._transform(user)
+        return self._block_structures[access_key]
+
+    def _transform(self, user):
+        """
+        Returns the block structure transformed for the given user.
+        """
+        return get_course_blocks(
+            user,
+            self.starting_block_usage_key,
+            collected_block_structure=self.collected_block_structure,
+        )
+
+    def _get_access_key(self, user):
+        """
+        Returns a hashable value of everything the default transformers
+        depend on for the given user.
+        """
+        if self._beta_tester_ids is None:
+            self._beta_tester_ids = set(
+                CourseBetaTesterRole(self.course_key).users_with_role().values_list('id', flat=True)
+            )
+        user_groups = user_partitions._get_user_partition_groups(  # pylint: disable=protected-access
+            self.course_key, self._user_partitions, user,
+        )
+        return (
+            CourseUsageInfo(self.course_key, user).has_staff_access,
+            user.id in self._beta_tester_ids,
+            frozenset((partition_id, group.id) for partition_id, group in user_groups.iteritems()),
+        )
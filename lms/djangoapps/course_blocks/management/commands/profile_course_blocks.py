@@ -0,0 +1,139 @@
+"""
+Command to profile the transformers of the course blocks API.
+"""
+from __future__ import division
+
+from time import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from lms.djangoapps.course_api.blocks.api import get_blocks_transformers
+from lms.djangoapps.course_blocks.api import get_course_blocks
+from openedx.core.djangoapps.content.block_structure import transformer_metrics
+from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
+from openedx.core.djangoapps.content.block_structure.config import TRANSFORMER_METRICS, waffle
+from openedx.core.djangoapps.content.block_structure.factory import BlockStructureFactory
+from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
+from openedx.core.djangoapps.request_cache import clear_cache
+from openedx.core.lib.command_utils import parse_course_keys
+from xmodule.modulestore.django import modulestore
+
+
+# The requested fields that enable all optional transformers of the
+# course blocks API.
+ALL_REQUESTED_FIELDS = ['completion', 'special_exam_info', 'show_gated_sections']
+
+
+class Command(BaseCommand):
+    """
+    Example usage:
+        $ ./manage.py lms profile_course_blocks 'edX/DemoX/Demo_Course' --username=staff --settings=devstack
+        $ ./manage.py lms profile_course_blocks 'edX/DemoX/Demo_Course' --username=staff --iterations=10 --collect
+    """
+    args = u'<course_id>'
+    help = (
+        u'Profiles the transformers of the course blocks API for the given course and user, '
+        u'reporting the time spent in and the number of blocks given to and retained by each transformer.'
+    )
+
+    def add_arguments(self, parser):
+        """
+        Entry point for subclassed commands to add custom arguments.
+        """
+        parser.add_argument(
+            'course',
+            help=u'Course to profile.',
+        )
+        parser.add_argument(
+            '--username',
+            dest='username',
+            help=u'User for whom the course blocks are transformed.',
+        )
+        parser.add_argument(
+            '--iterations',
+            help=u'Number of times to transform the course blocks.',
+            default=5,
+            type=int,
+        )
+        parser.add_argument(
+            '--collect',
+            help=u'Also profile the collect phase, without updating the stored course blocks.',
+            action='store_true',
+            default=False,
+        )
+
+    def handle(self, *args, **options):
+        course_key = parse_course_keys([options['course']])[0]
+        if not options.get('username'):
+            raise CommandError(u'A username is required.')
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(u'User {} does not exist.'.format(options['username']))
+        if options['iterations'] < 1:
+            raise CommandError(u'The number of iterations must be positive.')
+
+        waffle().override_for_request(TRANSFORMER_METRICS)
+        clear_cache(transformer_metrics.REQUEST_CACHE_NAME)
+
+        if options['collect']:
+            self._collect(course_key)
+        collect_metrics = dict(transformer_metrics.get_recorded_metrics())
+        clear_cache(transformer_metrics.REQUEST_CACHE_NAME)
+
+        total_time = self._transform(course_key, user, options['iterations'])
+
+        self._report(collect_metrics, transformer_metrics.get_recorded_metrics(), options['iterations'])
+        self.stdout.write(u'Average total time: {:.1f} ms'.format(total_time * 1000 / options['iterations']))
+
+    def _collect(self, course_key):
+        """
+        Collects the course blocks of the given course from the
+        modulestore, without storing them.
+        """
+        store = modulestore()
+        with store.bulk_operations(course_key):
+            block_structure = BlockStructureFactory.create_from_modulestore(
+                store.make_course_usage_key(course_key),
+                store,
+            )
+            BlockStructureTransformers.collect(block_structure, record_metrics=True)
+
+    def _transform(self, course_key, user, iterations):
+        """
+        Transforms the course blocks of the given course for the given
+        user the given number of times and returns the total time spent.
+        """
+        collected_block_structure = get_block_structure_manager(course_key).get_collected()
+        course_usage_key = modulestore().make_course_usage_key(course_key)
+
+        start_time = time()
+        for __ in range(iterations):
+            get_course_blocks(
+                user,
+                course_usage_key,
+                get_blocks_transformers(user, requested_fields=ALL_REQUESTED_FIELDS),
+                collected_block_structure,
+            )
+        return time() - start_time
+
+    def _report(self, collect_metrics, transform_metrics, iterations):
+        """
+        Writes a table of the given metrics, averaged over the given
+        number of iterations for the transform metrics.
+        """
+        row_format = u'{:<40} {:>12} {:>14} {:>10} {:>10}'
+        self.stdout.write(row_format.format(
+            u'transformer', u'collect (ms)', u'transform (ms)', u'blocks in', u'blocks out',
+        ))
+        for transformer_name in sorted(set(collect_metrics) | set(transform_metrics)):
+            collected = collect_metrics.get(transformer_name, {})
+            transformed = transform_metrics.get(transformer_name, {})
+            self.stdout.write(row_format.format(
+                transformer_name,
+                u'{:.1f}'.format(collected['collect_time'] * 1000) if 'collect_time' in collected else u'-',
+                u'{:.1f}'.format(transformed.get('transform_time', 0) * 1000 / iterations),
+                u'{:.0f}'.format(transformed.get('blocks_in', 0) / iterations),
+                u'{:.0f}'.format(transformed.get('blocks_out', 0) / iterations),
+            ))
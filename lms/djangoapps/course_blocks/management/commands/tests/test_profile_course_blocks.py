@@ -0,0 +1,40 @@
+"""
+Tests for profile_course_blocks management command.
+"""
+from django.core.management import CommandError, call_command
+from six import StringIO
+
+from student.tests.factories import UserFactory
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+
+
+class TestProfileCourseBlocks(ModuleStoreTestCase):
+    """
+    Tests profile_course_blocks management command.
+    """
+    def setUp(self):
+        super(TestProfileCourseBlocks, self).setUp()
+        self.course = CourseFactory.create()
+        chapter = ItemFactory.create(parent=self.course, category='chapter')
+        ItemFactory.create(parent=chapter, category='sequential')
+        self.student = UserFactory.create()
+
+    def test_profile(self):
+        output = StringIO()
+        call_command(
+            'profile_course_blocks',
+            unicode(self.course.id),
+            username=self.student.username,
+            iterations=2,
+            collect=True,
+            stdout=output,
+        )
+        output = output.getvalue()
+        for transformer_name in ('start_date', 'visibility', 'blocks_api'):
+            self.assertIn(transformer_name, output)
+        self.assertIn('Average total time', output)
+
+    def test_unknown_user(self):
+        with self.assertRaises(CommandError):
+            call_command('profile_course_blocks', unicode(self.course.id), username='nobody')
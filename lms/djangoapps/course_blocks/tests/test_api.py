@@ -0,0 +1,66 @@
+"""
+Tests for course_blocks/api.py
+"""
+from mock import patch
+from nose.plugins.attrib import attr
+
+from student.tests.factories import CourseEnrollmentFactory, UserFactory
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
+from xmodule.modulestore.tests.factories import SampleCourseFactory
+
+from ..api import get_course_blocks, get_course_blocks_for_users
+
+
+@attr(shard=3)
+class GetCourseBlocksForUsersTestCase(SharedModuleStoreTestCase):
+    """
+    Tests for get_course_blocks_for_users
+    """
+    @classmethod
+    def setUpClass(cls):
+        super(GetCourseBlocksForUsersTestCase, cls).setUpClass()
+        with cls.store.default_store(ModuleStoreEnum.Type.split):
+            cls.course = SampleCourseFactory.create()
+
+        # hide the html block from students
+        cls.html_block = cls.store.get_item(cls.course.id.make_usage_key('html', 'html_x1a_1'))
+        cls.html_block.visible_to_staff_only = True
+        cls.store.update_item(cls.html_block, ModuleStoreEnum.UserID.test)
+
+    def setUp(self):
+        super(GetCourseBlocksForUsersTestCase, self).setUp()
+        self.student = UserFactory.create()
+        self.other_student = UserFactory.create()
+        for student in (self.student, self.other_student):
+            CourseEnrollmentFactory.create(user=student, course_id=self.course.id)
+        self.staff = UserFactory.create(is_staff=True)
+        self.users = [self.student, self.staff, self.other_student]
+
+    def assert_same_blocks(self, block_structure, user):
+        """
+        Verifies that the given block_structure has the same blocks as
+        the one returned by get_course_blocks for the given user.
+        """
+        self.assertEquals(
+            set(block_structure),
+            set(get_course_blocks(user, self.course.location)),
+        )
+
+    def test_shared_by_users_with_same_access(self):
+        block_structures = dict(get_course_blocks_for_users(self.users, self.course.location))
+
+        self.assertIs(block_structures[self.student], block_structures[self.other_student])
+        self.assertIsNot(block_structures[self.student], block_structures[self.staff])
+        self.assertNotIn(self.html_block.location, block_structures[self.student])
+        self.assertIn(self.html_block.location, block_structures[self.staff])
+        for user in self.users:
+            self.assert_same_blocks(block_structures[user], user)
+
+    @patch('lms.djangoapps.course_blocks.api.has_individual_student_override_provider', return_value=True)
+    def test_not_shared_with_individual_overrides(self, _mock_provider):
+        block_structures = dict(get_course_blocks_for_users(self.users, self.course.location))
+
+        self.assertIsNot(block_structures[self.student], block_structures[self.other_student])
+        for user in self.users:
+            self.assert_same_blocks(block_structures[user], user)
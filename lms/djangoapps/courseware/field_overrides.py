@@ -21,12 +21,15 @@ from contextlib import contextmanager
 from django.conf import settings
 from xblock.field_data import FieldData
 
+from openedx.core.djangoapps import monitoring_utils
+from openedx.core.djangoapps.request_cache import clear_cache, get_cache
 from openedx.core.djangoapps.request_cache.middleware import RequestCache
 from xmodule.modulestore.inheritance import InheritanceMixin
 
 NOTSET = object()
 ENABLED_OVERRIDE_PROVIDERS_KEY = u'courseware.field_overrides.enabled_providers.{course_id}'
 ENABLED_MODULESTORE_OVERRIDE_PROVIDERS_KEY = u'courseware.modulestore_field_overrides.enabled_providers.{course_id}'
+RESOLVED_OVERRIDES_CACHE_NAME = u'courseware.field_overrides.resolved'
 
 
 def resolve_dotted(name):
@@ -89,6 +92,15 @@ def overrides_disabled():
     return bool(_OVERRIDES_DISABLED.disabled)
 
 
+def clear_resolved_overrides():
+    """
+    Makes `OverrideFieldData` instances forget the overrides they resolved in
+    the current request.  Must be called after changing an override that may
+    have been read already in the request.
+    """
+    clear_cache(RESOLVED_OVERRIDES_CACHE_NAME)
+
+
 class FieldOverrideProvider(object):
     """
     Abstract class which defines the interface that a `FieldOverrideProvider`
@@ -197,18 +209,47 @@ class OverrideFieldData(FieldData):
     def __init__(self, user, fallback, providers):
         self.fallback = fallback
         self.providers = tuple(provider(user) for provider in providers)
+        self._resolved_overrides = {}
+        self._resolved_generation = None
+
+    def _get_resolved_overrides(self):
+        """
+        Returns the dict of the values, including `NOTSET`, resolved by the
+        providers so far in the current request, keyed by (block, name).
+        """
+        generation = get_cache(RESOLVED_OVERRIDES_CACHE_NAME).setdefault('generation', object())
+        if generation is not self._resolved_generation:
+            self._resolved_overrides = {}
+            self._resolved_generation = generation
+        return self._resolved_overrides
 
     def get_override(self, block, name):
         """
         Checks for an override for the field identified by `name` in `block`.
         Returns the overridden value or `NOTSET` if no override is found.
+
+        The result is remembered for the rest of the request, so that the
+        providers are only asked once for each block and field, including
+        those of the block's ancestors for inherited fields.
         """
-        if not overrides_disabled():
+        if overrides_disabled():
+            return NOTSET
+
+        resolved_overrides = self._get_resolved_overrides()
+        try:
+            value = resolved_overrides[(block, name)]
+        except KeyError:
+            monitoring_utils.increment('courseware.field_overrides.resolved.misses')
+            value = NOTSET
             for provider in self.providers:
+                monitoring_utils.increment('courseware.field_overrides.provider_calls')
                 value = provider.get(block, name, NOTSET)
                 if value is not NOTSET:
-                    return value
-        return NOTSET
+                    break
+            resolved_overrides[(block, name)] = value
+        else:
+            monitoring_utils.increment('courseware.field_overrides.resolved.hits')
+        return value
 
     def get(self, block, name):
         value = self.get_override(block, name)
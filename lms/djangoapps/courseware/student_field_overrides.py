@@ -4,9 +4,15 @@ by the individual due dates feature.
 """
 import json
 
-from .field_overrides import FieldOverrideProvider
+from six import text_type
+
+from openedx.core.djangoapps.request_cache import clear_cache, get_cache
+
+from .field_overrides import FieldOverrideProvider, clear_resolved_overrides
 from .models import StudentFieldOverride
 
+REQUEST_CACHE_NAME = u'courseware.student_field_overrides'
+
 
 class IndividualStudentOverrideProvider(FieldOverrideProvider):
     """
@@ -43,19 +49,67 @@ def _get_overrides_for_user(user, block):
     Gets all of the individual student overrides for given user and block.
     Returns a dictionary of field override values keyed by field name.
     """
+    course_overrides = _get_course_overrides_for_user(user, block.runtime.course_id)
+    overrides = {}
+    for field_name, value in course_overrides.get(text_type(block.location), {}).iteritems():
+        overrides[field_name] = block.fields[field_name].from_json(value)
+    return overrides
+
+
+def _get_course_overrides_for_user(user, course_key):
+    """
+    Gets all of the individual student overrides for the given user in the
+    given course, loading them with a single query the first time they are
+    needed in a request. Returns a dictionary of {block location string:
+    {field name: JSON value}}.
+    """
+    cache_key = (user.id, course_key)
+    cache = get_cache(REQUEST_CACHE_NAME)
+    if cache_key not in cache:
+        cache[cache_key] = _query_course_overrides(course_key, [user.id])[user.id]
+    return cache[cache_key]
+
+
+def _query_course_overrides(course_key, user_ids):
+    """
+    Returns the individual student overrides of the given users in the given
+    course, as a dictionary of {user id: {block location string: {field
+    name: JSON value}}}.
+    """
+    overrides = {user_id: {} for user_id in user_ids}
     query = StudentFieldOverride.objects.filter(
-        course_id=block.runtime.course_id,
-        location=block.location,
-        student_id=user.id,
+        course_id=course_key,
+        student_id__in=user_ids,
     )
-    overrides = {}
     for override in query:
-        field = block.fields[override.field]
-        value = field.from_json(json.loads(override.value))
-        overrides[override.field] = value
+        block_overrides = overrides[override.student_id].setdefault(text_type(override.location), {})
+        block_overrides[override.field] = json.loads(override.value)
     return overrides
 
 
+def prefetch_overrides_for_users(course_key, users):
+    """
+    Pre-fetches and caches the individual student overrides of the given
+    users in the given course with a single query, for later fast retrieval
+    by get_override_for_user.
+    """
+    # before populating the cache with another bulk set of data,
+    # remove previously cached entries to keep memory usage low.
+    clear_cache(REQUEST_CACHE_NAME)
+    cache = get_cache(REQUEST_CACHE_NAME)
+    for user_id, overrides in _query_course_overrides(course_key, [user.id for user in users]).iteritems():
+        cache[(user_id, course_key)] = overrides
+
+
+def _clear_cached_overrides(user, course_key):
+    """
+    Removes the cached overrides of the given user in the given course,
+    after they are changed.
+    """
+    get_cache(REQUEST_CACHE_NAME).pop((user.id, course_key), None)
+    clear_resolved_overrides()
+
+
 def override_field_for_user(user, block, name, value):
     """
     Overrides a field for the `user`.  `block` and `name` specify the block
@@ -70,6 +124,7 @@ def override_field_for_user(user, block, name, value):
     field = block.fields[name]
     override.value = json.dumps(field.to_json(value))
     override.save()
+    _clear_cached_overrides(user, block.runtime.course_id)
 
 
 def clear_override_for_user(user, block, name):
@@ -87,3 +142,4 @@ def clear_override_for_user(user, block, name):
             field=name).delete()
     except StudentFieldOverride.DoesNotExist:
         pass
+    _clear_cached_overrides(user, block.runtime.course_id)
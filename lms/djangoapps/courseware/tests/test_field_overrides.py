@@ -5,6 +5,7 @@ Tests for `field_overrides` module.
 import unittest
 
 from django.test.utils import override_settings
+from mock import patch
 from nose.plugins.attrib import attr
 from xblock.field_data import DictFieldData
 
@@ -15,6 +16,7 @@ from ..field_overrides import (
     FieldOverrideProvider,
     OverrideFieldData,
     OverrideModulestoreFieldData,
+    clear_resolved_overrides,
     disable_overrides,
     resolve_dotted
 )
@@ -126,6 +128,20 @@ class OverrideFieldDataTests(OverrideFieldBase):
         with disable_overrides():
             self.assertEqual(data.get('block', 'foo'), 'baz')
 
+    def test_resolved_overrides_remembered(self):
+        data = self.make_one()
+        provider = data.providers[0]
+        with patch.object(provider, 'get', wraps=provider.get) as mock_get:
+            for __ in range(2):
+                self.assertEqual(data.get('block', 'foo'), 'fu')
+                self.assertEqual(data.get('block', 'bees'), 'knees')
+                self.assertTrue(data.has('block', 'oh'))
+            self.assertEqual(mock_get.call_count, 3)
+
+            clear_resolved_overrides()
+            self.assertEqual(data.get('block', 'foo'), 'fu')
+            self.assertEqual(mock_get.call_count, 4)
+
     @override_settings(FIELD_OVERRIDE_PROVIDERS=())
     def test_no_overrides_configured(self):
         data = self.make_one()
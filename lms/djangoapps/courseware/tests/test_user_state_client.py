@@ -3,13 +3,16 @@ Black-box tests of the DjangoUserStateClient against the semantics
 defined in edx_user_state_client.
 """
 
+import json
 from collections import defaultdict
 from unittest import skip
 
 from django.test import TestCase
 from edx_user_state_client.tests import UserStateClientTestBase
+from opaque_keys.edx.locator import CourseLocator
 
-from courseware.tests.factories import UserFactory
+from courseware.models import BaseStudentModuleHistory, StudentModule
+from courseware.tests.factories import StudentModuleFactory, UserFactory
 from courseware.user_state_client import DjangoXBlockUserStateClient
 
 
@@ -67,3 +70,45 @@ class TestDjangoUserStateClient(UserStateClientTestBase, TestCase):
     @skip("Not supported by DjangoXBlockUserStateClient")
     def test_iter_course_many_users(self):
         pass
+
+
+class TestDjangoUserStateClientSetMany(TestCase):
+    """
+    Tests of setting the state of many blocks at once with the DjangoUserStateClient.
+    """
+    # Tell Django to clean out all databases, not just default
+    multi_db = True
+
+    def setUp(self):
+        super(TestDjangoUserStateClientSetMany, self).setUp()
+        self.user = UserFactory.create()
+        self.client = DjangoXBlockUserStateClient(self.user)
+        course_key = CourseLocator('org', 'course', 'run')
+        self.block_keys = [course_key.make_usage_key('problem', 'problem_{}'.format(index)) for index in range(5)]
+        for block_key in self.block_keys[:2]:
+            StudentModuleFactory.create(
+                student=self.user,
+                course_id=course_key,
+                module_state_key=block_key,
+                state=json.dumps({'existing_field': 'value'}),
+            )
+
+    def test_bulk_set_many(self):
+        # SAVEPOINT, read all rows, insert the new rows, read the ids of the
+        # new rows, update the existing rows, RELEASE SAVEPOINT
+        with self.assertNumQueries(6, using='default'):
+            with self.assertNumQueries(len(self.block_keys), using='student_module_history'):
+                self.client.set_many(
+                    self.user.username,
+                    {block_key: {'new_field': block_key.block_id} for block_key in self.block_keys},
+                )
+
+        student_modules = StudentModule.objects.filter(student=self.user)
+        self.assertEqual(len(student_modules), len(self.block_keys))
+        for student_module in student_modules:
+            expected_state = {'new_field': student_module.module_state_key.block_id}
+            if student_module.module_state_key in self.block_keys[:2]:
+                expected_state['existing_field'] = 'value'
+            self.assertEqual(json.loads(student_module.state), expected_state)
+            history = BaseStudentModuleHistory.get_history([student_module])
+            self.assertEqual(json.loads(history[0].state), expected_state)
@@ -10,7 +10,10 @@ from time import time
 
 from django.contrib.auth.models import User
 from django.db import transaction
+from django.db.models import Case, TextField, Value, When
+from django.db.models.signals import post_save
 from django.db.utils import IntegrityError
+from django.utils import timezone
 from edx_user_state_client.interface import XBlockUserState, XBlockUserStateClient
 from xblock.fields import Scope
 
@@ -236,6 +239,150 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         self._ddog_histogram(evt_time, 'get_many.response_time', duration)
         self._nr_stat_accumulate('get_many', 'duration', duration)
 
+    def _bulk_set_student_modules(self, user, block_keys_to_state):
+        """
+        Overlays the given states over the stored states of the given user's
+        StudentModules with one query to read all of them, one to create the
+        missing ones and one to update the existing ones, and sends the
+        post_save signals that saving each of them would have, so that their
+        history is recorded.
+
+        Must be called in a transaction.
+
+        Returns a list of (usage_key, student_module, created, num_fields_before,
+        num_fields_after) tuples, one for each of the given block keys.
+        """
+        existing_modules = {
+            usage_key: student_module
+            for student_module, usage_key in self._get_student_modules(user.username, block_keys_to_state.keys())
+        }
+
+        results = []
+        new_modules = []
+        updated_modules = []
+        for usage_key, state in block_keys_to_state.iteritems():
+            student_module = existing_modules.get(usage_key)
+            if student_module is None:
+                student_module = StudentModule(
+                    student=user,
+                    course_id=usage_key.course_key,
+                    module_state_key=usage_key,
+                    module_type=usage_key.block_type,
+                    state=json.dumps(state),
+                )
+                new_modules.append(student_module)
+                results.append((usage_key, student_module, True, len(state), len(state)))
+            else:
+                current_state = {} if student_module.state is None else json.loads(student_module.state)
+                num_fields_before = len(current_state)
+                current_state.update(state)
+                student_module.state = json.dumps(current_state)
+                updated_modules.append(student_module)
+                results.append((usage_key, student_module, False, num_fields_before, len(current_state)))
+
+        self._create_student_modules(new_modules)
+        self._update_student_modules(updated_modules)
+        return results
+
+    def _create_student_modules(self, student_modules):
+        """
+        Inserts the given new StudentModules.
+        """
+        if len(student_modules) <= 1:
+            for student_module in student_modules:
+                student_module.save(force_insert=True)
+            return
+
+        StudentModule.objects.bulk_create(student_modules)
+        if any(student_module.pk is None for student_module in student_modules):
+            # Not all databases return the ids of bulk created rows, which the
+            # history of the rows needs.
+            ids = {
+                usage_key: student_module.pk
+                for student_module, usage_key in self._get_student_modules(
+                    student_modules[0].student.username,
+                    [student_module.module_state_key for student_module in student_modules],
+                )
+            }
+            for student_module in student_modules:
+                student_module.pk = ids[student_module.module_state_key]
+
+        for student_module in student_modules:
+            post_save.send(
+                sender=StudentModule, instance=student_module, created=True, raw=False,
+                using=StudentModule.objects.db, update_fields=None,
+            )
+
+    def _update_student_modules(self, student_modules):
+        """
+        Updates the state of the given existing StudentModules.
+        """
+        if len(student_modules) <= 1:
+            for student_module in student_modules:
+                # Updating the object - force_update guarantees no INSERT will occur.
+                student_module.save(force_update=True)
+            return
+
+        modified = timezone.now()
+        StudentModule.objects.filter(pk__in=[student_module.pk for student_module in student_modules]).update(
+            state=Case(
+                *[When(pk=student_module.pk, then=Value(student_module.state)) for student_module in student_modules],
+                output_field=TextField()
+            ),
+            modified=modified,
+        )
+
+        for student_module in student_modules:
+            student_module.modified = modified
+            post_save.send(
+                sender=StudentModule, instance=student_module, created=False, raw=False,
+                using=StudentModule.objects.db, update_fields=None,
+            )
+
+    def _set_student_module(self, user, usage_key, state, block_keys_to_state):
+        """
+        Overlays the given state over the stored state of the given user's
+        StudentModule for the given usage_key, creating it if it doesn't exist.
+
+        Returns a (usage_key, student_module, created, num_fields_before,
+        num_fields_after) tuple.
+        """
+        student_module, created = StudentModule.objects.get_or_create(
+            student=user,
+            course_id=usage_key.course_key,
+            module_state_key=usage_key,
+            defaults={
+                'state': json.dumps(state),
+                'module_type': usage_key.block_type,
+            },
+        )
+
+        num_fields_before = num_fields_after = len(state)
+        if not created:
+            if student_module.state is None:
+                current_state = {}
+            else:
+                current_state = json.loads(student_module.state)
+            num_fields_before = len(current_state)
+            current_state.update(state)
+            num_fields_after = len(current_state)
+            student_module.state = json.dumps(current_state)
+            try:
+                with transaction.atomic():
+                    # Updating the object - force_update guarantees no INSERT will occur.
+                    student_module.save(force_update=True)
+            except IntegrityError:
+                # The UPDATE above failed. Log information - but ignore the error.
+                # See https://openedx.atlassian.net/browse/TNL-5365
+                log.warning("set_many: IntegrityError for student {} - course_id {} - usage key {}".format(
+                    user, repr(unicode(usage_key.course_key)), usage_key
+                ))
+                log.warning("set_many: All {} block keys: {}".format(
+                    len(block_keys_to_state), block_keys_to_state.keys()
+                ))
+
+        return usage_key, student_module, created, num_fields_before, num_fields_after
+
     def set_many(self, username, block_keys_to_state, scope=Scope.user_state):
         """
         Set fields for a particular XBlock.
@@ -254,7 +401,7 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         # count how many times this function gets called
         self._nr_stat_increment('set_many', 'calls')
 
-        # We do a find_or_create for every block (rather than re-using field objects
+        # We read every block's row again (rather than re-using field objects
         # that were queried in get_many) so that if the score has
         # been changed by some other piece of the code, we don't overwrite
         # that score.
@@ -270,41 +417,22 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
 
         evt_time = time()
 
-        for usage_key, state in block_keys_to_state.items():
-            student_module, created = StudentModule.objects.get_or_create(
-                student=user,
-                course_id=usage_key.course_key,
-                module_state_key=usage_key,
-                defaults={
-                    'state': json.dumps(state),
-                    'module_type': usage_key.block_type,
-                },
-            )
-
-            num_fields_before = num_fields_after = num_new_fields_set = len(state)
-            num_fields_updated = 0
-            if not created:
-                if student_module.state is None:
-                    current_state = {}
-                else:
-                    current_state = json.loads(student_module.state)
-                num_fields_before = len(current_state)
-                current_state.update(state)
-                num_fields_after = len(current_state)
-                student_module.state = json.dumps(current_state)
-                try:
-                    with transaction.atomic():
-                        # Updating the object - force_update guarantees no INSERT will occur.
-                        student_module.save(force_update=True)
-                except IntegrityError:
-                    # The UPDATE above failed. Log information - but ignore the error.
-                    # See https://openedx.atlassian.net/browse/TNL-5365
-                    log.warning("set_many: IntegrityError for student {} - course_id {} - usage key {}".format(
-                        user, repr(unicode(usage_key.course_key)), usage_key
-                    ))
-                    log.warning("set_many: All {} block keys: {}".format(
-                        len(block_keys_to_state), block_keys_to_state.keys()
-                    ))
+        try:
+            with transaction.atomic():
+                results = self._bulk_set_student_modules(user, block_keys_to_state)
+        except IntegrityError:
+            # Another request created some of the rows in the meantime, so
+            # fall back to setting the state of each block separately.
+            log.warning("set_many: IntegrityError in bulk set for student {} - falling back to single sets".format(
+                user
+            ))
+            results = [
+                self._set_student_module(user, usage_key, state, block_keys_to_state)
+                for usage_key, state in block_keys_to_state.iteritems()
+            ]
+
+        for usage_key, student_module, created, num_fields_before, num_fields_after in results:
+            state = block_keys_to_state[usage_key]
 
             # DataDog and New Relic reporting
 
@@ -14,6 +14,7 @@ from django.core.urlresolvers import reverse
 from django.http import Http404, HttpResponseServerError
 from django.shortcuts import render_to_response
 from django.template.loader import render_to_string
+from django.utils.decorators import method_decorator
 from django.utils.translation import get_language_bidi
 from django.views.decorators.csrf import ensure_csrf_cookie
 from django.views.decorators.http import require_GET, require_http_methods
@@ -185,8 +186,22 @@ def use_bulk_ops(view_func):
     return wrapped_view
 
 
+def deduplicate_forum_requests(view_func):
+    """
+    Wraps internal request handling so that identical GET requests to the
+    comments service, such as those for the requesting user's info, are
+    only made once.
+    """
+    @wraps(view_func)
+    def wrapped_view(*args, **kwargs):  # pylint: disable=missing-docstring
+        with cc.utils.deduplicated_requests():
+            return view_func(*args, **kwargs)
+    return wrapped_view
+
+
 @login_required
 @use_bulk_ops
+@deduplicate_forum_requests
 def inline_discussion(request, course_key, discussion_id):
     """
     Renders JSON for DiscussionModules
@@ -225,6 +240,7 @@ def inline_discussion(request, course_key, discussion_id):
 
 @login_required
 @use_bulk_ops
+@deduplicate_forum_requests
 def forum_form_discussion(request, course_key):
     """
     Renders the main Discussion page, potentially filtered by a search query
@@ -265,6 +281,7 @@ def forum_form_discussion(request, course_key):
 @require_GET
 @login_required
 @use_bulk_ops
+@deduplicate_forum_requests
 def single_thread(request, course_key, discussion_id, thread_id):
     """
     Renders a response to display a single discussion thread.  This could either be a page refresh
@@ -504,12 +521,15 @@ def create_user_profile_context(request, course_key, user_id):
     else:
         profiled_user = cc.User(id=user_id, course_id=course_key)
 
-    threads, page, num_pages = profiled_user.active_threads(query_params)
+    (threads, page, num_pages), user_info, profiled_user_info = cc.utils.perform_in_parallel(
+        lambda: profiled_user.active_threads(query_params),
+        user.to_dict,
+        profiled_user.to_dict,
+    )
     query_params['page'] = page
     query_params['num_pages'] = num_pages
 
     with function_trace("get_metadata_for_threads"):
-        user_info = cc.User.from_django_user(request.user).to_dict()
         annotated_content_info = utils.get_metadata_for_threads(course_key, threads, request.user, user_info)
 
     is_staff = has_permission(request.user, 'openclose_thread', course.id)
@@ -533,7 +553,7 @@ def create_user_profile_context(request, course_key, user_id):
         context.update({
             'django_user': django_user,
             'django_user_roles': user_roles,
-            'profiled_user': profiled_user.to_dict(),
+            'profiled_user': profiled_user_info,
             'threads': threads,
             'user_group_id': user_group_id,
             'annotated_content_info': annotated_content_info,
@@ -548,6 +568,7 @@ def create_user_profile_context(request, course_key, user_id):
 @require_GET
 @login_required
 @use_bulk_ops
+@deduplicate_forum_requests
 def user_profile(request, course_key, user_id):
     """
     Renders a response to display the user profile page (shown after clicking
@@ -573,6 +594,7 @@ def user_profile(request, course_key, user_id):
 
 @login_required
 @use_bulk_ops
+@deduplicate_forum_requests
 def followed_threads(request, course_key, user_id):
     """
     Ajax-only endpoint retrieving the threads followed by a specific user.
@@ -610,12 +632,14 @@ def followed_threads(request, course_key, user_id):
         if group_id is not None:
             query_params['group_id'] = group_id
 
-        paginated_results = profiled_user.subscribed_threads(query_params)
+        paginated_results, user_info = cc.utils.perform_in_parallel(
+            lambda: profiled_user.subscribed_threads(query_params),
+            cc.User.from_django_user(request.user).to_dict,
+        )
         print "\n \n \n paginated results \n \n \n "
         print paginated_results
         query_params['page'] = paginated_results.page
         query_params['num_pages'] = paginated_results.num_pages
-        user_info = cc.User.from_django_user(request.user).to_dict()
 
         with function_trace("get_metadata_for_threads"):
             annotated_content_info = utils.get_metadata_for_threads(
@@ -655,6 +679,7 @@ class DiscussionBoardFragmentView(EdxFragmentView):
     """
     Component implementation of the discussion board.
     """
+    @method_decorator(deduplicate_forum_requests)
     def render_to_fragment(
         self,
         request,
@@ -8,6 +8,8 @@ import pytest
 
 from django.core.urlresolvers import reverse
 from django.test import RequestFactory, TestCase
+from django.test.utils import override_settings
+from django.utils import translation
 from mock import Mock, patch
 from nose.plugins.attrib import attr
 from pytz import UTC
@@ -33,7 +35,13 @@ from django_comment_common.utils import (
     set_course_discussion_settings
 )
 from lms.djangoapps.teams.tests.factories import CourseTeamFactory
-from lms.lib.comment_client.utils import CommentClientMaintenanceError, perform_request
+from lms.lib.comment_client.utils import (
+    CommentClientMaintenanceError,
+    deduplicated_requests,
+    get_session,
+    perform_in_parallel,
+    perform_request
+)
 from openedx.core.djangoapps.content.course_structures.models import CourseStructure
 from openedx.core.djangoapps.course_groups import cohorts
 from openedx.core.djangoapps.course_groups.cohorts import set_course_cohorted
@@ -41,6 +49,7 @@ from openedx.core.djangoapps.course_groups.tests.helpers import CohortFactory, c
 from openedx.core.djangoapps.util.testing import ContentGroupTestCase
 from student.roles import CourseStaffRole
 from student.tests.factories import AdminFactory, CourseEnrollmentFactory, UserFactory
+from terrain.stubs.comments import StubCommentsService, StubCommentsServiceHandler
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.django_utils import TEST_DATA_MIXED_MODULESTORE, ModuleStoreTestCase
@@ -1844,6 +1853,113 @@ class ClientConfigurationTestCase(TestCase):
         self.assertEqual(result, {})
 
 
+class DeduplicatedRequestsTestCase(TestCase):
+    """Ensures that identical GET requests are only made once within deduplicated_requests."""
+
+    def setUp(self):
+        super(DeduplicatedRequestsTestCase, self).setUp()
+        config = ForumsConfig.current()
+        config.enabled = True
+        config.save()
+
+        response = Mock()
+        response.status_code = 200
+        response.json = lambda: {'id': '1'}
+        request_patcher = patch('requests.request', return_value=response)
+        self.mock_request = request_patcher.start()
+        self.addCleanup(request_patcher.stop)
+
+    def test_identical_requests(self):
+        url = 'http://localhost:4567/api/v1/users/1'
+        with deduplicated_requests():
+            perform_request('get', url, {'course_id': 'a'})['id'] = 'modified'
+            self.assertEqual(perform_request('get', url, {'course_id': 'a'}), {'id': '1'})
+            self.assertEqual(self.mock_request.call_count, 1)
+
+            perform_request('get', url, {'course_id': 'b'})
+            self.assertEqual(self.mock_request.call_count, 2)
+
+            # other requests may modify the responses
+            perform_request('put', url, {'default_sort_key': 'date'})
+            perform_request('get', url, {'course_id': 'a'})
+            self.assertEqual(self.mock_request.call_count, 4)
+
+        perform_request('get', url, {'course_id': 'a'})
+        self.assertEqual(self.mock_request.call_count, 5)
+
+
+class KeepAliveCommentsServiceHandler(StubCommentsServiceHandler):
+    """
+    Stand-in for cs_comments_service that keeps connections alive and counts them.
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        StubCommentsServiceHandler.setup(self)
+        self.server.config['connections'] = self.server.config.get('connections', 0) + 1
+
+    def send_json_response(self, content):
+        content = json.dumps(content)
+        self.send_response(200, content, {'Content-Type': 'application/json', 'Content-Length': str(len(content))})
+
+
+class KeepAliveCommentsService(StubCommentsService):
+    HANDLER_CLASS = KeepAliveCommentsServiceHandler
+
+
+@override_settings(COMMENTS_SERVICE_HTTP_POOL={'ENABLED': True, 'POOL_SIZE': 2, 'MAX_RETRIES': 0})
+class PooledSessionTestCase(TestCase):
+    """Ensures that requests to the comment service reuse pooled connections."""
+
+    def setUp(self):
+        super(PooledSessionTestCase, self).setUp()
+        config = ForumsConfig.current()
+        config.enabled = True
+        config.save()
+
+        self.server = KeepAliveCommentsService()
+        self.addCleanup(self.server.shutdown)
+
+        # use a new session, with the overridden pool settings
+        session_patcher = patch('lms.lib.comment_client.utils._SESSION', None)
+        session_patcher.start()
+        self.addCleanup(session_patcher.stop)
+        self.addCleanup(self.close_session)
+
+    def close_session(self):
+        """Closes the pooled connections of the session used by the test."""
+        get_session().close()
+
+    @patch('lms.lib.comment_client.utils.dog_stats_api.increment')
+    def test_connection_reused(self, mock_increment):
+        url = 'http://127.0.0.1:{}/api/v1/users/1'.format(self.server.port)
+        for __ in range(3):
+            self.assertEqual(perform_request('get', url)['id'], '1')
+
+        self.assertEqual(self.server.config['connections'], 1)
+        connection_tags = [
+            tag
+            for __, kwargs in mock_increment.call_args_list
+            for tag in kwargs['tags']
+            if tag.startswith('connection:')
+        ]
+        self.assertEqual(connection_tags, ['connection:new', 'connection:reused', 'connection:reused'])
+
+    @patch('lms.lib.comment_client.utils._EXECUTOR', None)
+    def test_perform_in_parallel(self):
+        url = 'http://127.0.0.1:{}/api/v1/users/{{}}'.format(self.server.port)
+        with translation.override('eo'):
+            results = perform_in_parallel(
+                lambda: perform_request('get', url.format(1))['id'],
+                lambda: perform_request('get', url.format(2))['id'],
+                translation.get_language,
+            )
+        self.assertEqual(results, ['1', '2', 'eo'])
+
+        with self.assertRaises(ZeroDivisionError):
+            perform_in_parallel(lambda: perform_request('get', url.format(1)), lambda: 1 / 0)
+
+
 def set_discussion_division_settings(
         course_key, enable_cohorts=False, always_divide_inline_discussions=False,
         divided_discussions=[], division_scheme=CourseDiscussionSettings.COHORT
@@ -1,4 +1,4 @@
-from lms.djangoapps.course_blocks.api import get_course_blocks
+from lms.djangoapps.course_blocks.api import SharedCourseBlocks, get_course_blocks
 from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
 from xmodule.modulestore.django import modulestore
 
@@ -14,7 +14,15 @@ class CourseData(object):
     This is an in-memory object that maintains its own internal
     cache during its lifecycle.
     """
-    def __init__(self, user, course=None, collected_block_structure=None, structure=None, course_key=None):
+    def __init__(
+            self,
+            user,
+            course=None,
+            collected_block_structure=None,
+            structure=None,
+            course_key=None,
+            shared_course_blocks=None,
+    ):
         if not any([course, collected_block_structure, structure, course_key]):
             raise ValueError(
                 "You must specify one of course, collected_block_structure, structure, or course_key to this method."
@@ -25,6 +33,7 @@ class CourseData(object):
         self._course = course
         self._course_key = course_key
         self._location = None
+        self._shared_course_blocks = shared_course_blocks
 
     @property
     def course_key(self):
@@ -51,13 +60,26 @@ class CourseData(object):
     @property
     def structure(self):
         if self._structure is None:
-            self._structure = get_course_blocks(
-                self.user,
-                self.location,
-                collected_block_structure=self._collected_block_structure,
-            )
+            if self._shared_course_blocks is not None:
+                self._structure = self._shared_course_blocks.get(self.user)
+            else:
+                self._structure = get_course_blocks(
+                    self.user,
+                    self.location,
+                    collected_block_structure=self._collected_block_structure,
+                )
         return self._structure
 
+    @property
+    def shared_course_blocks(self):
+        """
+        Returns a SharedCourseBlocks for transforming this course's
+        collected structure for many users.
+        """
+        if self._shared_course_blocks is None:
+            self._shared_course_blocks = SharedCourseBlocks(self.location, self.collected_structure)
+        return self._shared_course_blocks
+
     @property
     def collected_structure(self):
         if self._collected_block_structure is None:
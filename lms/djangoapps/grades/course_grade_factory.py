@@ -2,12 +2,16 @@
 Course Grade Factory Class
 """
 from collections import namedtuple
+from itertools import islice
 from logging import getLogger
 
 import dogstats_wrapper as dog_stats_api
 from six import text_type
 
+from courseware.student_field_overrides import prefetch_overrides_for_users
+from lms.djangoapps.course_blocks.api import has_individual_student_override_provider
 from openedx.core.djangoapps.signals.signals import COURSE_GRADE_CHANGED, COURSE_GRADE_NOW_PASSED
+from student.models import anonymous_ids_for_users
 
 from .config import assume_zero_if_absent, should_persist_grades
 from .course_data import CourseData
@@ -23,6 +27,9 @@ class CourseGradeFactory(object):
     """
     GradeResult = namedtuple('GradeResult', ['student', 'course_grade', 'error'])
 
+    # Number of users whose anonymous ids and individual student overrides are pre-fetched together by iter.
+    USER_BATCH_SIZE = 100
+
     def read(
             self,
             user,
@@ -31,6 +38,7 @@ class CourseGradeFactory(object):
             course_structure=None,
             course_key=None,
             create_if_needed=True,
+            shared_course_blocks=None,
     ):
         """
         Returns the CourseGrade for the given user in the course.
@@ -40,9 +48,12 @@ class CourseGradeFactory(object):
         Else, returns None.
 
         At least one of course, collected_block_structure, course_structure,
-        or course_key should be provided.
+        or course_key should be provided.  If given, shared_course_blocks
+        (SharedCourseBlocks) provides the user's course_structure as needed.
         """
-        course_data = CourseData(user, course, collected_block_structure, course_structure, course_key)
+        course_data = CourseData(
+            user, course, collected_block_structure, course_structure, course_key, shared_course_blocks,
+        )
         try:
             return self._read(user, course_data)
         except PersistentCourseGrade.DoesNotExist:
@@ -61,15 +72,19 @@ class CourseGradeFactory(object):
             course_structure=None,
             course_key=None,
             force_update_subsections=False,
+            shared_course_blocks=None,
     ):
         """
         Computes, updates, and returns the CourseGrade for the given
         user in the course.
 
         At least one of course, collected_block_structure, course_structure,
-        or course_key should be provided.
+        or course_key should be provided.  If given, shared_course_blocks
+        (SharedCourseBlocks) provides the user's course_structure as needed.
         """
-        course_data = CourseData(user, course, collected_block_structure, course_structure, course_key)
+        course_data = CourseData(
+            user, course, collected_block_structure, course_structure, course_key, shared_course_blocks,
+        )
         return self._update(
             user,
             course_data,
@@ -97,14 +112,27 @@ class CourseGradeFactory(object):
         # 1. Correctness: the same version of the course is used to
         #    compute the grade for all students.
         # 2. Optimization: the collected course_structure is not
-        #    retrieved from the data store multiple times.
+        #    retrieved from the data store multiple times, and is
+        #    transformed only once for students with identical access
+        #    to the course's blocks.
         course_data = CourseData(
             user=None, course=course, collected_block_structure=collected_block_structure, course_key=course_key,
         )
         stats_tags = [u'action:{}'.format(course_data.course_key)]
-        for user in users:
-            with dog_stats_api.timer('lms.grades.CourseGradeFactory.iter', tags=stats_tags):
-                yield self._iter_grade_result(user, course_data, force_update)
+        prefetch_overrides = has_individual_student_override_provider()
+        # Anonymous ids are only needed to read submissions scores when grades are computed.
+        prefetch_anonymous_ids = force_update or not should_persist_grades(course_data.course_key)
+        users = iter(users)
+        users_batch = list(islice(users, self.USER_BATCH_SIZE))
+        while users_batch:
+            if prefetch_anonymous_ids:
+                anonymous_ids_for_users(users_batch, course_data.course_key)
+            if prefetch_overrides:
+                prefetch_overrides_for_users(course_data.course_key, users_batch)
+            for user in users_batch:
+                with dog_stats_api.timer('lms.grades.CourseGradeFactory.iter', tags=stats_tags):
+                    yield self._iter_grade_result(user, course_data, force_update)
+            users_batch = list(islice(users, self.USER_BATCH_SIZE))
 
     def _iter_grade_result(self, user, course_data, force_update):
         try:
@@ -112,7 +140,8 @@ class CourseGradeFactory(object):
                 'user': user,
                 'course': course_data.course,
                 'collected_block_structure': course_data.collected_structure,
-                'course_key': course_data.course_key
+                'course_key': course_data.course_key,
+                'shared_course_blocks': course_data.shared_course_blocks,
             }
             if force_update:
                 kwargs['force_update_subsections'] = True
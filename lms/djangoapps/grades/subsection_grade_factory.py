@@ -112,6 +112,11 @@ class SubsectionGradeFactory(object):
         """
         Lazily queries and returns the scores stored by the
         Submissions API for the course, while caching the result.
+
+        The student's anonymous id is usually already known when grades
+        are computed by CourseGradeFactory.iter, which saves the ids of
+        each batch of users together, in which case no query is made
+        for it.
         """
         anonymous_user_id = anonymous_id_for_user(self.student, self.course_data.course_key)
         return submissions_api.get_scores(str(self.course_data.course_key), anonymous_user_id)
@@ -5,11 +5,14 @@ import ddt
 import django
 from courseware.access import has_access
 from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from lms.djangoapps.grades.config.tests.utils import persistent_grades_feature_flags
 from mock import patch
 from openedx.core.djangoapps.content.block_structure.factory import BlockStructureFactory
 from six import text_type
 
+from student.models import AnonymousUserId, CourseEnrollment, anonymous_ids_for_users
 from student.tests.factories import UserFactory
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
@@ -212,6 +215,30 @@ class TestCourseGradeFactory(GradeTestBase):
             ))
         self.assertEqual(mock_update.called, force_update)
 
+    @ddt.data(True, False)
+    def test_iter_force_update_anonymous_id_queries(self, prefetch_anonymous_ids):
+        students = [UserFactory() for _ in range(3)]
+        for student in students:
+            CourseEnrollment.enroll(student, self.course.id)
+
+        with patch(
+            'lms.djangoapps.grades.course_grade_factory.anonymous_ids_for_users',
+            wraps=anonymous_ids_for_users if prefetch_anonymous_ids else lambda users, course_key: {},
+        ):
+            with CaptureQueriesContext(connection) as queries:
+                set(CourseGradeFactory().iter(users=students, course=self.course, force_update=True))
+
+        # The anonymous ids are looked up and saved once per batch of users, rather than once per user.
+        anonymous_id_queries = [query for query in queries if 'student_anonymoususerid' in query['sql']]
+        self.assertEqual(len(anonymous_id_queries), 2 if prefetch_anonymous_ids else 2 * len(students))
+        self.assertEqual(AnonymousUserId.objects.filter(course_id=self.course.id).count(), len(students))
+
+    def test_iter_read_doesnt_save_anonymous_ids(self):
+        CourseGradeFactory().update(self.request.user, self.course)
+        AnonymousUserId.objects.all().delete()
+        set(CourseGradeFactory().iter(users=[self.request.user], course=self.course))
+        self.assertFalse(AnonymousUserId.objects.exists())
+
     def test_course_grade_summary(self):
         with mock_get_score(1, 2):
             self.subsection_grade_factory.update(self.course_structure[self.sequence.location])
@@ -16,6 +16,7 @@ from opaque_keys.edx.keys import CourseKey
 from six import text_type
 
 from courseware.field_overrides import OverrideFieldData
+from courseware.student_field_overrides import prefetch_overrides_for_users
 from lms.djangoapps.ccx.tests.test_overrides import inject_field_overrides
 from student.tests.factories import UserFactory
 from xmodule.fields import Date
@@ -260,6 +261,26 @@ class TestSetDueDateExtension(ModuleStoreTestCase):
             tools.set_due_date_extension(self.course, self.week1, self.user, extended)
             self._clear_field_data_cache()
 
+    def test_overrides_read_with_one_query(self):
+        extended = datetime.datetime(2013, 12, 25, 0, 0, tzinfo=UTC)
+        tools.set_due_date_extension(self.course, self.week1, self.user, extended)
+        self._clear_field_data_cache()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.week1.due, extended)
+            self.assertEqual(self.week2.due, self.due)
+            self.assertEqual(self.assignment.due, extended)
+
+    def test_prefetch_overrides_for_users(self):
+        extended = datetime.datetime(2013, 12, 25, 0, 0, tzinfo=UTC)
+        tools.set_due_date_extension(self.course, self.week1, self.user, extended)
+        self._clear_field_data_cache()
+        other_user = UserFactory.create()
+        with self.assertNumQueries(1):
+            prefetch_overrides_for_users(self.course.id, [self.user, other_user])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.week1.due, extended)
+            self.assertEqual(self.week2.due, self.due)
+
     def test_set_due_date_extension_invalid_date(self):
         extended = datetime.datetime(2009, 1, 1, 0, 0, tzinfo=UTC)
         with self.assertRaises(tools.DashboardError):
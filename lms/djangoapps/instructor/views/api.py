@@ -103,9 +103,8 @@ from student.models import (
     ManualEnrollmentAudit,
     Registration,
     UserProfile,
-    anonymous_id_for_user,
-    get_user_by_username_or_email,
-    unique_id_for_user
+    anonymous_ids_for_users,
+    get_user_by_username_or_email
 )
 from student.roles import CourseFinanceAdminRole, CourseSalesAdminRole
 from submissions import api as sub_api  # installed from the edx-submissions repository
@@ -1839,7 +1838,9 @@ def get_anon_ids(request, course_id):  # pylint: disable=unused-argument
         courseenrollment__course_id=course_id,
     ).order_by('id')
     header = ['User ID', 'Anonymized User ID', 'Course Specific Anonymized User ID']
-    rows = [[s.id, unique_id_for_user(s, save=False), anonymous_id_for_user(s, course_id, save=False)] for s in students]
+    unique_ids = anonymous_ids_for_users(students, None, save=False)
+    course_anonymous_ids = anonymous_ids_for_users(students, course_id, save=False)
+    rows = [[s.id, unique_ids[s.id], course_anonymous_ids[s.id]] for s in students]
     return csv_response(text_type(course_id).replace('/', '-') + '-anon-ids.csv', header, rows)
 
 
@@ -2421,10 +2422,15 @@ def export_ora2_data(request, course_id):
 def calculate_grades_csv(request, course_id):
     """
     AlreadyRunningError is raised if the course's grades are already being updated.
+
+    If the `incremental` POST parameter is true, only learners whose grades
+    changed since the previous grade report are regraded.  The other
+    learners' rows, including their non-grade columns, are carried over.
     """
     report_type = _('grade')
     course_key = CourseKey.from_string(course_id)
-    lms.djangoapps.instructor_task.api.submit_calculate_grades_csv(request, course_key)
+    incremental = _get_boolean_param(request, 'incremental')
+    lms.djangoapps.instructor_task.api.submit_calculate_grades_csv(request, course_key, incremental=incremental)
     success_status = SUCCESS_MESSAGE_TEMPLATE.format(report_type=report_type)
 
     return JsonResponse({"status": success_status})
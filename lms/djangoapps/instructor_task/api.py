@@ -336,13 +336,18 @@ def submit_calculate_problem_responses_csv(request, course_key, problem_location
     return submit_task(request, task_type, task_class, course_key, task_input, task_key)
 
 
-def submit_calculate_grades_csv(request, course_key):
+def submit_calculate_grades_csv(request, course_key, incremental=False):
     """
     AlreadyRunningError is raised if the course's grades are already being updated.
+
+    If `incremental` is True, only learners whose grades changed since the
+    course's previous grade report are regraded, and the rows of all other
+    learners are carried over from that report, including their cohort,
+    team, enrollment track and verification status columns.
     """
     task_type = 'grade_course'
     task_class = calculate_grades_csv
-    task_input = {}
+    task_input = {'incremental': True} if incremental else {}
     task_key = ""
 
     return submit_task(request, task_type, task_class, course_key, task_input, task_key)
@@ -9,6 +9,8 @@ from django.db.models import IntegerField
 class GradeReportSetting(ConfigurationModel):
     """
     Sets the batch size used when running grade reports
-    with multiple celery workers.
+    with multiple celery workers.  When enabled, course grade
+    reports are computed by subtasks of at most `batch_size`
+    learners each, and then merged into a single report.
     """
     batch_size = IntegerField(default=100)
@@ -16,3 +16,8 @@ class UpdateProblemModuleStateError(Exception):
 class DuplicateTaskException(Exception):
     """Exception indicating that a task already exists or has already completed."""
     pass
+
+
+class GradeReportShardsFailedError(Exception):
+    """Exception indicating that some shards of a sharded grade report failed, so it can't be merged."""
+    pass
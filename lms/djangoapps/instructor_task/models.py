@@ -17,12 +17,13 @@ import hashlib
 import json
 import logging
 import os.path
+import tempfile
 from uuid import uuid4
 
 from boto.exception import BotoServerError
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.core.files.base import ContentFile
+from django.core.files.base import ContentFile, File
 from django.db import models, transaction
 from opaque_keys.edx.django.models import CourseKeyField
 from six import text_type
@@ -179,12 +180,62 @@ class InstructorTask(models.Model):
         return json.dumps({'message': 'Task revoked before running'})
 
 
+class ReportFile(object):
+    """
+    A CSV report that is appended to incrementally, for the sake of memory
+    efficiency, rather than being built from the whole dataset at once.
+
+    Rows are utf-8 encoded and written to an anonymous temporary file on
+    local disk, so memory use is bounded by the size of each batch of rows
+    rather than the size of the report.  Once all rows are written, pass the
+    report to `DjangoStorageReportStore.store_report_file`.
+
+    Usable as a context manager, which closes (and so deletes) the
+    underlying temporary file on exit.
+    """
+    def __init__(self):
+        self.file = tempfile.TemporaryFile()
+        self.num_rows = 0
+        self._csvwriter = csv.writer(self.file)
+
+    def write_rows(self, rows):
+        """
+        Append the given rows (each row is an iterable of strings) to
+        the report.
+        """
+        for row in rows:
+            self._csvwriter.writerow([unicode(item).encode('utf-8') for item in row])
+            self.num_rows += 1
+
+    def append_csv(self, csv_file, include_row=None):
+        """
+        Append the rows of the given utf-8 encoded CSV file, such as one
+        previously stored from a ReportFile, to the report.  If given,
+        only rows for which `include_row(row)` is true are appended.
+        """
+        for row in csv.reader(csv_file):
+            if include_row is None or include_row(row):
+                self._csvwriter.writerow(row)
+                self.num_rows += 1
+
+    def close(self):
+        """
+        Close and discard the underlying temporary file.
+        """
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
 class ReportStore(object):
     """
     Simple abstraction layer that can fetch and store CSV files for reports
-    download. Should probably refactor later to create a ReportFile object that
-    can simply be appended to for the sake of memory efficiency, rather than
-    passing in the whole dataset. Doing that for now just because it's simpler.
+    download. Reports that are too large to build in memory should be written
+    to a `ReportFile` and stored with `store_report_file`.
     """
     @classmethod
     def from_config(cls, config_name):
@@ -275,6 +326,15 @@ class DjangoStorageReportStore(ReportStore):
         output_buffer.seek(0)
         self.store(course_id, filename, output_buffer)
 
+    def store_report_file(self, course_id, filename, report_file):
+        """
+        Given a course_id, filename, and a `ReportFile`, stream the
+        contents of the report file to the storage backend.
+        """
+        report_file.file.flush()
+        report_file.file.seek(0)
+        self.store(course_id, filename, File(report_file.file, name=filename))
+
     def links_for(self, course_id):
         """
         For a given `course_id`, return a list of `(filename, url)` tuples.
@@ -27,6 +27,9 @@ from django.conf import settings
 from django.utils.translation import ugettext_noop
 
 from bulk_email.tasks import perform_delegate_email_batches
+from lms.djangoapps.instructor_task.config.models import GradeReportSetting
+from lms.djangoapps.instructor_task.models import InstructorTask
+from lms.djangoapps.instructor_task.subtasks import SubtaskStatus
 from lms.djangoapps.instructor_task.tasks_base import BaseInstructorTask
 from lms.djangoapps.instructor_task.tasks_helper.certs import generate_students_certificates
 from lms.djangoapps.instructor_task.tasks_helper.enrollments import (
@@ -183,10 +186,52 @@ def calculate_grades_csv(entry_id, xmodule_instance_args):
         xmodule_instance_args.get('task_id'), entry_id, action_name
     )
 
-    task_fn = partial(CourseGradeReport.generate, xmodule_instance_args)
+    if GradeReportSetting.current().enabled:
+        # Fan the report out across subtasks, each grading a range of users.
+        create_subtask_fcn = partial(_create_grades_csv_shard_subtask, entry_id, xmodule_instance_args, action_name)
+        task_fn = partial(CourseGradeReport.queue_shards, create_subtask_fcn, xmodule_instance_args)
+    else:
+        task_fn = partial(CourseGradeReport.generate, xmodule_instance_args)
     return run_main_task(entry_id, task_fn, action_name)
 
 
+def _create_grades_csv_shard_subtask(entry_id, xmodule_instance_args, action_name, user_id_range,
+                                     initial_subtask_status):
+    """
+    Creates a subtask to grade the users in the given range of user ids.
+    """
+    return calculate_grades_csv_shard.subtask(
+        (
+            entry_id,
+            xmodule_instance_args,
+            action_name,
+            user_id_range,
+            initial_subtask_status.to_dict(),
+        ),
+        task_id=initial_subtask_status.task_id,
+        routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY,
+    )
+
+
+@task(routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
+def calculate_grades_csv_shard(entry_id, xmodule_instance_args, action_name, user_id_range, subtask_status_dict):
+    """
+    Grade the users of a course in the given (first_user_id, last_user_id)
+    range, as one subtask of a sharded `calculate_grades_csv` task.  The last
+    subtask to complete merges the partial results into a single report.
+    """
+    entry = InstructorTask.objects.get(pk=entry_id)
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    TASK_LOG.info(
+        u"Subtask: %s, InstructorTask ID: %s, Task type: %s, Grading users %s to %s",
+        subtask_status.task_id, entry_id, action_name, user_id_range[0], user_id_range[1]
+    )
+    subtask_status = CourseGradeReport.generate_shard(
+        xmodule_instance_args, entry_id, entry.course_id, action_name, user_id_range, subtask_status,
+    )
+    return subtask_status.to_dict()
+
+
 @task(base=BaseInstructorTask, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
 def calculate_problem_grade_report(entry_id, xmodule_instance_args):
     """
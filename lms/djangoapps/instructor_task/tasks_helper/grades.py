@@ -1,24 +1,40 @@
 """
 Functionality for generating grade reports.
 """
+import csv
+import json
 import logging
 import re
+import sys
+import traceback
 from collections import OrderedDict
 from datetime import datetime
-from itertools import chain, izip, izip_longest
+from itertools import chain, izip_longest
 from time import time
 
+from celery.states import FAILURE, SUCCESS
+from django.core.cache import cache
 from lazy import lazy
 from pytz import UTC
-from six import text_type
+from six import reraise, text_type
 
 from courseware.courses import get_course_by_id
 from instructor_analytics.basic import list_problem_responses
 from instructor_analytics.csvs import format_dictlist
 from lms.djangoapps.certificates.models import CertificateWhitelist, GeneratedCertificate, certificate_info_for_user
+from lms.djangoapps.grades.config import should_persist_grades
 from lms.djangoapps.grades.context import grading_context, grading_context_for_course
-from lms.djangoapps.grades.models import PersistentCourseGrade
+from lms.djangoapps.grades.models import PersistentCourseGrade, PersistentSubsectionGrade
 from lms.djangoapps.grades.course_grade_factory import CourseGradeFactory
+from lms.djangoapps.instructor_task.config.models import GradeReportSetting
+from lms.djangoapps.instructor_task.exceptions import GradeReportShardsFailedError
+from lms.djangoapps.instructor_task.models import InstructorTask, ReportFile, ReportStore
+from lms.djangoapps.instructor_task.subtasks import (
+    check_subtask_is_valid,
+    queue_subtasks_for_query,
+    track_memory_usage,
+    update_subtask_status
+)
 from lms.djangoapps.teams.models import CourseTeamMembership
 from lms.djangoapps.verify_student.models import SoftwareSecurePhotoVerification
 from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
@@ -26,15 +42,23 @@ from openedx.core.djangoapps.course_groups.cohorts import bulk_cache_cohorts, ge
 from openedx.core.djangoapps.user_api.course_tag.api import BulkCourseTags
 from student.models import CourseEnrollment
 from student.roles import BulkRoleCache
+from util.file import course_filename_prefix_generator
 from xmodule.modulestore.django import modulestore
 from xmodule.partitions.partitions_service import PartitionService
 from xmodule.split_test_module import get_split_user_partitions
 
 from .runner import TaskProgress
-from .utils import upload_csv_to_report_store
+from .utils import upload_csv_to_report_store, upload_report_file_to_report_store
 
 TASK_LOG = logging.getLogger('edx.celery.task')
 
+# Directory, within a course's report store directory, in which the partial
+# CSVs computed by each shard of a sharded grade report are staged.
+GRADE_REPORT_SHARDS_DIR = u'grade_report_shards'
+
+# Expiration of the lock that ensures only one shard merges a grade report.
+GRADE_REPORT_MERGE_LOCK_EXPIRE = 60 * 60
+
 ENROLLED_IN_COURSE = 'enrolled'
 
 NOT_ENROLLED_IN_COURSE = 'unenrolled'
@@ -62,7 +86,7 @@ class _CourseGradeReportContext(object):
     elements of this context are serialized and parsed across process
     boundaries.
     """
-    def __init__(self, _xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
+    def __init__(self, _xmodule_instance_args, _entry_id, course_id, _task_input, action_name, user_id_range=None):
         self.task_info_string = (
             u'Task: {task_id}, '
             u'InstructorTask ID: {entry_id}, '
@@ -76,6 +100,10 @@ class _CourseGradeReportContext(object):
         )
         self.action_name = action_name
         self.course_id = course_id
+        self.entry_id = _entry_id
+        self.user_id_range = user_id_range
+        self.user_ids = None
+        self.start_date = datetime.now(UTC)
         self.task_progress = TaskProgress(self.action_name, total=None, start_time=time())
 
     @lazy
@@ -200,8 +228,94 @@ class CourseGradeReport(object):
         """
         with modulestore().bulk_operations(course_id):
             context = _CourseGradeReportContext(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name)
+            if _task_input and _task_input.get('incremental'):
+                return CourseGradeReport()._generate_incremental(context)
             return CourseGradeReport()._generate(context)
 
+    @classmethod
+    def queue_shards(cls, create_shard_subtask_fcn, _xmodule_instance_args, _entry_id, course_id, _task_input,
+                     action_name):
+        """
+        Public method to generate a grade report in parallel.
+
+        Enrollees are partitioned into ranges of user ids of at most
+        `GradeReportSetting.batch_size` users, and a subtask is queued for
+        each range using `create_shard_subtask_fcn`, a function of the
+        (first_user_id, last_user_id) range and the initial SubtaskStatus
+        of the subtask.  Each subtask stages a partial CSV with
+        `generate_shard`, and the last one to complete merges them into a
+        single report.
+        """
+        entry = InstructorTask.objects.get(pk=_entry_id)
+
+        # If the shards have already been queued (e.g. this task was
+        # requeued by celery), don't queue a second set of them.
+        if len(entry.subtasks) > 0 and len(entry.task_output) > 0:
+            TASK_LOG.warning(u'Task %s has already queued its grade report shards', entry.task_id)
+            return json.loads(entry.task_output)
+
+        users = CourseEnrollment.objects.users_enrolled_in(course_id, include_inactive=True).order_by('id')
+        total_num_users = users.count()
+        if total_num_users == 0 or (_task_input and _task_input.get('incremental')):
+            # Incremental reports only regrade learners with recent activity,
+            # so aren't worth sharding.
+            return cls.generate(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name)
+
+        def _create_subtask(user_list, initial_subtask_status):
+            """
+            Creates a subtask for the range of user ids in the given
+            user_list, which is ordered by user id.
+            """
+            user_id_range = (user_list[0]['pk'], user_list[-1]['pk'])
+            return create_shard_subtask_fcn(user_id_range, initial_subtask_status)
+
+        return queue_subtasks_for_query(
+            entry,
+            action_name,
+            _create_subtask,
+            [users],
+            [],
+            GradeReportSetting.current().batch_size,
+            total_num_users,
+        )
+
+    @classmethod
+    def generate_shard(cls, _xmodule_instance_args, _entry_id, course_id, action_name, user_id_range, subtask_status):
+        """
+        Public method to compute the rows of a grade report for the users in
+        the given (first_user_id, last_user_id) range, as one subtask of a
+        report queued by `queue_shards`.  Returns the updated subtask status.
+        """
+        current_task_id = subtask_status.task_id
+        check_subtask_is_valid(_entry_id, current_task_id, subtask_status)
+
+        with modulestore().bulk_operations(course_id):
+            context = _CourseGradeReportContext(
+                _xmodule_instance_args, _entry_id, course_id, None, action_name, user_id_range=user_id_range,
+            )
+            report = CourseGradeReport()
+            try:
+                report._generate_shard(context)
+            except Exception:
+                exc_info = sys.exc_info()
+                TASK_LOG.exception(u'%s, Grade report shard %s failed', context.task_info_string, user_id_range)
+                subtask_status.increment(state=FAILURE)
+                update_subtask_status(_entry_id, current_task_id, subtask_status)
+                # This may be the last shard to complete, which must still
+                # finalize the parent task.
+                report._finalize_shards(context)
+                reraise(*exc_info)
+
+            subtask_status.increment(
+                succeeded=context.task_progress.succeeded,
+                failed=context.task_progress.failed,
+                state=SUCCESS,
+            )
+            update_subtask_status(_entry_id, current_task_id, subtask_status)
+            report._finalize_shards(context)
+
+        return subtask_status
+
     def _generate(self, context):
         """
         Internal method for generating a grade report for the given context.
@@ -212,13 +326,254 @@ class CourseGradeReport(object):
         batched_rows = self._batched_rows(context)
 
         context.update_status(u'Compiling grades')
-        success_rows, error_rows = self._compile(context, batched_rows)
+        with ReportFile() as success_file, ReportFile() as error_file:
+            with track_memory_usage('instructor_task.grade_report.memory', context.course_id):
+                success_file.write_rows([success_headers])
+                error_file.write_rows([error_headers])
+                self._compile(context, batched_rows, success_file, error_file)
 
-        context.update_status(u'Uploading grades')
-        self._upload(context, success_headers, success_rows, error_headers, error_rows)
+            context.update_status(u'Uploading grades')
+            self._upload(context, success_file, error_file)
 
         return context.update_status(u'Completed grades')
 
+    def _generate_incremental(self, context):
+        """
+        Internal method for generating a grade report for the given context
+        by regrading only the learners whose persistent grades changed, or
+        who enrolled, since the most recent grade report.  The rows of all
+        other learners are carried over from the most recent report.
+
+        Only the grade and certificate columns of the carried over rows are
+        kept up to date: changes to a learner's cohort, team, enrollment
+        track or verification status alone don't regrade the learner, and
+        their previous values are carried over.
+
+        Falls back to generating a complete report if grades aren't
+        persisted for the course, since changes to them can't be detected
+        then, if there is no previous report, or if the course's grade
+        columns have changed since.
+        """
+        if not should_persist_grades(context.course_id):
+            TASK_LOG.info(u'%s, Grades are not persisted, generating complete report', context.task_info_string)
+            return self._generate(context)
+
+        context.update_status(u'Starting incremental grades')
+        success_headers = self._success_headers(context)
+        error_headers = self._error_headers()
+
+        previous_report = self._previous_report(context)
+        if previous_report is None:
+            TASK_LOG.info(u'%s, No previous grade report found, generating complete report', context.task_info_string)
+            return self._generate(context)
+        previous_filename, previous_date = previous_report
+
+        report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+        previous_path = report_store.path_to(context.course_id, previous_filename)
+        with report_store.storage.open(previous_path) as previous_file:
+            previous_rows = csv.reader(previous_file)
+            previous_headers = [header.decode('utf-8') for header in next(previous_rows)]
+            previous_user_ids = set(int(row[0]) for row in previous_rows)
+        if previous_headers != success_headers:
+            TASK_LOG.info(u'%s, Grade report columns changed, generating complete report', context.task_info_string)
+            return self._generate(context)
+
+        enrolled_user_ids = set(
+            CourseEnrollment.objects.users_enrolled_in(
+                context.course_id, include_inactive=True
+            ).values_list('id', flat=True)
+        )
+        unchanged_user_ids = previous_user_ids - self._users_changed_since(context, previous_date)
+        context.user_ids = enrolled_user_ids - unchanged_user_ids
+        TASK_LOG.info(
+            u'%s, Regrading %d of %d learners since grade report %s',
+            context.task_info_string, len(context.user_ids), len(enrolled_user_ids), previous_filename,
+        )
+
+        context.update_status(u'Compiling grades')
+        with ReportFile() as success_file, ReportFile() as error_file:
+            with track_memory_usage('instructor_task.grade_report.memory', context.course_id):
+                success_file.write_rows([success_headers])
+                error_file.write_rows([error_headers])
+                # Rows are matched on their "Student ID" column, which also
+                # excludes the previous report's header row.
+                carried_over_user_ids = set(str(user_id) for user_id in enrolled_user_ids & unchanged_user_ids)
+                with report_store.storage.open(previous_path) as previous_file:
+                    success_file.append_csv(previous_file, include_row=lambda row: row[0] in carried_over_user_ids)
+                context.task_progress.skipped = success_file.num_rows - 1
+                self._compile(context, self._batched_rows(context), success_file, error_file)
+
+            context.task_progress.total = context.task_progress.attempted + context.task_progress.skipped
+
+            context.update_status(u'Uploading grades')
+            self._upload(context, success_file, error_file)
+
+        return context.update_status(u'Completed grades')
+
+    def _previous_report(self, context):
+        """
+        Returns the (filename, date) of the most recent grade report for the
+        given context's course, or None if there is none.  The date is when
+        the generation of that report started.
+        """
+        report_filename_pattern = re.compile(
+            u'^{course_prefix}_grade_report_(\\d{{4}}-\\d{{2}}-\\d{{2}}-\\d{{4}})\\.csv$'.format(
+                course_prefix=re.escape(course_filename_prefix_generator(context.course_id)),
+            )
+        )
+        report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+        for filename, _ in report_store.links_for(context.course_id):
+            match = report_filename_pattern.match(filename)
+            if match:
+                return filename, datetime.strptime(match.group(1), "%Y-%m-%d-%H%M").replace(tzinfo=UTC)
+        return None
+
+    def _users_changed_since(self, context, date):
+        """
+        Returns the set of ids of users whose persistent course or subsection
+        grades, or certificates, in the given context's course were modified
+        at or after the given date.
+        """
+        changed_user_ids = set()
+        for model, modified_field in (
+            (PersistentCourseGrade, 'modified'),
+            (PersistentSubsectionGrade, 'modified'),
+            (GeneratedCertificate, 'modified_date'),
+        ):
+            changed_user_ids.update(
+                model.objects.filter(
+                    course_id=context.course_id, **{modified_field + '__gte': date}
+                ).values_list('user_id', flat=True)
+            )
+        return changed_user_ids
+
+    def _generate_shard(self, context):
+        """
+        Internal method for staging the partial success and error CSVs of
+        a single shard of a grade report for the given context.
+        """
+        context.update_status(u'Compiling grades for users {} to {}'.format(*context.user_id_range))
+        with ReportFile() as success_file, ReportFile() as error_file:
+            with track_memory_usage('instructor_task.grade_report.shard.memory', context.course_id):
+                self._compile(context, self._batched_rows(context), success_file, error_file)
+
+            report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+            success_filename, error_filename = self._shard_filenames(context)
+            report_store.store_report_file(context.course_id, success_filename, success_file)
+            if error_file.num_rows > 0:
+                report_store.store_report_file(context.course_id, error_filename, error_file)
+
+    def _finalize_shards(self, context):
+        """
+        Internal method run by each shard of the grade report for the given
+        context once it completes.  Only the shard that completes the parent
+        task finalizes it: if all shards succeeded, it merges their partial
+        CSVs into a report dated by when the parent task started, and
+        otherwise it marks the parent task as failed rather than uploading a
+        report missing the users of the failed shards.
+        """
+        entry = InstructorTask.objects.get(pk=context.entry_id)
+        merge_lock_key = u'grade-report-merge-{}'.format(entry.task_id)
+        if entry.task_state != SUCCESS or not cache.add(merge_lock_key, 'true', GRADE_REPORT_MERGE_LOCK_EXPIRE):
+            return
+
+        subtask_dict = json.loads(entry.subtasks)
+        if subtask_dict['failed'] > 0:
+            TASK_LOG.error(
+                u'%s, %d of %d grade report shards failed, not merging the report',
+                context.task_info_string, subtask_dict['failed'], subtask_dict['total'],
+            )
+            self._delete_shards(context)
+            exception = GradeReportShardsFailedError(
+                u'{} of {} grade report shards failed'.format(subtask_dict['failed'], subtask_dict['total'])
+            )
+            self._fail_task(entry, exception, None)
+            return
+
+        # The parent task is already marked as succeeded, so it must be
+        # marked as failed if the report can't be merged.
+        context.start_date = datetime.fromtimestamp(json.loads(entry.task_output)['start_time'], UTC)
+        try:
+            self._merge_shards(context)
+        except Exception as exc:  # pylint: disable=broad-except
+            TASK_LOG.exception(u'%s, Merging the grade report shards failed', context.task_info_string)
+            self._fail_task(entry, exc, traceback.format_exc())
+
+    def _fail_task(self, entry, exception, traceback_string):
+        """
+        Internal method for marking the given parent task of a sharded grade
+        report as failed with the given exception.
+        """
+        entry.task_state = FAILURE
+        entry.task_output = InstructorTask.create_output_for_failure(exception, traceback_string)
+        entry.save_now()
+
+    def _merge_shards(self, context):
+        """
+        Internal method for merging the partial CSVs staged by all shards of
+        the grade report for the given context, in user id order, into a
+        single report.  The partial CSVs are deleted once the report is
+        uploaded.
+        """
+        context.update_status(u'Merging grades')
+        report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+        shard_paths = self._shard_paths(context)
+        with ReportFile() as success_file, ReportFile() as error_file:
+            success_file.write_rows([self._success_headers(context)])
+            error_file.write_rows([self._error_headers()])
+            for shard_path in shard_paths:
+                with report_store.storage.open(shard_path) as shard_file:
+                    if shard_path.endswith(u'_err.csv'):
+                        error_file.append_csv(shard_file)
+                    else:
+                        success_file.append_csv(shard_file)
+
+            context.update_status(u'Uploading grades')
+            self._upload(context, success_file, error_file)
+
+        for shard_path in shard_paths:
+            report_store.storage.delete(shard_path)
+        return context.update_status(u'Completed grades')
+
+    def _delete_shards(self, context):
+        """
+        Internal method for deleting the partial CSVs staged by the shards of
+        the grade report for the given context.
+        """
+        report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+        for shard_path in self._shard_paths(context):
+            report_store.storage.delete(shard_path)
+
+    def _shard_paths(self, context):
+        """
+        Returns the paths of the partial CSVs staged by the shards of the
+        grade report for the given context, in user id order.
+        """
+        report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+        shards_dir = report_store.path_to(context.course_id, self._shards_dir(context))
+        try:
+            _, filenames = report_store.storage.listdir(shards_dir)
+        except OSError:
+            # Django's FileSystemStorage fails with an OSError if no shard
+            # staged any rows.
+            filenames = []
+        return [u'{}/{}'.format(shards_dir, filename) for filename in sorted(filenames)]
+
+    def _shards_dir(self, context):
+        """
+        Returns the directory in which the shards of the grade report for the
+        given context are staged, relative to the course's report directory.
+        """
+        return u'{}/{}'.format(GRADE_REPORT_SHARDS_DIR, context.entry_id)
+
+    def _shard_filenames(self, context):
+        """
+        Returns the (success, error) filenames of the partial CSVs for the
+        shard of the given context.  Filenames sort in user id order.
+        """
+        shard_name = u'{}/{:012d}'.format(self._shards_dir(context), context.user_id_range[0])
+        return shard_name + u'.csv', shard_name + u'_err.csv'
+
     def _success_headers(self, context):
         """
         Returns a list of all applicable column headers for this grade report.
@@ -248,32 +603,31 @@ class CourseGradeReport(object):
             users = filter(lambda u: u is not None, users)
             yield self._rows_for_users(context, users)
 
-    def _compile(self, context, batched_rows):
+    def _compile(self, context, batched_rows, success_file, error_file):
         """
-        Compiles and returns the complete list of (success_rows, error_rows) for
-        the given batched_rows and context.
+        Writes each batch of (success_rows, error_rows) for the given
+        batched_rows and context to the given report files as soon as it is
+        computed, so that only a single batch of rows is held in memory.
         """
-        # partition and chain successes and errors
-        success_rows, error_rows = izip(*batched_rows)
-        success_rows = list(chain(*success_rows))
-        error_rows = list(chain(*error_rows))
+        for success_rows, error_rows in batched_rows:
+            success_file.write_rows(success_rows)
+            error_file.write_rows(error_rows)
+
+            # update metrics on task status
+            context.task_progress.succeeded += len(success_rows)
+            context.task_progress.failed += len(error_rows)
 
-        # update metrics on task status
-        context.task_progress.succeeded = len(success_rows)
-        context.task_progress.failed = len(error_rows)
         context.task_progress.attempted = context.task_progress.succeeded + context.task_progress.failed
         context.task_progress.total = context.task_progress.attempted
-        return success_rows, error_rows
 
-    def _upload(self, context, success_headers, success_rows, error_headers, error_rows):
+    def _upload(self, context, success_file, error_file):
         """
-        Creates and uploads a CSV for the given headers and rows.
+        Uploads the given report files, skipping the error report if it
+        contains only its header row.
         """
-        date = datetime.now(UTC)
-        upload_csv_to_report_store([success_headers] + success_rows, 'grade_report', context.course_id, date)
-        if len(error_rows) > 0:
-            error_rows = [error_headers] + error_rows
-            upload_csv_to_report_store(error_rows, 'grade_report_err', context.course_id, date)
+        upload_report_file_to_report_store(success_file, 'grade_report', context.course_id, context.start_date)
+        if error_file.num_rows > 1:
+            upload_report_file_to_report_store(error_file, 'grade_report_err', context.course_id, context.start_date)
 
     def _grades_header(self, context):
         """
@@ -296,7 +650,16 @@ class CourseGradeReport(object):
             return izip_longest(*args, fillvalue=fillvalue)
 
         users = CourseEnrollment.objects.users_enrolled_in(context.course_id, include_inactive=True)
+        if context.user_id_range is not None:
+            first_user_id, last_user_id = context.user_id_range
+            users = users.filter(id__gte=first_user_id, id__lte=last_user_id)
         users = users.select_related('profile')
+        if context.user_ids is not None:
+            user_ids = sorted(context.user_ids)
+            return (
+                users.filter(id__in=user_ids[index:index + self.USER_BATCH_SIZE])
+                for index in range(0, len(user_ids), self.USER_BATCH_SIZE)
+            )
         return grouper(users)
 
     def _user_grades(self, course_grade, context):
@@ -472,54 +835,61 @@ class ProblemGradeReport(object):
         course = get_course_by_id(course_id)
         graded_scorable_blocks = cls._graded_scorable_blocks_to_header(course)
 
-        # Just generate the static fields for now.
-        rows = [list(header_row.values()) + ['Enrollment Status', 'Grade'] + _flatten(graded_scorable_blocks.values())]
-        error_rows = [list(header_row.values()) + ['error_msg']]
-        current_step = {'step': 'Calculating Grades'}
-
-        # Bulk fetch and cache enrollment states so we can efficiently determine
-        # whether each user is currently enrolled in the course.
-        CourseEnrollment.bulk_fetch_enrollment_states(enrolled_students, course_id)
-
-        for student, course_grade, error in CourseGradeFactory().iter(enrolled_students, course):
-            student_fields = [getattr(student, field_name) for field_name in header_row]
-            task_progress.attempted += 1
-
-            if not course_grade:
-                err_msg = text_type(error)
-                # There was an error grading this student.
-                if not err_msg:
-                    err_msg = u'Unknown error'
-                error_rows.append(student_fields + [err_msg])
-                task_progress.failed += 1
-                continue
-
-            enrollment_status = _user_enrollment_status(student, course_id)
-
-            earned_possible_values = []
-            for block_location in graded_scorable_blocks:
-                try:
-                    problem_score = course_grade.problem_scores[block_location]
-                except KeyError:
-                    earned_possible_values.append([u'Not Available', u'Not Available'])
-                else:
-                    if problem_score.first_attempted:
-                        earned_possible_values.append([problem_score.earned, problem_score.possible])
-                    else:
-                        earned_possible_values.append([u'Not Attempted', problem_score.possible])
-
-            rows.append(student_fields + [enrollment_status, course_grade.percent] + _flatten(earned_possible_values))
+        # Just generate the static fields for now.  Rows are written to the
+        # report files as each student is graded, rather than accumulated.
+        with ReportFile() as report_file, ReportFile() as error_file:
+            report_file.write_rows(
+                [list(header_row.values()) + ['Enrollment Status', 'Grade'] + _flatten(graded_scorable_blocks.values())]
+            )
+            error_file.write_rows([list(header_row.values()) + ['error_msg']])
+            current_step = {'step': 'Calculating Grades'}
+
+            # Bulk fetch and cache enrollment states so we can efficiently determine
+            # whether each user is currently enrolled in the course.
+            CourseEnrollment.bulk_fetch_enrollment_states(enrolled_students, course_id)
+
+            with track_memory_usage('instructor_task.problem_grade_report.memory', course_id):
+                for student, course_grade, error in CourseGradeFactory().iter(enrolled_students, course):
+                    student_fields = [getattr(student, field_name) for field_name in header_row]
+                    task_progress.attempted += 1
+
+                    if not course_grade:
+                        err_msg = text_type(error)
+                        # There was an error grading this student.
+                        if not err_msg:
+                            err_msg = u'Unknown error'
+                        error_file.write_rows([student_fields + [err_msg]])
+                        task_progress.failed += 1
+                        continue
+
+                    enrollment_status = _user_enrollment_status(student, course_id)
+
+                    earned_possible_values = []
+                    for block_location in graded_scorable_blocks:
+                        try:
+                            problem_score = course_grade.problem_scores[block_location]
+                        except KeyError:
+                            earned_possible_values.append([u'Not Available', u'Not Available'])
+                        else:
+                            if problem_score.first_attempted:
+                                earned_possible_values.append([problem_score.earned, problem_score.possible])
+                            else:
+                                earned_possible_values.append([u'Not Attempted', problem_score.possible])
+
+                    report_file.write_rows(
+                        [student_fields + [enrollment_status, course_grade.percent] + _flatten(earned_possible_values)]
+                    )
 
-            task_progress.succeeded += 1
-            if task_progress.attempted % status_interval == 0:
-                task_progress.update_task_state(extra_meta=current_step)
+                    task_progress.succeeded += 1
+                    if task_progress.attempted % status_interval == 0:
+                        task_progress.update_task_state(extra_meta=current_step)
 
-        # Perform the upload if any students have been successfully graded
-        if len(rows) > 1:
-            upload_csv_to_report_store(rows, 'problem_grade_report', course_id, start_date)
-        # If there are any error rows, write them out as well
-        if len(error_rows) > 1:
-            upload_csv_to_report_store(error_rows, 'problem_grade_report_err', course_id, start_date)
+            # Perform the upload if any students have been successfully graded
+            if report_file.num_rows > 1:
+                upload_report_file_to_report_store(report_file, 'problem_grade_report', course_id, start_date)
+            # If there are any error rows, write them out as well
+            if error_file.num_rows > 1:
+                upload_report_file_to_report_store(error_file, 'problem_grade_report_err', course_id, start_date)
 
         return task_progress.update_task_state(extra_meta={'step': 'Uploading CSV'})
 
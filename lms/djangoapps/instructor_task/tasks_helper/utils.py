@@ -30,16 +30,43 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp, config_name
     report_store = ReportStore.from_config(config_name)
     report_store.store_rows(
         course_id,
-        u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
-            course_prefix=course_filename_prefix_generator(course_id),
-            csv_name=csv_name,
-            timestamp_str=timestamp.strftime("%Y-%m-%d-%H%M")
-        ),
+        _report_filename(csv_name, course_id, timestamp),
         rows
     )
     tracker_emit(csv_name)
 
 
+def upload_report_file_to_report_store(report_file, csv_name, course_id, timestamp, config_name='GRADES_DOWNLOAD'):
+    """
+    Upload a CSV that was written incrementally to a `ReportFile` using
+    ReportStore, without loading its rows into memory.
+
+    Arguments:
+        report_file: ReportFile containing the CSV data (first row may be a
+            header)
+        csv_name: Name of the resulting CSV
+        course_id: ID of the course
+    """
+    report_store = ReportStore.from_config(config_name)
+    report_store.store_report_file(
+        course_id,
+        _report_filename(csv_name, course_id, timestamp),
+        report_file
+    )
+    tracker_emit(csv_name)
+
+
+def _report_filename(csv_name, course_id, timestamp):
+    """
+    Returns the name of the CSV file for the given report.
+    """
+    return u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
+        course_prefix=course_filename_prefix_generator(course_id),
+        csv_name=csv_name,
+        timestamp_str=timestamp.strftime("%Y-%m-%d-%H%M")
+    )
+
+
 def tracker_emit(report_name):
     """
     Emits a 'report.requested' event for the given report.
@@ -12,7 +12,7 @@ from mock import patch
 from opaque_keys.edx.locator import CourseLocator
 
 from common.test.utils import MockS3Mixin
-from lms.djangoapps.instructor_task.models import ReportStore
+from lms.djangoapps.instructor_task.models import ReportFile, ReportStore
 from lms.djangoapps.instructor_task.tests.test_base import TestReportMixin
 
 
@@ -49,6 +49,24 @@ class ReportStoreTestMixin(object):
             ['new_file', 'middle_file', 'old_file']
         )
 
+    def test_store_report_file(self):
+        """
+        Test that rows appended to a ReportFile are stored as a utf-8
+        encoded CSV.
+        """
+        report_store = self.create_report_store()
+        with ReportFile() as report_file:
+            report_file.write_rows([[u'header_1', u'header_2']])
+            report_file.write_rows([[u'ni\xf1o', 1], [u'row_2', 2]])
+            self.assertEqual(report_file.num_rows, 3)
+            report_store.store_report_file(self.course_id, 'report_file.csv', report_file)
+
+        with report_store.storage.open(report_store.path_to(self.course_id, 'report_file.csv')) as csv_file:
+            self.assertEqual(
+                csv_file.read().splitlines(),
+                ['header_1,header_2', 'ni\xc3\xb1o,1', 'row_2,2'],
+            )
+
 
 class LocalFSReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, SimpleTestCase):
     """
@@ -19,9 +19,11 @@ from opaque_keys.edx.locations import i4xEncoder
 from course_modes.models import CourseMode
 from courseware.models import StudentModule
 from courseware.tests.factories import StudentModuleFactory
+from lms.djangoapps.instructor_task.config.models import GradeReportSetting
 from lms.djangoapps.instructor_task.exceptions import UpdateProblemModuleStateError
-from lms.djangoapps.instructor_task.models import InstructorTask
+from lms.djangoapps.instructor_task.models import InstructorTask, ReportStore
 from lms.djangoapps.instructor_task.tasks import (
+    calculate_grades_csv,
     delete_problem_state,
     export_ora2_data,
     generate_certificates,
@@ -29,9 +31,10 @@ from lms.djangoapps.instructor_task.tasks import (
     reset_problem_attempts,
     override_problem_score
 )
+from lms.djangoapps.instructor_task.tasks_helper.grades import CourseGradeReport
 from lms.djangoapps.instructor_task.tasks_helper.misc import upload_ora2_data
 from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
-from lms.djangoapps.instructor_task.tests.test_base import InstructorTaskModuleTestCase
+from lms.djangoapps.instructor_task.tests.test_base import InstructorTaskModuleTestCase, TestReportMixin
 from xmodule.modulestore.exceptions import ItemNotFoundError
 
 PROBLEM_URL_NAME = "test_urlname"
@@ -682,3 +685,77 @@ class TestOra2ResponsesInstructorTask(TestInstructorTasks):
             task_fn = partial(upload_ora2_data, task_xmodule_args)
 
             mock_main_task.assert_called_once_with_args(task_entry.id, task_fn, action_name)
+
+
+@ddt.ddt
+class TestShardedGradeReportInstructorTask(TestReportMixin, TestInstructorTasks):
+    """Tests the grade report task when it is sharded across subtasks."""
+
+    def setUp(self):
+        super(TestShardedGradeReportInstructorTask, self).setUp()
+        GradeReportSetting.objects.create(enabled=True, batch_size=2)
+
+    def test_sharded_grade_report(self):
+        # The instructor is enrolled as well, for six users in three shards.
+        users = [self.instructor] + self._create_and_enroll_students(5)
+        task_entry = self._create_input_entry()
+        self._run_task_with_mock_celery(calculate_grades_csv, task_entry.id, task_entry.task_id)
+
+        entry = InstructorTask.objects.get(id=task_entry.id)
+        self.assertEquals(entry.task_state, SUCCESS)
+        self.assertEquals(json.loads(entry.subtasks)['succeeded'], 3)
+        output = json.loads(entry.task_output)
+        self.assertEquals(output['attempted'], len(users))
+        self.assertEquals(output['succeeded'], len(users))
+        self.assertEquals(output['failed'], 0)
+
+        # The partial reports of each shard are merged into a single report.
+        self.verify_rows_in_csv(
+            [
+                {u'Student ID': unicode(user.id), u'Username': user.username}
+                for user in sorted(users, key=lambda user: user.id)
+            ],
+            ignore_other_columns=True,
+        )
+
+    @ddt.data(0, 2)
+    def test_failed_shard(self, failed_shard):
+        # Shards complete in order, so the last shard completes the parent task.
+        users = sorted([self.instructor] + self._create_and_enroll_students(5), key=lambda user: user.id)
+        failed_user_id = users[failed_shard * 2].id
+        generate_shard = CourseGradeReport._generate_shard
+
+        def _generate_shard(report, context):
+            """Fails the shard that grades failed_user_id."""
+            if context.user_id_range[0] == failed_user_id:
+                raise Exception('Shard failed')
+            return generate_shard(report, context)
+
+        task_entry = self._create_input_entry()
+        with patch.object(CourseGradeReport, '_generate_shard', autospec=True, side_effect=_generate_shard):
+            self._run_task_with_mock_celery(calculate_grades_csv, task_entry.id, task_entry.task_id)
+
+        # No report is uploaded without the users of the failed shard.
+        entry = InstructorTask.objects.get(id=task_entry.id)
+        self.assertEquals(entry.task_state, FAILURE)
+        self.assertEquals(json.loads(entry.subtasks)['failed'], 1)
+        self.assertEquals(json.loads(entry.task_output)['message'], '1 of 3 grade report shards failed')
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        self.assertEquals(report_store.links_for(self.course.id), [])
+
+    def test_failed_merge(self):
+        self._create_and_enroll_students(5)
+        task_entry = self._create_input_entry()
+        with patch.object(CourseGradeReport, '_upload', side_effect=Exception('Upload failed')):
+            self._run_task_with_mock_celery(calculate_grades_csv, task_entry.id, task_entry.task_id)
+
+        entry = InstructorTask.objects.get(id=task_entry.id)
+        self.assertEquals(entry.task_state, FAILURE)
+        self.assertEquals(json.loads(entry.subtasks)['failed'], 0)
+        self.assertEquals(json.loads(entry.task_output)['message'], 'Upload failed')
+
+        # The partial reports are kept, since no report was uploaded.
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        shards_dir = report_store.path_to(self.course.id, u'grade_report_shards/{}'.format(task_entry.id))
+        _, filenames = report_store.storage.listdir(shards_dir)
+        self.assertEquals(len([filename for filename in filenames if not filename.endswith(u'_err.csv')]), 3)
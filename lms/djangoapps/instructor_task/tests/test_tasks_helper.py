@@ -424,6 +424,66 @@ class TestInstructorGradeReport(InstructorGradeReportTestCase):
             {'attempted': expected_students, 'succeeded': expected_students, 'failed': 0}, result
         )
 
+    def test_incremental_grade_report(self):
+        """
+        Test that an incremental report regrades only new and changed
+        students, and carries over the rows of all other students.
+        """
+        students = [self.create_student('student{}'.format(index)) for index in range(3)]
+        with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task'):
+            with freeze_time('2017-01-01 10:00:00'):
+                CourseGradeReport.generate(None, None, self.course.id, None, 'graded')
+
+            students.append(self.create_student('new_student'))
+            with freeze_time('2017-01-01 11:00:00'):
+                with patch(
+                    'lms.djangoapps.instructor_task.tasks_helper.grades.CourseGradeReport._users_changed_since',
+                    return_value={students[0].id},
+                ) as mock_users_changed_since:
+                    with patch('lms.djangoapps.grades.course_grade_factory.CourseGradeFactory.iter') as mock_iter:
+                        mock_iter.return_value = []
+                        result = CourseGradeReport.generate(None, None, self.course.id, {'incremental': True}, 'graded')
+
+        # The previous report is dated by when its generation started.
+        self.assertEqual(mock_users_changed_since.call_args[0][1], datetime(2017, 1, 1, 10, 0, tzinfo=UTC))
+        self.assertEqual(
+            set(user.id for user in mock_iter.call_args[0][0]),
+            {students[0].id, students[3].id},
+        )
+        self.assertDictContainsSubset({'attempted': 0, 'skipped': 2, 'total': 2}, result)
+
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        report_csv_filename = next(
+            filename for filename, _ in report_store.links_for(self.course.id)
+            if filename.endswith(u'_grade_report_2017-01-01-1100.csv')
+        )
+        with report_store.storage.open(report_store.path_to(self.course.id, report_csv_filename)) as csv_file:
+            self.assertEqual(
+                set(row['Username'] for row in unicodecsv.DictReader(csv_file)),
+                {students[1].username, students[2].username},
+            )
+
+
+    @patch.dict(settings.FEATURES, {'PERSISTENT_GRADES_ENABLED_FOR_ALL_TESTS': False})
+    def test_incremental_grade_report_without_persistent_grades(self):
+        """
+        Test that an incremental report regrades all students when grades
+        aren't persisted, since changes to them can't be detected.
+        """
+        for index in range(2):
+            self.create_student('student{}'.format(index))
+        with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task'):
+            with freeze_time('2017-01-01 10:00:00'):
+                CourseGradeReport.generate(None, None, self.course.id, None, 'graded')
+            with freeze_time('2017-01-01 11:00:00'):
+                with patch(
+                    'lms.djangoapps.instructor_task.tasks_helper.grades.CourseGradeReport._users_changed_since',
+                ) as mock_users_changed_since:
+                    result = CourseGradeReport.generate(None, None, self.course.id, {'incremental': True}, 'graded')
+
+        self.assertFalse(mock_users_changed_since.called)
+        self.assertDictContainsSubset({'attempted': 2, 'succeeded': 2, 'skipped': 0, 'total': 2}, result)
+
 
 class TestTeamGradeReport(InstructorGradeReportTestCase):
     """ Test that teams appear correctly in the grade report when it is enabled for the course. """
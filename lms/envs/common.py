@@ -63,6 +63,17 @@ DISCUSSION_SETTINGS = {
     'MAX_COMMENT_DEPTH': 2,
 }
 
+# Pool of keep-alive connections to the comments service, shared by all the
+# requests of a process. MAX_RETRIES is the number of retries of connection errors.
+# MAX_PARALLEL_REQUESTS is the number of threads making independent requests of a
+# page in parallel.
+COMMENTS_SERVICE_HTTP_POOL = {
+    'ENABLED': True,
+    'POOL_SIZE': 10,
+    'MAX_RETRIES': 1,
+    'MAX_PARALLEL_REQUESTS': 4,
+}
+
 LMS_ROOT_URL = "http://localhost:8000"
 LMS_INTERNAL_ROOT_URL = LMS_ROOT_URL
 LMS_ENROLLMENT_API_PATH = "/api/enrollment/v1/"
@@ -897,6 +908,11 @@ MODULESTORE = {
     }
 }
 
+# Maximum size, in bytes of pickled data, of the per-process LRU cache of
+# deserialized split modulestore course structures, which sits in front of
+# the 'course_structure_cache' cache. 0 disables it.
+COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
 #################### Python sandbox ############################################
 
 CODE_JAIL = {
@@ -910,6 +926,10 @@ CODE_JAIL = {
         # How many CPU seconds can jailed code use?
         'CPU': 1,
     },
+
+    # Number of warm sandboxed workers each process keeps for running
+    # capa problem code.  0 starts a new sandbox for each execution.
+    'worker_pool_size': 0,
 }
 
 # Some courses are allowed to run unsafe code. This is a list of regexes, one
@@ -1312,6 +1332,7 @@ MIDDLEWARE_CLASSES = [
 
     'django_comment_client.utils.ViewNameMiddleware',
     'codejail.django_integration.ConfigureCodeJailMiddleware',
+    'util.sandboxing.ConfigureSafeExecWorkerPoolMiddleware',
 
     # catches any uncaught RateLimitExceptions and returns a 403 instead of a 500
     'ratelimitbackend.middleware.RateLimitMiddleware',
@@ -1973,6 +1994,11 @@ BLOCK_STRUCTURES_SETTINGS = dict(
     # Maximum number of retries per task.
     TASK_MAX_RETRIES=5,
 
+    # Limits of the in-process cache of collected block structures,
+    # enabled with the block_structure.local_cache waffle switch.
+    LOCAL_CACHE_MAX_ENTRIES=50,
+    LOCAL_CACHE_MAX_BYTES=50 * 1024 * 1024,
+
     # Backend storage
     # STORAGE_CLASS='storages.backends.s3boto.S3BotoStorage',
     # STORAGE_KWARGS=dict(bucket='nim-beryl-test'),
@@ -3327,6 +3353,10 @@ DEFAULT_SITE_THEME = None
 
 ENABLE_COMPREHENSIVE_THEMING = True
 
+# Check on each request whether templates were added to or removed from the themes since they were
+# indexed, so that changes show up without a restart. Meant for development.
+COMPREHENSIVE_THEME_TEMPLATES_AUTO_REFRESH = False
+
 # API access management
 API_ACCESS_MANAGER_EMAIL = 'api-access@example.com'
 API_ACCESS_FROM_EMAIL = 'api-requests@example.com'
@@ -18,6 +18,8 @@ SITE_NAME = 'localhost:8000'
 # By default don't use a worker, execute tasks as if they were local functions
 CELERY_ALWAYS_EAGER = True
 HTTPS = 'off'
+# Pick up templates added to or removed from the themes without a restart
+COMPREHENSIVE_THEME_TEMPLATES_AUTO_REFRESH = True
 
 LMS_ROOT_URL = 'http://localhost:8000'
 LMS_INTERNAL_ROOT_URL = LMS_ROOT_URL
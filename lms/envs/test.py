@@ -223,6 +223,12 @@ CACHES = {
     },
 }
 
+# Don't cache course structures in process either, so tests see every mongo call
+COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES = 0
+
+# Call the comments service with requests.request, which tests mock
+COMMENTS_SERVICE_HTTP_POOL = {'ENABLED': False}
+
 # Dummy secret key for dev
 SECRET_KEY = '85920908f28904ed733fe576320db18cabd7b6cd'
 
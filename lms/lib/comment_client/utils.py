@@ -1,17 +1,37 @@
 """" Common utilities for comment client wrapper """
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
+from copy import deepcopy
 from time import time
 from uuid import uuid4
 
 import requests
+from django.conf import settings
+from django.db import connections
+from django.utils import translation
 from django.utils.translation import get_language
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.util.retry import Retry
 
 import dogstats_wrapper as dog_stats_api
+from openedx.core.djangoapps.request_cache import clear_cache, get_cache
+from openedx.core.djangoapps.request_cache.middleware import RequestCache
 from .settings import SERVICE_HOST as COMMENTS_SERVICE
 
 log = logging.getLogger(__name__)
 
+# The per-process session used to call the comments service, as a (pid, session)
+# tuple so that a forked process doesn't share its parent's connections.
+_SESSION = None
+
+# The per-process thread pool used by perform_in_parallel, as a (pid, executor) tuple.
+_EXECUTOR = None
+
+# Name of the request cache holding the responses reused by deduplicated_requests.
+DEDUPLICATED_RESPONSES_CACHE_NAME = u'comment_client.deduplicated_responses'
+
 
 def strip_none(dic):
     return dict([(k, v) for k, v in dic.iteritems() if v is not None])
@@ -53,11 +73,160 @@ def request_timer(request_id, method, url, tags=None):
     )
 
 
+def get_http_pool_settings():
+    """
+    Returns the COMMENTS_SERVICE_HTTP_POOL settings, with their defaults.
+    """
+    pool_settings = {'ENABLED': False, 'POOL_SIZE': 10, 'MAX_RETRIES': 1, 'MAX_PARALLEL_REQUESTS': 4}
+    pool_settings.update(getattr(settings, 'COMMENTS_SERVICE_HTTP_POOL', {}))
+    return pool_settings
+
+
+def get_session():
+    """
+    Returns the process' requests Session, which keeps connections to the
+    comments service alive in a pool, so that they are reused across calls.
+    Connection errors are retried up to MAX_RETRIES times.
+    """
+    global _SESSION  # pylint: disable=global-statement
+    if _SESSION is None or _SESSION[0] != os.getpid():
+        pool_settings = get_http_pool_settings()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_settings['POOL_SIZE'],
+            max_retries=Retry(total=pool_settings['MAX_RETRIES'], read=False),
+        )
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _SESSION = (os.getpid(), session)
+    return _SESSION[1]
+
+
+def _count_pool_connections(session, url):
+    """
+    Returns the number of connections the given session has opened so far
+    to the host of the given url.
+    """
+    return session.get_adapter(url).poolmanager.connection_from_url(url).num_connections
+
+
+def _pooled_request(method, url, metric_tags, **kwargs):
+    """
+    Makes the request with the pooled session, adding a tag to metric_tags
+    for whether the request reused a connection. Concurrent requests from
+    other threads of the process can make that tag inaccurate.
+    """
+    session = get_session()
+    num_connections = _count_pool_connections(session, url)
+    response = session.request(method, url, **kwargs)
+    reused = _count_pool_connections(session, url) == num_connections
+    metric_tags.append(u'connection:{}'.format('reused' if reused else 'new'))
+    return response
+
+
+def _get_executor():
+    """
+    Returns the process' thread pool for making requests in parallel.
+    """
+    global _EXECUTOR  # pylint: disable=global-statement
+    if _EXECUTOR is None or _EXECUTOR[0] != os.getpid():
+        max_workers = get_http_pool_settings()['MAX_PARALLEL_REQUESTS']
+        _EXECUTOR = (os.getpid(), ThreadPoolExecutor(max_workers=max_workers))
+    return _EXECUTOR[1]
+
+
+def _call_in_request_context(func, language, request_cache_data):
+    """
+    Calls func in a worker thread with the language and request cache of
+    the thread handling the request, so that it sends the same
+    Accept-Language header and shares the request's ForumsConfig and
+    deduplicated responses.
+    """
+    request_cache = RequestCache.get_request_cache()
+    request_cache.data = request_cache_data
+    try:
+        with translation.override(language):
+            return func()
+    finally:
+        request_cache.data = {}
+        connections.close_all()
+
+
+def perform_in_parallel(*funcs):
+    """
+    Calls the given functions, which make independent requests to the
+    comments service, and returns the list of their results. If any of them
+    raises an exception, the first one raised by the functions in the given
+    order is re-raised.
+
+    When pooled connections are enabled, the functions are called in parallel
+    by up to MAX_PARALLEL_REQUESTS threads, so they should only make requests
+    and not depend on the state of the calling thread, such as its database
+    transaction.
+    """
+    pool_settings = get_http_pool_settings()
+    if len(funcs) < 2 or not pool_settings['ENABLED'] or pool_settings['MAX_PARALLEL_REQUESTS'] < 2:
+        return [func() for func in funcs]
+
+    # Read the config in this thread, so that the workers find it in the request cache.
+    from django_comment_common.models import ForumsConfig
+    ForumsConfig.current_for_request()
+
+    request_cache_data = RequestCache.get_request_cache().data
+    futures = [
+        _get_executor().submit(_call_in_request_context, func, get_language(), request_cache_data)
+        for func in funcs
+    ]
+    return [future.result() for future in futures]
+
+
+@contextmanager
+def deduplicated_requests():
+    """
+    Within this context, identical GET requests to the comments service are
+    made only once, and later ones are given a copy of the first response.
+    Any other request clears the responses, since it may modify them.
+    """
+    responses = get_cache(DEDUPLICATED_RESPONSES_CACHE_NAME)
+    if 'responses' in responses:
+        # nested in another deduplicated_requests context
+        yield
+        return
+
+    responses['responses'] = {}
+    try:
+        yield
+    finally:
+        clear_cache(DEDUPLICATED_RESPONSES_CACHE_NAME)
+
+
 def perform_request(method, url, data_or_params=None, raw=False,
                     metric_action=None, metric_tags=None, paged_results=False):
+    responses = get_cache(DEDUPLICATED_RESPONSES_CACHE_NAME).get('responses')
+    if responses is not None and method == 'get':
+        key = (url, raw, repr(sorted((data_or_params or {}).items())))
+        if key in responses:
+            dog_stats_api.increment('comment_client.request.deduplicated', tags=metric_tags)
+        else:
+            responses[key] = _perform_request(
+                method, url, data_or_params, raw, metric_action, metric_tags, paged_results
+            )
+        return deepcopy(responses[key])
+
+    if responses:
+        responses.clear()
+    return _perform_request(method, url, data_or_params, raw, metric_action, metric_tags, paged_results)
+
+
+def _perform_request(method, url, data_or_params, raw, metric_action, metric_tags, paged_results):
+    """
+    Makes the request to the comments service and returns its response, as
+    text if raw or else decoded from JSON.
+    """
     # To avoid dependency conflict
     from django_comment_common.models import ForumsConfig
-    config = ForumsConfig.current()
+    config = ForumsConfig.current_for_request()
 
     if not config.enabled:
         raise CommentClientMaintenanceError('service disabled')
@@ -85,14 +254,25 @@ def perform_request(method, url, data_or_params=None, raw=False,
         data = None
         params = merge_dict(data_or_params, request_id_dict)
     with request_timer(request_id, method, url, metric_tags):
-        response = requests.request(
-            method,
-            url,
-            data=data,
-            params=params,
-            headers=headers,
-            timeout=config.connection_timeout
-        )
+        if get_http_pool_settings()['ENABLED']:
+            response = _pooled_request(
+                method,
+                url,
+                metric_tags,
+                data=data,
+                params=params,
+                headers=headers,
+                timeout=config.connection_timeout
+            )
+        else:
+            response = requests.request(
+                method,
+                url,
+                data=data,
+                params=params,
+                headers=headers,
+                timeout=config.connection_timeout
+            )
 
     metric_tags.append(u'status_code:{}'.format(response.status_code))
     if response.status_code > 200:
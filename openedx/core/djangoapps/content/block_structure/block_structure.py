@@ -6,10 +6,14 @@ Module with family of classes for block structures.
 
 The following internal data structures are implemented:
     _BlockRelations - Data structure for a single block's relations.
+    _BlockIndex - Integer-indexed representation of all blocks' relations.
     _BlockData - Data structure for a single block's data.
 """
+from array import array
+from collections import defaultdict
 from copy import deepcopy
 from functools import partial
+from itertools import imap
 from logging import getLogger
 
 from openedx.core.lib.graph_traversals import traverse_topologically, traverse_post_order
@@ -40,6 +44,126 @@ class _BlockRelations(object):
         self.children = []
 
 
+class _BlockIndex(object):
+    """
+    Data structure to encapsulate the relationships of all blocks in a
+    block structure, in which each block is identified by a dense
+    integer and the children and parents of all blocks are held in
+    compressed sparse row (CSR) arrays.
+
+    Traversals over the integers avoid hashing and comparing usage keys
+    at every step.  The index is kept up to date as blocks are removed
+    from the block structure, so it can still be used while a traversal
+    removes blocks.
+    """
+    def __init__(self, block_relations):
+
+        # List of the usage keys of the blocks, indexed by their integer.
+        # list [UsageKey]
+        self.block_keys = list(block_relations)
+
+        # Map of a block's usage key to its integer.
+        # dict {UsageKey: int}
+        self.block_indices = {block_key: index for index, block_key in enumerate(self.block_keys)}
+
+        # The children and parents of the block with integer i are at
+        # children[children_offsets[i]:children_offsets[i + 1]] and
+        # parents[parents_offsets[i]:parents_offsets[i + 1]].
+        self.children_offsets, self.children = self._create_csr_arrays(block_relations, 'children')
+        self.parents_offsets, self.parents = self._create_csr_arrays(block_relations, 'parents')
+
+        # Changes to the relations since the index was created.
+        self.is_modified = False
+        self.removed = bytearray(len(self.block_keys))
+        self.added_children = defaultdict(list)
+        self.added_parents = defaultdict(list)
+
+    def get_children(self, index):
+        """
+        Returns the integers of the children of the block with the
+        given integer.
+        """
+        children = self.children[self.children_offsets[index]:self.children_offsets[index + 1]]
+        if self.is_modified:
+            return self._get_current_relations(index, children, self.added_children)
+        return children
+
+    def get_parents(self, index):
+        """
+        Returns the integers of the parents of the block with the
+        given integer.
+        """
+        parents = self.parents[self.parents_offsets[index]:self.parents_offsets[index + 1]]
+        if self.is_modified:
+            return self._get_current_relations(index, parents, self.added_parents)
+        return parents
+
+    def create_filter(self, filter_func):
+        """
+        Returns a filter function on integers for the given filter
+        function on usage keys.
+        """
+        if filter_func is None:
+            return None
+        block_keys = self.block_keys
+        return lambda index: filter_func(block_keys[index])
+
+    def get_block_keys(self, indices):
+        """
+        Returns an iterator of the usage keys for the given iterator of
+        integers.
+        """
+        return imap(self.block_keys.__getitem__, indices)
+
+    def remove_block(self, usage_key):
+        """
+        Records the removal of the block with the given usage_key.
+        """
+        self.is_modified = True
+        self.removed[self.block_indices[usage_key]] = 1
+
+    def add_relation(self, parent_key, child_key):
+        """
+        Records a new parent to child relationship.  Returns False if
+        either block is not in the index.
+        """
+        parent_index = self.block_indices.get(parent_key)
+        child_index = self.block_indices.get(child_key)
+        if parent_index is None or child_index is None:
+            return False
+        self.is_modified = True
+        self.added_children[parent_index].append(child_index)
+        self.added_parents[child_index].append(parent_index)
+        return True
+
+    def _get_current_relations(self, index, relations, added_relations):
+        """
+        Returns the given original relations of the block with the
+        given integer, updated with any subsequent changes.
+        """
+        removed = self.removed
+        if removed[index]:
+            return []
+        current_relations = [related for related in relations if not removed[related]]
+        if index in added_relations:
+            current_relations.extend(related for related in added_relations[index] if not removed[related])
+        return current_relations
+
+    def _create_csr_arrays(self, block_relations, relation_name):
+        """
+        Returns the CSR offsets and indices arrays for the given
+        relation_name ('children' or 'parents') of the given
+        block_relations.
+        """
+        block_indices = self.block_indices
+        offsets = array('l', [0])
+        indices = array('l')
+        for block_key in self.block_keys:
+            indices.extend(block_indices[related] for related in getattr(block_relations[block_key], relation_name))
+            offsets.append(len(indices))
+        return offsets, indices
+
+
 class BlockStructure(object):
     """
     Base class for a block structure.  BlockStructures are constructed
@@ -65,6 +189,12 @@ class BlockStructure(object):
         # Add the root block.
         self._add_block(self._block_relations, root_block_usage_key)
 
+        # Whether traversals use an integer-indexed representation of
+        # the block relations, and that representation, if created.
+        # See enable_block_index.
+        self._use_block_index = False
+        self._block_index = None
+
     def __iter__(self):
         """
         The default iterator for a block structure is get_block_keys()
@@ -121,6 +251,19 @@ class BlockStructure(object):
         """
         self.root_block_usage_key = usage_key
         self._block_relations[usage_key].parents = []
+        self._block_index = None
+
+    def enable_block_index(self):
+        """
+        Enables the use of a compact, integer-indexed representation of
+        the block relations for traversals of this block structure.
+
+        The representation is created at the next traversal, and
+        speeds up the traversals that follow.  It is therefore worth
+        enabling before a block structure is traversed multiple times,
+        such as before it is transformed.
+        """
+        self._use_block_index = True
 
     def __contains__(self, usage_key):
         """
@@ -167,8 +310,19 @@ class BlockStructure(object):
             generator - A generator object created from the
                 traverse_topologically method.
         """
+        start_node = start_node or self.root_block_usage_key
+        block_index = self._get_block_index(start_node)
+        if block_index:
+            return block_index.get_block_keys(traverse_topologically(
+                start_node=block_index.block_indices[start_node],
+                get_parents=block_index.get_parents,
+                get_children=block_index.get_children,
+                filter_func=block_index.create_filter(filter_func),
+                yield_descendants_of_unyielded=yield_descendants_of_unyielded,
+            ))
+
         return traverse_topologically(
-            start_node=start_node or self.root_block_usage_key,
+            start_node=start_node,
             get_parents=self.get_parents,
             get_children=self.get_children,
             filter_func=filter_func,
@@ -192,8 +346,17 @@ class BlockStructure(object):
             generator - A generator object created from the
                 traverse_post_order method.
         """
+        start_node = start_node or self.root_block_usage_key
+        block_index = self._get_block_index(start_node)
+        if block_index:
+            return block_index.get_block_keys(traverse_post_order(
+                start_node=block_index.block_indices[start_node],
+                get_children=block_index.get_children,
+                filter_func=block_index.create_filter(filter_func),
+            ))
+
         return traverse_post_order(
-            start_node=start_node or self.root_block_usage_key,
+            start_node=start_node,
             get_children=self.get_children,
             filter_func=filter_func,
         )
@@ -228,6 +391,7 @@ class BlockStructure(object):
 
         # Replace this structure's relations with the newly pruned one.
         self._block_relations = pruned_block_relations
+        self._block_index = None
 
     def _add_relation(self, parent_key, child_key):
         """
@@ -238,6 +402,23 @@ class BlockStructure(object):
             child_key (UsageKey) - Usage key of the child block.
         """
         self._add_to_relations(self._block_relations, parent_key, child_key)
+        if self._block_index and not self._block_index.add_relation(parent_key, child_key):
+            self._block_index = None
+
+    def _get_block_index(self, start_node):
+        """
+        Returns the integer-indexed representation of this block
+        structure's relations for a traversal from the given
+        start_node, creating it if needed.  Returns None if it is not
+        enabled or does not contain the start_node.
+        """
+        if not self._use_block_index:
+            return None
+        if self._block_index is None:
+            self._block_index = _BlockIndex(self._block_relations)
+        if start_node not in self._block_index.block_indices:
+            return None
+        return self._block_index
 
     @staticmethod
     def _add_to_relations(block_relations, parent_key, child_key):
@@ -632,6 +813,8 @@ class BlockStructureBlockData(BlockStructure):
         # Remove block.
         self._block_relations.pop(usage_key, None)
         self._block_data_map.pop(usage_key, None)
+        if self._block_index:
+            self._block_index.remove_block(usage_key)
 
         # Recreate the graph connections if descendants are to be kept.
         if keep_descendants:
@@ -0,0 +1,137 @@
+"""
+Module for the in-process cache of serialized BlockStructure data.
+"""
+from collections import OrderedDict
+from logging import getLogger
+from threading import Lock
+
+from django.conf import settings
+
+
+logger = getLogger(__name__)  # pylint: disable=C0103
+
+
+# Default limits of the in-process cache, overridable with the
+# LOCAL_CACHE_MAX_ENTRIES and LOCAL_CACHE_MAX_BYTES keys of
+# settings.BLOCK_STRUCTURES_SETTINGS.
+DEFAULT_MAX_ENTRIES = 50
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+
+class LocalBlockStructureCache(object):
+    """
+    A bounded, least-recently-used cache of serialized block structure
+    data, local to the current process.
+
+    Each entry is keyed by the root usage key of its block structure
+    and remembers the version of the data it holds, so an entry is
+    only returned if its version matches the version currently in
+    storage.  At most one version is kept per root usage key.
+
+    The cache is bounded both by the number of entries and by the
+    total size, in bytes, of the serialized data it holds.
+    """
+    def __init__(self, max_entries, max_bytes):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        # OrderedDict {root_usage_key: (version, serialized_data)},
+        # from least to most recently used.
+        self._entries = OrderedDict()
+        self._num_bytes = 0
+        self._lock = Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, root_block_usage_key, version):
+        """
+        Returns the serialized data cached for the given
+        root_block_usage_key at the given version, or None if not found.
+        """
+        with self._lock:
+            entry = self._entries.pop(root_block_usage_key, None)
+            if entry is None or entry[0] != version:
+                if entry is not None:
+                    self._num_bytes -= len(entry[1])
+                self.misses += 1
+                return None
+
+            self._entries[root_block_usage_key] = entry
+            self.hits += 1
+            return entry[1]
+
+    def set(self, root_block_usage_key, version, serialized_data):
+        """
+        Caches the given serialized_data for the given
+        root_block_usage_key at the given version, replacing any other
+        version, and evicts least recently used entries as needed.
+        """
+        if len(serialized_data) > self.max_bytes:
+            return
+
+        with self._lock:
+            self._pop(root_block_usage_key)
+            self._entries[root_block_usage_key] = (version, serialized_data)
+            self._num_bytes += len(serialized_data)
+
+            while len(self._entries) > self.max_entries or self._num_bytes > self.max_bytes:
+                evicted_key, (__, evicted_data) = self._entries.popitem(last=False)
+                self._num_bytes -= len(evicted_data)
+                self.evictions += 1
+                logger.info("BlockStructure: Evicted from local cache; %s.", evicted_key)
+
+    def delete(self, root_block_usage_key):
+        """
+        Removes any data cached for the given root_block_usage_key.
+        """
+        with self._lock:
+            self._pop(root_block_usage_key)
+
+    def clear(self):
+        """
+        Removes all cached data and resets the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._num_bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        Returns a dict of the counters and the current size of the cache.
+        """
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            entries=len(self._entries),
+            bytes=self._num_bytes,
+        )
+
+    def _pop(self, root_block_usage_key):
+        """
+        Removes the entry for the given root_block_usage_key, if any.
+        The caller must hold the lock.
+        """
+        entry = self._entries.pop(root_block_usage_key, None)
+        if entry is not None:
+            self._num_bytes -= len(entry[1])
+
+
+_local_cache = None
+
+
+def get_local_cache():
+    """
+    Returns the process-wide LocalBlockStructureCache, configured with
+    the limits in settings.BLOCK_STRUCTURES_SETTINGS.
+    """
+    global _local_cache  # pylint: disable=global-statement
+    if _local_cache is None:
+        _local_cache = LocalBlockStructureCache(
+            max_entries=settings.BLOCK_STRUCTURES_SETTINGS.get('LOCAL_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES),
+            max_bytes=settings.BLOCK_STRUCTURES_SETTINGS.get('LOCAL_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES),
+        )
+    return _local_cache
@@ -4,7 +4,7 @@ BlockStructures.
 """
 from contextlib import contextmanager
 
-from . import config
+from . import config, transformer_metrics
 from .exceptions import UsageKeyNotInBlockStructure, TransformerDataIncompatible, BlockStructureNotFound
 from .factory import BlockStructureFactory
 from .store import BlockStructureStore
@@ -61,6 +61,8 @@ class BlockStructureManager(object):
                 starting at starting_block_usage_key.
         """
         block_structure = collected_block_structure.copy() if collected_block_structure else self.get_collected()
+        if config.waffle().is_enabled(config.INDEXED_TRAVERSALS):
+            block_structure.enable_block_index()
 
         if starting_block_usage_key:
             # Override the root_block_usage_key so traversals start at the
@@ -73,7 +75,7 @@ class BlockStructureManager(object):
                     unicode(self.root_block_usage_key),
                 )
             block_structure.set_root_block(starting_block_usage_key)
-        transformers.transform(block_structure)
+        transformers.transform(block_structure, record_metrics=transformer_metrics.is_enabled())
         return block_structure
 
     def get_collected(self):
@@ -124,7 +126,7 @@ class BlockStructureManager(object):
                 self.root_block_usage_key,
                 self.modulestore,
             )
-            BlockStructureTransformers.collect(block_structure)
+            BlockStructureTransformers.collect(block_structure, record_metrics=transformer_metrics.is_enabled())
             self.store.add(block_structure)
             return block_structure
 
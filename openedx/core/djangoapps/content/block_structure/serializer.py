@@ -0,0 +1,191 @@
+"""
+Module for the compact serialization format of BlockStructure objects.
+
+Pickling a block structure as a graph of objects pickles a _BlockRelations,
+a BlockData and a TransformerData object for each block, each of which is
+slow to unpickle, and repeats each block's usage key for every reference
+to it.  Instead, the compact format:
+
+    * interns the usage keys of the structure in a single list, referring
+      to each block by its integer index into that list,
+    * stores the structure's relations as integer-indexed adjacency lists,
+    * stores the xBlock fields and transformer block fields in columns of
+      (block indices, values), one per field.
+
+The resulting tuple of builtin types is pickled and zlib-compressed, and
+prefixed with COMPACT_FORMAT_PREFIX and the format's version.
+"""
+# pylint: disable=protected-access
+from openedx.core.lib.cache_utils import zpickle, zunpickle
+
+from .block_structure import BlockData, TransformerData, TransformerDataMap, _BlockRelations
+from .exceptions import BlockStructureNotFound
+from .factory import BlockStructureFactory
+
+
+# Prefix of all data serialized in the compact format.  Data serialized
+# with zpickle always begins with a zlib header, so the two formats can
+# be told apart.
+COMPACT_FORMAT_PREFIX = 'BSC'
+
+# The latest version of the compact format.  Increment this value
+# whenever the layout of the serialized tuple changes.
+COMPACT_FORMAT_VERSION = 1
+
+
+class BlockStructureCompactSerializer(object):
+    """
+    Serializer for the compact format of BlockStructureBlockData objects.
+    """
+    @classmethod
+    def is_compact(cls, serialized_data):
+        """
+        Returns whether the given serialized data is in the compact format.
+        """
+        return serialized_data.startswith(COMPACT_FORMAT_PREFIX)
+
+    @classmethod
+    def serialize(cls, block_structure):
+        """
+        Serializes the given block_structure into the compact format.
+        """
+        block_relations = block_structure._block_relations
+        block_data_map = block_structure._block_data_map
+
+        # Intern the usage keys, starting with the blocks in the structure,
+        # followed by any blocks that only have collected data.
+        block_keys = list(block_relations)
+        num_blocks_in_structure = len(block_keys)
+        block_keys.extend(block_key for block_key in block_data_map if block_key not in block_relations)
+        block_indices = {block_key: index for index, block_key in enumerate(block_keys)}
+
+        parents = []
+        children = []
+        for block_key in block_keys[:num_blocks_in_structure]:
+            relations = block_relations[block_key]
+            parents.append([block_indices[parent_key] for parent_key in relations.parents])
+            children.append([block_indices[child_key] for child_key in relations.children])
+
+        # Columns are dicts of {field_name: (block indices, values)}.
+        block_data_indices = []
+        xblock_field_columns = {}
+        transformer_block_columns = {}
+        for index, block_key in enumerate(block_keys):
+            block_data = block_data_map.get(block_key)
+            if block_data is None:
+                continue
+            block_data_indices.append(index)
+            cls._add_to_columns(xblock_field_columns, index, block_data.fields)
+            for transformer_name, transformer_block_data in block_data.transformer_data.iteritems():
+                transformer_indices, transformer_field_columns = transformer_block_columns.setdefault(
+                    transformer_name, ([], {}),
+                )
+                transformer_indices.append(index)
+                cls._add_to_columns(transformer_field_columns, index, transformer_block_data.fields)
+
+        transformer_data = {
+            transformer_name: transformer_data.fields
+            for transformer_name, transformer_data in block_structure.transformer_data.iteritems()
+        }
+
+        return COMPACT_FORMAT_PREFIX + chr(COMPACT_FORMAT_VERSION) + zpickle((
+            block_keys,
+            parents,
+            children,
+            block_data_indices,
+            xblock_field_columns,
+            transformer_block_columns,
+            transformer_data,
+        ))
+
+    @classmethod
+    def deserialize(cls, serialized_data, root_block_usage_key):
+        """
+        Deserializes the given compact data and returns the parsed
+        block_structure.
+
+        Raises:
+            BlockStructureNotFound if the data was serialized with an
+            unsupported version of the compact format, so it is treated
+            like a cache miss.
+        """
+        version = ord(serialized_data[len(COMPACT_FORMAT_PREFIX)])
+        if version != COMPACT_FORMAT_VERSION:
+            raise BlockStructureNotFound(root_block_usage_key)
+
+        (
+            block_keys,
+            parents,
+            children,
+            block_data_indices,
+            xblock_field_columns,
+            transformer_block_columns,
+            transformer_data,
+        ) = zunpickle(serialized_data[len(COMPACT_FORMAT_PREFIX) + 1:])
+
+        block_relations = {}
+        for index, (parent_indices, child_indices) in enumerate(zip(parents, children)):
+            relations = _BlockRelations()
+            relations.parents = [block_keys[parent_index] for parent_index in parent_indices]
+            relations.children = [block_keys[child_index] for child_index in child_indices]
+            block_relations[block_keys[index]] = relations
+
+        block_datas = {index: cls._new_block_data(block_keys[index]) for index in block_data_indices}
+        for field_name, (indices, values) in xblock_field_columns.iteritems():
+            for index, value in zip(indices, values):
+                block_datas[index].fields[field_name] = value
+
+        for transformer_name, transformer_columns in transformer_block_columns.iteritems():
+            transformer_indices, transformer_field_columns = transformer_columns
+            transformer_block_datas = {}
+            for index in transformer_indices:
+                transformer_block_data = cls._new_transformer_data({})
+                transformer_block_datas[index] = transformer_block_data
+                dict.__setitem__(block_datas[index].transformer_data, transformer_name, transformer_block_data)
+            for field_name, (indices, values) in transformer_field_columns.iteritems():
+                for index, value in zip(indices, values):
+                    transformer_block_datas[index].fields[field_name] = value
+
+        transformer_data_map = TransformerDataMap()
+        for transformer_name, fields in transformer_data.iteritems():
+            dict.__setitem__(transformer_data_map, transformer_name, cls._new_transformer_data(fields))
+
+        return BlockStructureFactory.create_new(
+            root_block_usage_key,
+            block_relations,
+            transformer_data_map,
+            {block_keys[index]: block_data for index, block_data in block_datas.iteritems()},
+        )
+
+    @staticmethod
+    def _add_to_columns(columns, index, fields):
+        """
+        Appends the given fields of the block at the given index to the
+        given columns.
+        """
+        for field_name, value in fields.iteritems():
+            indices, values = columns.setdefault(field_name, ([], []))
+            indices.append(index)
+            values.append(value)
+
+    @staticmethod
+    def _new_block_data(usage_key):
+        """
+        Returns a new, empty BlockData for the given usage_key.
+
+        For performance, this bypasses the __init__ and __setattr__ methods
+        of FieldData, which are costly when called for each block.
+        """
+        block_data = BlockData.__new__(BlockData)
+        block_data.__dict__.update(fields={}, location=usage_key, transformer_data=TransformerDataMap())
+        return block_data
+
+    @staticmethod
+    def _new_transformer_data(fields):
+        """
+        Returns a new TransformerData with the given fields, bypassing the
+        __init__ and __setattr__ methods of FieldData.
+        """
+        transformer_data = TransformerData.__new__(TransformerData)
+        transformer_data.__dict__['fields'] = fields
+        return transformer_data
@@ -4,12 +4,13 @@ Signal handlers for invalidating cached data.
 from django.conf import settings
 from django.dispatch.dispatcher import receiver
 
-from xmodule.modulestore.django import SignalHandler
+from xmodule.modulestore.django import SignalHandler, modulestore
 
 from opaque_keys.edx.locator import LibraryLocator
 
 from . import config
 from .api import clear_course_from_cache
+from .local_cache import get_local_cache
 from .tasks import update_course_in_cache_v2
 
 
@@ -23,6 +24,11 @@ def _update_block_structure_on_course_publish(sender, course_key, **kwargs):  #
     if isinstance(course_key, LibraryLocator):
         return
 
+    # Entries in the in-process caches of other processes are outdated
+    # once the new version is stored, but this process can drop its
+    # entry right away.
+    get_local_cache().delete(modulestore().make_course_usage_key(course_key))
+
     if config.waffle().is_enabled(config.INVALIDATE_CACHE_ON_PUBLISH):
         clear_course_from_cache(course_key)
 
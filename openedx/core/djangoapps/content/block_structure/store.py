@@ -10,7 +10,9 @@ from . import config
 from .block_structure import BlockStructureBlockData
 from .exceptions import BlockStructureNotFound
 from .factory import BlockStructureFactory
+from .local_cache import get_local_cache
 from .models import BlockStructureModel
+from .serializer import BlockStructureCompactSerializer
 from .transformer_registry import TransformerRegistry
 
 
@@ -65,6 +67,7 @@ class BlockStructureStore(object):
 
         bs_model = self._update_or_create_model(block_structure, serialized_data)
         self._add_to_cache(serialized_data, bs_model)
+        self._add_to_local_cache(serialized_data, bs_model)
 
     def get(self, root_block_usage_key):
         """
@@ -89,11 +92,14 @@ class BlockStructureStore(object):
         """
         bs_model = self._get_model(root_block_usage_key)
 
-        try:
-            serialized_data = self._get_from_cache(bs_model)
-        except BlockStructureNotFound:
-            serialized_data = self._get_from_store(bs_model)
-            self._add_to_cache(serialized_data, bs_model)
+        serialized_data = self._get_from_local_cache(bs_model)
+        if serialized_data is None:
+            try:
+                serialized_data = self._get_from_cache(bs_model)
+            except BlockStructureNotFound:
+                serialized_data = self._get_from_store(bs_model)
+                self._add_to_cache(serialized_data, bs_model)
+            self._add_to_local_cache(serialized_data, bs_model)
 
         return self._deserialize(serialized_data, root_block_usage_key)
 
@@ -106,6 +112,7 @@ class BlockStructureStore(object):
             root_block_usage_key (UsageKey) - The usage_key for the root
                 of the block structure that is to be removed.
         """
+        get_local_cache().delete(root_block_usage_key)
         bs_model = self._get_model(root_block_usage_key)
         self._cache.delete(self._encode_root_cache_key(bs_model))
         bs_model.delete()
@@ -177,6 +184,31 @@ class BlockStructureStore(object):
             logger.info("BlockStructure: Read from cache; %s, size: %d", bs_model, len(serialized_data))
         return serialized_data
 
+    def _add_to_local_cache(self, serialized_data, bs_model):
+        """
+        Adds the given serialized_data for the given BlockStructureModel
+        to the in-process cache, if enabled.
+        """
+        if _is_local_cache_enabled():
+            get_local_cache().set(bs_model.data_usage_key, unicode(bs_model), serialized_data)
+
+    def _get_from_local_cache(self, bs_model):
+        """
+        Returns the serialized data for the given BlockStructureModel
+        from the in-process cache, or None if not found or not enabled.
+
+        Entries are only returned if they were cached for the same
+        version of the model, so data updated by other processes is
+        never served stale.
+        """
+        if not _is_local_cache_enabled():
+            return None
+
+        serialized_data = get_local_cache().get(bs_model.data_usage_key, unicode(bs_model))
+        if serialized_data is not None:
+            logger.info("BlockStructure: Read from local cache; %s, size: %d", bs_model, len(serialized_data))
+        return serialized_data
+
     def _get_from_store(self, bs_model):
         """
         Returns the serialized data for the given BlockStructureModel
@@ -191,8 +223,12 @@ class BlockStructureStore(object):
 
     def _serialize(self, block_structure):
         """
-        Serializes the data for the given block_structure.
+        Serializes the data for the given block_structure, in the compact
+        format if it is enabled, and as a compressed pickle otherwise.
         """
+        if config.waffle().is_enabled(config.COMPACT_SERIALIZATION):
+            return BlockStructureCompactSerializer.serialize(block_structure)
+
         data_to_cache = (
             block_structure._block_relations,
             block_structure.transformer_data,
@@ -202,8 +238,12 @@ class BlockStructureStore(object):
 
     def _deserialize(self, serialized_data, root_block_usage_key):
         """
-        Deserializes the given data and returns the parsed block_structure.
+        Deserializes the given data, in either the compact or the pickle
+        format, and returns the parsed block_structure.
         """
+        if BlockStructureCompactSerializer.is_compact(serialized_data):
+            return BlockStructureCompactSerializer.deserialize(serialized_data, root_block_usage_key)
+
         block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
         return BlockStructureFactory.create_new(
             root_block_usage_key,
@@ -256,3 +296,13 @@ def _is_storage_backing_enabled():
     Returns whether storage backing for Block Structures is enabled.
     """
     return config.waffle().is_enabled(config.STORAGE_BACKING_FOR_CACHE)
+
+
+def _is_local_cache_enabled():
+    """
+    Returns whether the in-process cache for Block Structures is enabled.
+
+    The in-process cache relies on the version data in storage to detect
+    outdated entries, so it also requires storage backing.
+    """
+    return config.waffle().is_enabled(config.LOCAL_CACHE) and _is_storage_backing_enabled()
@@ -264,6 +264,41 @@ class TestBlockStructureData(TestCase, ChildrenMapTestMixin):
         block_structure.remove_block_traversal(lambda block: block == 2)
         self.assert_block_structure(block_structure, [[1], [], [], []], missing_blocks=[2])
 
+    @ddt.data(
+        *itertools.product(
+            [True, False],
+            range(7),
+            [
+                ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+                ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
+                ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+            ],
+        )
+    )
+    @ddt.unpack
+    def test_block_index(self, keep_descendants, block_to_remove, children_map):
+        if block_to_remove >= len(children_map):
+            return
+
+        results = []
+        for use_block_index in (False, True):
+            block_structure = self.create_block_structure(children_map)
+            if use_block_index:
+                block_structure.enable_block_index()
+
+            result = [list(block_structure.topological_traversal()), list(block_structure.post_order_traversal())]
+            block_structure.remove_block_traversal(lambda block: block == block_to_remove, keep_descendants)
+            result.append(list(block_structure.topological_traversal(yield_descendants_of_unyielded=True)))
+            block_structure._prune_unreachable()
+            result.append(list(block_structure.topological_traversal()))
+            result.append({
+                block: (block_structure.get_children(block), block_structure.get_parents(block))
+                for block in block_structure
+            })
+            results.append(result)
+
+        self.assertEquals(results[0], results[1])
+
     def test_copy(self):
         def _set_value(structure, value):
             """
@@ -0,0 +1,74 @@
+"""
+Tests for block_structure/local_cache.py
+"""
+from unittest import TestCase
+
+from nose.plugins.attrib import attr
+
+from ..local_cache import LocalBlockStructureCache
+
+
+@attr(shard=2)
+class TestLocalBlockStructureCache(TestCase):
+    """
+    Tests for LocalBlockStructureCache
+    """
+    def setUp(self):
+        super(TestLocalBlockStructureCache, self).setUp()
+        self.cache = LocalBlockStructureCache(max_entries=2, max_bytes=10)
+
+    def assert_stats(self, **expected_stats):
+        """
+        Verifies the given subset of the cache's stats.
+        """
+        stats = self.cache.stats()
+        self.assertEquals({key: stats[key] for key in expected_stats}, expected_stats)
+
+    def test_get_and_set(self):
+        self.assertIsNone(self.cache.get('a', 'v1'))
+        self.cache.set('a', 'v1', 'data')
+        self.assertEquals(self.cache.get('a', 'v1'), 'data')
+        self.assert_stats(hits=1, misses=1, evictions=0, entries=1, bytes=4)
+
+    def test_outdated_version(self):
+        self.cache.set('a', 'v1', 'data')
+        self.assertIsNone(self.cache.get('a', 'v2'))
+        self.assert_stats(hits=0, misses=1, entries=0, bytes=0)
+
+    def test_set_replaces_version(self):
+        self.cache.set('a', 'v1', 'data')
+        self.cache.set('a', 'v2', 'new')
+        self.assertIsNone(self.cache.get('a', 'v1'))
+        self.cache.set('a', 'v2', 'new')
+        self.assertEquals(self.cache.get('a', 'v2'), 'new')
+        self.assert_stats(entries=1, bytes=3, evictions=0)
+
+    def test_evict_least_recently_used_entry(self):
+        self.cache.set('a', 'v1', 'a')
+        self.cache.set('b', 'v1', 'b')
+        self.cache.get('a', 'v1')
+        self.cache.set('c', 'v1', 'c')
+        self.assertIsNone(self.cache.get('b', 'v1'))
+        self.assertEquals(self.cache.get('a', 'v1'), 'a')
+        self.assertEquals(self.cache.get('c', 'v1'), 'c')
+        self.assert_stats(evictions=1, entries=2)
+
+    def test_evict_by_size(self):
+        self.cache.set('a', 'v1', 'aaaaaa')
+        self.cache.set('b', 'v1', 'bbbbbb')
+        self.assertIsNone(self.cache.get('a', 'v1'))
+        self.assert_stats(evictions=1, entries=1, bytes=6)
+
+    def test_data_larger_than_cache(self):
+        self.cache.set('a', 'v1', 'a' * 11)
+        self.assertIsNone(self.cache.get('a', 'v1'))
+        self.assert_stats(evictions=0, entries=0, bytes=0)
+
+    def test_delete_and_clear(self):
+        self.cache.set('a', 'v1', 'a')
+        self.cache.set('b', 'v1', 'b')
+        self.cache.delete('a')
+        self.assertIsNone(self.cache.get('a', 'v1'))
+        self.assert_stats(entries=1, bytes=1)
+        self.cache.clear()
+        self.assert_stats(hits=0, misses=0, evictions=0, entries=0, bytes=0)
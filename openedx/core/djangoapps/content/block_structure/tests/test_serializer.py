@@ -0,0 +1,152 @@
+"""
+Tests for block_structure/serializer.py
+"""
+# pylint: disable=protected-access
+from time import time
+from unittest import TestCase, skip
+
+import ddt
+from nose.plugins.attrib import attr
+
+from openedx.core.lib.cache_utils import zpickle, zunpickle
+
+from ..exceptions import BlockStructureNotFound
+from ..serializer import BlockStructureCompactSerializer, COMPACT_FORMAT_PREFIX, COMPACT_FORMAT_VERSION
+from .helpers import ChildrenMapTestMixin, MockTransformer
+
+
+@attr(shard=2)
+@ddt.ddt
+class TestBlockStructureCompactSerializer(ChildrenMapTestMixin, TestCase):
+    """
+    Tests for BlockStructureCompactSerializer
+    """
+    def _round_trip(self, block_structure):
+        """
+        Returns the result of serializing and deserializing the given
+        block_structure in the compact format.
+        """
+        serialized_data = BlockStructureCompactSerializer.serialize(block_structure)
+        self.assertTrue(BlockStructureCompactSerializer.is_compact(serialized_data))
+        return BlockStructureCompactSerializer.deserialize(serialized_data, block_structure.root_block_usage_key)
+
+    @ddt.data(
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_relations(self, children_map):
+        block_structure = self.create_block_structure(children_map)
+        self.assert_block_structure(self._round_trip(block_structure), children_map)
+
+    def test_block_data(self):
+        children_map = self.SIMPLE_CHILDREN_MAP
+        block_structure = self.create_block_structure(children_map)
+        block_structure._add_transformer(MockTransformer)
+        block_structure.set_transformer_data(MockTransformer, 'version', 3)
+        for block_key in range(len(children_map)):
+            block_data = block_structure._get_or_create_block(block_key)
+            block_data.display_name = 'Block {}'.format(block_key)
+            if block_key % 2:
+                block_structure.set_transformer_block_field(block_key, MockTransformer, 'odd', block_key)
+
+        deserialized = self._round_trip(block_structure)
+
+        self.assertEquals(deserialized.get_transformer_data(MockTransformer, 'version'), 3)
+        for block_key in range(len(children_map)):
+            self.assertEquals(deserialized[block_key].location, block_key)
+            self.assertEquals(deserialized[block_key].fields, block_structure[block_key].fields)
+            self.assertEquals(
+                deserialized.get_transformer_block_field(block_key, MockTransformer, 'odd'),
+                block_key if block_key % 2 else None,
+            )
+
+    def test_pickle_format_is_not_compact(self):
+        block_structure = self.create_block_structure(self.SIMPLE_CHILDREN_MAP)
+        serialized_data = zpickle(
+            (block_structure._block_relations, block_structure.transformer_data, block_structure._block_data_map)
+        )
+        self.assertFalse(BlockStructureCompactSerializer.is_compact(serialized_data))
+
+    def test_unsupported_version(self):
+        block_structure = self.create_block_structure(self.SIMPLE_CHILDREN_MAP)
+        serialized_data = BlockStructureCompactSerializer.serialize(block_structure)
+        prefix_length = len(COMPACT_FORMAT_PREFIX)
+        serialized_data = (
+            serialized_data[:prefix_length] + chr(COMPACT_FORMAT_VERSION + 1) + serialized_data[prefix_length + 1:]
+        )
+        with self.assertRaises(BlockStructureNotFound):
+            BlockStructureCompactSerializer.deserialize(serialized_data, block_structure.root_block_usage_key)
+
+
+@skip
+class BlockStructureSerializationPerfTest(ChildrenMapTestMixin, TestCase):
+    """
+    Benchmark comparing the pickle and compact serialization formats.
+
+    Run manually by removing the skip decorator and running with -s to
+    see the output.
+    """
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    NUM_BLOCKS = 10000
+    NUM_CHILDREN = 5
+    NUM_ITERATIONS = 5
+
+    def _create_large_block_structure(self):
+        """
+        Returns a block structure of NUM_BLOCKS blocks with collected
+        xBlock fields and transformer block fields.
+        """
+        children_map = [
+            range(block_key * self.NUM_CHILDREN + 1, min((block_key + 1) * self.NUM_CHILDREN + 1, self.NUM_BLOCKS))
+            for block_key in range(self.NUM_BLOCKS)
+        ]
+        block_structure = self.create_block_structure(children_map)
+        block_structure._add_transformer(MockTransformer)
+        for block_key in range(self.NUM_BLOCKS):
+            block_data = block_structure._get_or_create_block(block_key)
+            block_data.display_name = u'Block {}'.format(block_key)
+            block_data.graded = bool(block_key % 2)
+            block_structure.set_transformer_block_field(block_key, MockTransformer, 'merged_start', None)
+        return block_structure
+
+    def _time(self, func):
+        """
+        Returns the average duration, in seconds, of calling func.
+        """
+        start = time()
+        for __ in range(self.NUM_ITERATIONS):
+            func()
+        return (time() - start) / self.NUM_ITERATIONS
+
+    def test_compare_formats(self):
+        block_structure = self._create_large_block_structure()
+        root_block_usage_key = block_structure.root_block_usage_key
+
+        def pickle_serialize():
+            """ Serializes the block structure in the pickle format. """
+            return zpickle(
+                (block_structure._block_relations, block_structure.transformer_data, block_structure._block_data_map)
+            )
+
+        def compact_serialize():
+            """ Serializes the block structure in the compact format. """
+            return BlockStructureCompactSerializer.serialize(block_structure)
+
+        pickle_data = pickle_serialize()
+        compact_data = compact_serialize()
+
+        for name, serialize, deserialize, data in (
+                ('pickle', pickle_serialize, lambda: zunpickle(pickle_data), pickle_data),
+                (
+                    'compact',
+                    compact_serialize,
+                    lambda: BlockStructureCompactSerializer.deserialize(compact_data, root_block_usage_key),
+                    compact_data,
+                ),
+        ):
+            print "{}: size={} bytes, serialize={:.4f}s, deserialize={:.4f}s".format(
+                name, len(data), self._time(serialize), self._time(deserialize),
+            )
@@ -1,14 +1,20 @@
 """
 Tests for block_structure/cache.py
 """
+# pylint: disable=protected-access
+import itertools
+
 import ddt
+from mock import patch
 from nose.plugins.attrib import attr
 
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
 
-from ..config import STORAGE_BACKING_FOR_CACHE, waffle
+from ..config import COMPACT_SERIALIZATION, LOCAL_CACHE, STORAGE_BACKING_FOR_CACHE, waffle
 from ..config.models import BlockStructureConfiguration
 from ..exceptions import BlockStructureNotFound
+from ..local_cache import get_local_cache
+from ..models import BlockStructureModel
 from ..store import BlockStructureStore
 from .helpers import ChildrenMapTestMixin, UsageKeyFactoryMixin, MockCache, MockTransformer
 
@@ -31,6 +37,9 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
         self.mock_cache = MockCache()
         self.store = BlockStructureStore(self.mock_cache)
 
+        get_local_cache().clear()
+        self.addCleanup(get_local_cache().clear)
+
     def add_transformers(self):
         """
         Add each registered transformer to the block structure.
@@ -51,13 +60,27 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
             with self.assertRaises(BlockStructureNotFound):
                 self.store.get(self.block_structure.root_block_usage_key)
 
-    @ddt.data(True, False)
-    def test_add_and_get(self, with_storage_backing):
+    @ddt.data(*itertools.product((True, False), repeat=2))
+    @ddt.unpack
+    def test_add_and_get(self, with_storage_backing, with_compact_serialization):
         with waffle().override(STORAGE_BACKING_FOR_CACHE, active=with_storage_backing):
-            self.store.add(self.block_structure)
-            stored_value = self.store.get(self.block_structure.root_block_usage_key)
+            with waffle().override(COMPACT_SERIALIZATION, active=with_compact_serialization):
+                self.store.add(self.block_structure)
+                stored_value = self.store.get(self.block_structure.root_block_usage_key)
             self.assertIsNotNone(stored_value)
             self.assert_block_structure(stored_value, self.children_map)
+            self.assertEquals(
+                stored_value.get_transformer_block_field(self.block_key_factory(0), MockTransformer, 'test'),
+                '{} val'.format(MockTransformer.name()),
+            )
+
+    @ddt.data(True, False)
+    def test_get_after_toggling_compact_serialization(self, with_compact_serialization):
+        with waffle().override(COMPACT_SERIALIZATION, active=with_compact_serialization):
+            self.store.add(self.block_structure)
+        with waffle().override(COMPACT_SERIALIZATION, active=not with_compact_serialization):
+            stored_value = self.store.get(self.block_structure.root_block_usage_key)
+        self.assert_block_structure(stored_value, self.children_map)
 
     @ddt.data(True, False)
     def test_delete(self, with_storage_backing):
@@ -80,6 +103,39 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
             stored_value = self.store.get(self.block_structure.root_block_usage_key)
             self.assert_block_structure(stored_value, self.children_map)
 
+    @ddt.data(True, False)
+    def test_local_cache(self, with_local_cache):
+        with waffle().override(STORAGE_BACKING_FOR_CACHE, active=True):
+            with waffle().override(LOCAL_CACHE, active=with_local_cache):
+                self.store.add(self.block_structure)
+                self.mock_cache.map.clear()
+                with patch.object(self.store, '_get_from_store', wraps=self.store._get_from_store) as mock_get:
+                    stored_value = self.store.get(self.block_structure.root_block_usage_key)
+                self.assert_block_structure(stored_value, self.children_map)
+                self.assertEquals(mock_get.called, not with_local_cache)
+                self.assertEquals(get_local_cache().hits, 1 if with_local_cache else 0)
+
+    def test_local_cache_outdated_version(self):
+        with waffle().override(STORAGE_BACKING_FOR_CACHE, active=True):
+            with waffle().override(LOCAL_CACHE, active=True):
+                self.store.add(self.block_structure)
+                bs_model = BlockStructureModel.get(self.block_structure.root_block_usage_key)
+                bs_model.data_version = 'updated in another process'
+                bs_model.save()
+
+                self.store.get(self.block_structure.root_block_usage_key)
+                self.assertEquals(get_local_cache().hits, 0)
+                self.assertEquals(get_local_cache().misses, 1)
+
+    def test_local_cache_delete(self):
+        with waffle().override(STORAGE_BACKING_FOR_CACHE, active=True):
+            with waffle().override(LOCAL_CACHE, active=True):
+                self.store.add(self.block_structure)
+                self.store.delete(self.block_structure.root_block_usage_key)
+                self.assertEquals(get_local_cache().stats()['entries'], 0)
+                with self.assertRaises(BlockStructureNotFound):
+                    self.store.get(self.block_structure.root_block_usage_key)
+
     @ddt.data(1, 5, None)
     def test_cache_timeout(self, timeout):
         if timeout is not None:
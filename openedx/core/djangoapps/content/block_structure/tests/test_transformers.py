@@ -5,8 +5,11 @@ from mock import MagicMock, patch
 from nose.plugins.attrib import attr
 from unittest import TestCase
 
+from openedx.core.djangoapps.request_cache import clear_cache
+
 from ..block_structure import BlockStructureModulestoreData
 from ..exceptions import TransformerException, TransformerDataIncompatible
+from ..transformer_metrics import REQUEST_CACHE_NAME, get_recorded_metrics
 from ..transformers import BlockStructureTransformers
 from .helpers import (
     ChildrenMapTestMixin, MockTransformer, MockFilteringTransformer, mock_registered_transformers
@@ -71,6 +74,48 @@ class TestBlockStructureTransformers(ChildrenMapTestMixin, TestCase):
             self.transformers.transform(block_structure=MagicMock())
             self.assertTrue(mock_transform_call.called)
 
+    def test_transform_with_metrics(self):
+        clear_cache(REQUEST_CACHE_NAME)
+        self.add_mock_transformer()
+        block_structure = self.create_block_structure(self.SIMPLE_CHILDREN_MAP)
+
+        self.transformers.transform(block_structure, record_metrics=True)
+
+        recorded_metrics = get_recorded_metrics()
+        for transformer in self.registered_transformers:
+            transformer_metrics = recorded_metrics[transformer.name()]
+            self.assertEquals(transformer_metrics['blocks_in'], len(self.SIMPLE_CHILDREN_MAP))
+            self.assertEquals(transformer_metrics['blocks_out'], len(self.SIMPLE_CHILDREN_MAP))
+            self.assertGreaterEqual(transformer_metrics['transform_time'], 0)
+
+    def test_transform_with_metrics_for_several_filters(self):
+        clear_cache(REQUEST_CACHE_NAME)
+        self.add_mock_transformer()
+        block_structure = self.create_block_structure(self.SIMPLE_CHILDREN_MAP)
+        filtering_transformer = self.registered_transformers[1]
+
+        with patch.object(
+            filtering_transformer,
+            'transform_block_filters',
+            return_value=[block_structure.create_universal_filter(), lambda block_key: block_key != 4],
+        ):
+            self.transformers.transform(block_structure, record_metrics=True)
+
+        transformer_metrics = get_recorded_metrics()[filtering_transformer.name()]
+        self.assertEquals(transformer_metrics['blocks_in'], len(self.SIMPLE_CHILDREN_MAP))
+        self.assertEquals(transformer_metrics['blocks_out'], len(self.SIMPLE_CHILDREN_MAP) - 1)
+
+    def test_collect_with_metrics(self):
+        clear_cache(REQUEST_CACHE_NAME)
+        block_structure = self.create_block_structure(self.SIMPLE_CHILDREN_MAP, BlockStructureModulestoreData)
+
+        with mock_registered_transformers(self.registered_transformers):
+            BlockStructureTransformers.collect(block_structure, record_metrics=True)
+
+        recorded_metrics = get_recorded_metrics()
+        for transformer in self.registered_transformers:
+            self.assertIn('collect_time', recorded_metrics[transformer.name()])
+
     def test_verify_versions(self):
         block_structure = self.create_block_structure(
             self.SIMPLE_CHILDREN_MAP,
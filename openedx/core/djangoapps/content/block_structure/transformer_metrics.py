@@ -0,0 +1,129 @@
+"""
+Module for recording the timings and block counts of each transformer,
+when enabled with the block_structure.transformer_metrics waffle switch.
+
+The following metrics are recorded per transformer:
+    collect_time - Seconds spent in the transformer's collect method.
+    transform_time - Seconds spent in the transformer's transform
+        method, or in its filters for filtering transformers.
+    blocks_in - Number of blocks given to the transformer.
+    blocks_out - Number of blocks retained by the transformer.
+
+Metrics are accumulated as monitoring custom metrics, named
+'block_structure.transformer.<transformer name>.<metric>', and in the
+request cache, from which they can be added to a response as a debug
+header.
+"""
+from time import time
+
+from openedx.core.djangoapps import monitoring_utils
+from openedx.core.djangoapps.request_cache import get_cache
+
+from . import config
+
+
+REQUEST_CACHE_NAME = u'block_structure.transformer_metrics'
+METRIC_PREFIX = u'block_structure.transformer'
+DEBUG_HEADER = 'X-Block-Structure-Transformer-Metrics'
+
+
+def is_enabled():
+    """
+    Returns whether transformer metrics are enabled.
+    """
+    return config.waffle().is_enabled(config.TRANSFORMER_METRICS)
+
+
+def record(transformer, metric_name, value):
+    """
+    Accumulates the given value for the given metric of the given
+    transformer.
+    """
+    monitoring_utils.accumulate(u'{}.{}.{}'.format(METRIC_PREFIX, transformer.name(), metric_name), value)
+    transformer_metrics = get_cache(REQUEST_CACHE_NAME).setdefault(transformer.name(), {})
+    transformer_metrics[metric_name] = transformer_metrics.get(metric_name, 0) + value
+
+
+def get_recorded_metrics():
+    """
+    Returns the metrics recorded in the current request, as a dict of
+    {transformer name: {metric name: value}}.
+    """
+    return get_cache(REQUEST_CACHE_NAME)
+
+
+def time_collect(transformer, block_structure):
+    """
+    Calls the collect method of the given transformer, recording the
+    time spent.
+    """
+    start_time = time()
+    transformer.collect(block_structure)
+    record(transformer, 'collect_time', time() - start_time)
+
+
+def time_transform(transformer, usage_info, block_structure):
+    """
+    Calls the transform method of the given transformer, recording the
+    time spent and the number of blocks before and after.
+    """
+    record(transformer, 'blocks_in', len(block_structure))
+    start_time = time()
+    transformer.transform(usage_info, block_structure)
+    record(transformer, 'transform_time', time() - start_time)
+    record(transformer, 'blocks_out', len(block_structure))
+
+
+class TimedFilter(object):
+    """
+    Wrapper of all the filter functions of a filtering transformer that
+    counts the time spent in the filters, the number of blocks given to
+    the first filter and the number retained by the last, until they are
+    recorded.
+    """
+    def __init__(self, transformer, filter_funcs):
+        self.transformer = transformer
+        self.filter_funcs = filter_funcs
+        self.transform_time = 0
+        self.blocks_in = 0
+        self.blocks_out = 0
+
+    def __call__(self, block_key):
+        start_time = time()
+        result = all(filter_func(block_key) for filter_func in self.filter_funcs)
+        self.transform_time += time() - start_time
+        self.blocks_in += 1
+        if result:
+            self.blocks_out += 1
+        return result
+
+    def record(self):
+        """
+        Records the metrics counted so far.
+        """
+        record(self.transformer, 'transform_time', self.transform_time)
+        record(self.transformer, 'blocks_in', self.blocks_in)
+        record(self.transformer, 'blocks_out', self.blocks_out)
+
+
+def set_debug_header(response):
+    """
+    Adds the metrics recorded in the current request to the given
+    response as a debug header, if transformer metrics are enabled.
+
+    The header value lists each transformer's metrics, for example:
+        start_date: blocks_in=120, blocks_out=118, transform_time=0.0042
+    """
+    if not is_enabled():
+        return
+    recorded_metrics = get_recorded_metrics()
+    response[DEBUG_HEADER] = u'; '.join(
+        u'{}: {}'.format(
+            transformer_name,
+            u', '.join(
+                u'{}={:.4g}'.format(metric_name, value)
+                for metric_name, value in sorted(recorded_metrics[transformer_name].iteritems())
+            ),
+        )
+        for transformer_name in sorted(recorded_metrics)
+    )
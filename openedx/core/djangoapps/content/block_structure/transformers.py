@@ -3,7 +3,9 @@ Module for a collection of BlockStructureTransformers.
 """
 import functools
 from logging import getLogger
+from time import time
 
+from . import transformer_metrics
 from .exceptions import TransformerException, TransformerDataIncompatible
 from .transformer import FilteringTransformerMixin
 from .transformer_registry import TransformerRegistry
@@ -71,13 +73,17 @@ class BlockStructureTransformers(object):
         return self
 
     @classmethod
-    def collect(cls, block_structure):
+    def collect(cls, block_structure, record_metrics=False):
         """
-        Collects data for each registered transformer.
+        Collects data for each registered transformer, recording the time
+        spent by each if record_metrics is True.
         """
         for transformer in TransformerRegistry.get_registered_transformers():
             block_structure._add_transformer(transformer)  # pylint: disable=protected-access
-            transformer.collect(block_structure)
+            if record_metrics:
+                transformer_metrics.time_collect(transformer, block_structure)
+            else:
+                transformer.collect(block_structure)
 
         # Collect all fields that were requested by the transformers.
         block_structure._collect_requested_xblock_fields()  # pylint: disable=protected-access
@@ -105,20 +111,24 @@ class BlockStructureTransformers(object):
             )
         return True
 
-    def transform(self, block_structure):
+    def transform(self, block_structure, record_metrics=False):
         """
         The given block structure is transformed by each transformer in the
         collection. Tranformers with filters are combined and run first in a
         single course tree traversal, then remaining transformers are run in
         the order that they were added.
+
+        If record_metrics is True, the time spent in and the number of
+        blocks given to and retained by each transformer are recorded.
+        See transformer_metrics.
         """
-        self._transform_with_filters(block_structure)
-        self._transform_without_filters(block_structure)
+        self._transform_with_filters(block_structure, record_metrics)
+        self._transform_without_filters(block_structure, record_metrics)
 
         # Prune the block structure to remove any unreachable blocks.
         block_structure._prune_unreachable()  # pylint: disable=protected-access
 
-    def _transform_with_filters(self, block_structure):
+    def _transform_with_filters(self, block_structure, record_metrics=False):
         """
         Transforms the given block_structure using the transform_block_filters
         method from the given transformers.
@@ -127,8 +137,21 @@ class BlockStructureTransformers(object):
             return
 
         filters = []
+        timed_filters = []
         for transformer in self._transformers['supports_filter']:
-            filters.extend(transformer.transform_block_filters(self.usage_info, block_structure))
+            if record_metrics:
+                start_time = time()
+                transformer_filters = transformer.transform_block_filters(self.usage_info, block_structure)
+                transformer_metrics.record(transformer, 'transform_time', time() - start_time)
+                # The filters of a transformer are timed together, so that
+                # its blocks are only counted once.
+                if transformer_filters:
+                    timed_filter = transformer_metrics.TimedFilter(transformer, transformer_filters)
+                    timed_filters.append(timed_filter)
+                    transformer_filters = [timed_filter]
+            else:
+                transformer_filters = transformer.transform_block_filters(self.usage_info, block_structure)
+            filters.extend(transformer_filters)
 
         combined_filters = functools.reduce(
             self._filter_chain,
@@ -137,6 +160,9 @@ class BlockStructureTransformers(object):
         )
         block_structure.filter_topological_traversal(combined_filters)
 
+        for timed_filter in timed_filters:
+            timed_filter.record()
+
     def _filter_chain(self, accumulated, additional):
         """
         Given two functions that take a block_key and return a boolean, yield
@@ -144,10 +170,13 @@ class BlockStructureTransformers(object):
         """
         return lambda block_key: accumulated(block_key) and additional(block_key)
 
-    def _transform_without_filters(self, block_structure):
+    def _transform_without_filters(self, block_structure, record_metrics=False):
         """
         Transforms the given block_structure using the transform
         method from the given transformers.
         """
         for transformer in self._transformers['no_filter']:
-            transformer.transform(self.usage_info, block_structure)
+            if record_metrics:
+                transformer_metrics.time_transform(transformer, self.usage_info, block_structure)
+            else:
+                transformer.transform(self.usage_info, block_structure)
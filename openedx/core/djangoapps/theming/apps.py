@@ -19,3 +19,7 @@ class ThemingConfig(AppConfig):
     def ready(self):
         # settings validations related to theming.
         from . import checks
+
+        # index the themes' templates up front rather than on the first requests
+        from .helpers import index_theme_templates
+        index_theme_templates()
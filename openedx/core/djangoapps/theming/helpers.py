@@ -6,6 +6,7 @@ you need models here, please import them inside the function which uses them.
 """
 import os
 import re
+from collections import namedtuple
 from logging import getLogger
 
 from django.conf import settings
@@ -23,6 +24,10 @@ from openedx.core.djangoapps.request_cache.middleware import RequestCache, reque
 
 logger = getLogger(__name__)  # pylint: disable=invalid-name
 
+# The templates of each theme, by the theme's templates directory. See `get_theme_template_names`.
+_THEME_TEMPLATES = {}
+ThemeTemplates = namedtuple('ThemeTemplates', ['names', 'dir_mtimes'])
+
 
 @request_cached
 def get_template_path(relative_path, **kwargs):
@@ -83,13 +88,93 @@ def get_template_path_with_theme(relative_path):
     template_name = re.sub(r'^/+', '', relative_path)
 
     template_path = theme.template_path / template_name
-    absolute_path = theme.path / "templates" / template_name
-    if absolute_path.exists():
+    if template_name in get_theme_template_names(theme):
         return str(template_path)
     else:
         return relative_path
 
 
+def get_theme_template_names(theme):
+    """
+    Returns the names of the templates the given theme overrides, relative to its templates directory.
+
+    The theme's templates directory is only walked the first time, so that resolving a themed template
+    doesn't need any filesystem access. If COMPREHENSIVE_THEME_TEMPLATES_AUTO_REFRESH is enabled, e.g. in
+    development, the directories are checked for changes once per request, and walked again if any changed.
+
+    Example:
+        >> get_theme_template_names(theme)
+        frozenset(['header.html', 'footer.html', 'emails/activation_email.txt'])
+
+    Parameters:
+        theme (Theme): theme to get the templates of
+
+    Returns:
+        (frozenset): template paths relative to the theme's templates directory
+    """
+    templates_dir = theme.path / "templates"
+    if getattr(settings, 'COMPREHENSIVE_THEME_TEMPLATES_AUTO_REFRESH', False):
+        return _get_refreshed_theme_templates(templates_dir).names
+
+    theme_templates = _THEME_TEMPLATES.get(templates_dir)
+    if theme_templates is None:
+        theme_templates = _THEME_TEMPLATES[templates_dir] = _index_theme_templates(templates_dir)
+    return theme_templates.names
+
+
+def index_theme_templates():
+    """
+    Index the templates of all the themes, so that resolving themed templates is a lookup from the start.
+    """
+    if not settings.ENABLE_COMPREHENSIVE_THEMING:
+        return
+    themes_dirs = [themes_dir for themes_dir in get_theme_base_dirs_unchecked() if os.path.isdir(themes_dir)]
+    for theme in get_themes_unchecked(themes_dirs, settings.PROJECT_ROOT):
+        templates_dir = theme.path / "templates"
+        _THEME_TEMPLATES[templates_dir] = _index_theme_templates(templates_dir)
+
+
+@request_cached
+def _get_refreshed_theme_templates(templates_dir):
+    """
+    Returns the ThemeTemplates of the given directory, indexing it again if it changed since it was indexed.
+
+    The check is cached for the lifetime of the current request.
+    """
+    theme_templates = _THEME_TEMPLATES.get(templates_dir)
+    if theme_templates is None or any(
+            _get_mtime(dir_path) != mtime for dir_path, mtime in theme_templates.dir_mtimes.iteritems()
+    ):
+        theme_templates = _THEME_TEMPLATES[templates_dir] = _index_theme_templates(templates_dir)
+    return theme_templates
+
+
+def _index_theme_templates(templates_dir):
+    """
+    Walks the given templates directory and returns its ThemeTemplates: the relative paths of the templates
+    it contains, and the modification times of its directories, which change when templates are added or
+    removed.
+    """
+    names = set()
+    # a theme without templates might get some, so keep track of the templates directory itself
+    dir_mtimes = {templates_dir: _get_mtime(templates_dir)}
+    for dir_path, __, file_names in os.walk(templates_dir, followlinks=True):
+        dir_mtimes[dir_path] = _get_mtime(dir_path)
+        relative_dir = os.path.relpath(dir_path, templates_dir)
+        names.update(os.path.normpath(os.path.join(relative_dir, file_name)) for file_name in file_names)
+    return ThemeTemplates(frozenset(names), dir_mtimes)
+
+
+def _get_mtime(path):
+    """
+    Returns the modification time of the given path, or None if it doesn't exist.
+    """
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
 def get_all_theme_template_dirs():
     """
     Returns template directories for all the themes.
@@ -1,7 +1,12 @@
 """
 Test helpers for Comprehensive Theming.
 """
+import os
+import shutil
+from tempfile import mkdtemp
+
 from mock import patch, Mock
+from path import Path as path
 
 from django.test import TestCase, override_settings
 from django.conf import settings
@@ -205,6 +210,32 @@ class TestHelpers(TestCase):
                     mock_microsite_backend.get_template_path = Mock(return_value="/microsite/about.html")
                     self.assertEqual(theming_helpers.get_template_path("about.html"), "/microsite/about.html")
 
+    def test_get_theme_template_names(self):
+        """
+        Tests the templates of a theme are indexed once, and indexed again on changes if auto refresh is enabled.
+        """
+        themes_dir = path(mkdtemp())
+        self.addCleanup(shutil.rmtree, themes_dir)
+        theme = Theme('tmp-theme', 'tmp-theme', themes_dir, settings.PROJECT_ROOT)
+        templates_dir = theme.path / 'templates'
+        (templates_dir / 'emails').makedirs_p()
+        (templates_dir / 'header.html').write_text(u'')
+        (templates_dir / 'emails' / 'welcome.txt').write_text(u'')
+
+        expected_names = {'header.html', os.path.join('emails', 'welcome.txt')}
+        self.assertEqual(theming_helpers.get_theme_template_names(theme), expected_names)
+
+        # the index isn't built again...
+        (templates_dir / 'footer.html').write_text(u'')
+        # make sure the directory's mtime changes, whatever the filesystem's resolution
+        os.utime(templates_dir, (0, 0))
+        self.assertEqual(theming_helpers.get_theme_template_names(theme), expected_names)
+
+        # ...unless auto refresh is enabled
+        with override_settings(COMPREHENSIVE_THEME_TEMPLATES_AUTO_REFRESH=True):
+            RequestCache.clear_request_cache()
+            self.assertEqual(theming_helpers.get_theme_template_names(theme), expected_names | {'footer.html'})
+
 
 @skip_unless_lms
 class TestHelpersLMS(TestCase):